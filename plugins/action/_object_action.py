@@ -0,0 +1,64 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_text
+from ansible.plugins.action import ActionBase
+from ansible_collections.mrichardson03.panos.plugins.module_utils.objects import (
+    object_task,
+)
+
+
+class ObjectActionBase(ActionBase):
+    """
+    Base of the object actions, which manage the objects of the type
+    described by 'SCHEMA' through object_task().
+    """
+
+    TRANSFERS_FILES = False
+
+    # ObjectSchema of the object type.
+    SCHEMA = None
+
+    @property
+    def _VALID_ARGS(self):
+        return self.SCHEMA.valid_args
+
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp is unused
+
+        try:
+            result.update(
+                object_task(
+                    self._connection,
+                    self.SCHEMA,
+                    self._task.args,
+                    check_mode=self._play_context.check_mode,
+                )
+            )
+        except ValueError as e:
+            raise AnsibleError(to_text(e))
+        except ConnectionError as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+
+        return result
@@ -20,9 +20,12 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import socket
+import ssl
 import time
 import xml.etree.ElementTree
 from datetime import datetime, timedelta
+from urllib.request import getproxies
 
 from ansible.errors import AnsibleError
 from ansible.module_utils._text import to_text
@@ -41,35 +44,112 @@ def check_autocommit(jobs):
     if len(jobs) == 0:
         return False
 
-    for j in jobs:
-        job_type = j.findtext(".//type")
-        job_result = j.findtext(".//result")
+    autocommits = [j for j in jobs if j.findtext("./type") == "AutoCom"]
 
-        if job_type is None or job_result is None:
-            return False
+    # If there are no autocommit jobs, they are no longer in the job history
+    # and it is assumed the device is ready.
+    if not autocommits:
+        return True
+
+    # Devices that have restarted have several autocommit jobs, only the
+    # newest one matters.
+    newest = max(autocommits, key=lambda j: int(j.findtext("./id") or 0))
+
+    return newest.findtext("./result") == "OK"
+
+
+def backoff(attempt, min_sleep, max_sleep):
+    """
+    Returns the number of seconds to wait before the next attempt, doubling
+    from 'min_sleep' up to 'max_sleep'.
+    """
+    return min(max_sleep, min_sleep * 2 ** min(attempt, 16))
 
-        if job_type == "AutoCom" and job_result == "OK":
-            return True
-        elif job_type == "AutoCom":
-            return False
 
-    # If we get to this point, the autocommit job is no longer in the job
-    # history and it is assumed the device is ready.
-    return True
+def probe(host, port, use_ssl=True, timeout=5):
+    """
+    Checks if a TCP connection (and TLS handshake, if 'use_ssl' is set) to the
+    device succeeds.  Much cheaper than an API call while the device is down.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            if use_ssl:
+                # Only reachability is checked here, certificates are
+                # validated by the API connection itself.
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+
+                with context.wrap_socket(sock, server_hostname=host):
+                    pass
+
+        return True
+    except (OSError, ssl.SSLError):
+        return False
 
 
 class ActionModule(ActionBase):
     TRANSFERS_FILES = False
-    _VALID_ARGS = frozenset(("delay", "sleep", "timeout"))
+    _VALID_ARGS = frozenset(("delay", "min_sleep", "sleep", "timeout"))
 
     DEFAULT_DELAY = 0
+    DEFAULT_MIN_SLEEP = 5
     DEFAULT_SLEEP = 60
     DEFAULT_TIMEOUT = 600
 
-    def do_until_success_or_timeout(self, timeout, sleep):
+    # When the probe fails, still check the API every this many attempts, as
+    # the probe can't reach devices behind jump hosts.
+    API_EVERY = 3
+
+    def _option(self, name, default):
+        try:
+            value = self._connection.get_option(name)
+        except KeyError:
+            return default
+
+        return default if value is None else value
+
+    def _probe(self):
+        host = self._option("host", self._play_context.remote_addr)
+        use_ssl = self._option("use_ssl", True)
+        port = self._option("port", 443 if use_ssl else 80)
+
+        # The probe connects directly, so it can't check devices that are
+        # only reachable through a proxy.  Leave those to the API.
+        if self._option("use_proxy", True) and getproxies().get(
+            "https" if use_ssl else "http"
+        ):
+            return True
+
+        return probe(host, port, use_ssl=use_ssl)
+
+    def do_until_success_or_timeout(self, timeout, sleep, min_sleep):
         max_end_time = datetime.utcnow() + timedelta(seconds=timeout)
+        attempt = 0
+        reachable = True
 
         while datetime.utcnow() < max_end_time:
+            wait = backoff(attempt, min_sleep, sleep)
+            attempt += 1
+
+            if not self._probe():
+                reachable = False
+
+                if attempt % self.API_EVERY:
+                    display.debug(
+                        "panos_check: device unreachable, retrying in {0} seconds".format(
+                            wait
+                        )
+                    )
+                    time.sleep(wait)
+                    continue
+
+            elif not reachable:
+                # The device just came up, check the API quickly.
+                reachable = True
+                attempt = 1
+                wait = min_sleep
+
             try:
                 result = self._connection.op("show jobs all", is_xml=False)
                 jobs = xml.etree.ElementTree.fromstring(result).findall(".//job")
@@ -80,10 +160,10 @@ class ActionModule(ActionBase):
                 else:
                     display.debug(
                         "panos_check: autocommit not completed, retrying in {0} seconds".format(
-                            sleep
+                            wait
                         )
                     )
-                    time.sleep(sleep)
+                    time.sleep(wait)
             except PanOSAPIError as e:
                 if e.code == "403":
                     raise
@@ -91,17 +171,17 @@ class ActionModule(ActionBase):
                 else:
                     display.debug(
                         "panos_check: connection error (expected), retrying in {0} seconds".format(
-                            sleep
+                            wait
                         )
                     )
-                    time.sleep(sleep)
+                    time.sleep(wait)
             except Exception:
                 display.debug(
                     "panos_check: connection error (expected), retrying in {0} seconds".format(
-                        sleep
+                        wait
                     )
                 )
-                time.sleep(sleep)
+                time.sleep(wait)
 
         raise TimedOutException("Timed out waiting for autocommit to complete.")
 
@@ -111,6 +191,9 @@ class ActionModule(ActionBase):
 
         delay = int(self._task.args.get("delay", self.DEFAULT_DELAY))
         sleep = int(self._task.args.get("sleep", self.DEFAULT_SLEEP))
+        min_sleep = min(
+            sleep, int(self._task.args.get("min_sleep", self.DEFAULT_MIN_SLEEP))
+        )
         timeout = int(self._task.args.get("timeout", self.DEFAULT_TIMEOUT))
 
         if self._play_context.check_mode:
@@ -126,7 +209,7 @@ class ActionModule(ActionBase):
             time.sleep(delay)
 
         try:
-            self.do_until_success_or_timeout(timeout, sleep)
+            self.do_until_success_or_timeout(timeout, sleep, min_sleep)
 
         except TimedOutException as e:
             raise AnsibleError("Timeout waiting for autocommit.") from e
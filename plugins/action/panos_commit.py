@@ -25,13 +25,22 @@ import time
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 
-import xmltodict
 from ansible.module_utils._text import to_text
+from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.plugins.action import ActionBase
 from ansible.utils.display import Display
 from ansible_collections.mrichardson03.panos.plugins.httpapi.panos import (
     TimedOutException,
 )
+from ansible_collections.mrichardson03.panos.plugins.module_utils.job_history import (
+    JobHistory,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    commit_scope,
+    config_changes,
+    merge_commit_args,
+    xml_to_dict,
+)
 
 display = Display()
 
@@ -46,12 +55,18 @@ class ActionModule(ActionBase):
             "exclude_shared_objects",
             "description",
             "admins",
+            "auto_scope",
+            "coalesce",
+            "delay",
+            "history_dir",
             "sleep",
             "timeout",
+            "wait",
         )
     )
 
-    DEFAULT_DELAY = 10
+    DEFAULT_DELAY = 0
+    DEFAULT_MIN_SLEEP = 1
     DEFAULT_SLEEP = 10
     DEFAULT_TIMEOUT = 600
 
@@ -59,9 +74,12 @@ class ActionModule(ActionBase):
         if task_vars is None:
             task_vars = dict()
 
-        delay = self.DEFAULT_DELAY
+        delay = int(self._task.args.get("delay", self.DEFAULT_DELAY))
         sleep = int(self._task.args.get("sleep", self.DEFAULT_SLEEP))
         timeout = int(self._task.args.get("timeout", self.DEFAULT_TIMEOUT))
+        wait = boolean(self._task.args.get("wait", True))
+        auto_scope = boolean(self._task.args.get("auto_scope", False))
+        history_dir = self._task.args.get("history_dir", None)
 
         commit_args = dict()
         commit_args["force"] = self._task.args.get("force", False)
@@ -80,31 +98,129 @@ class ActionModule(ActionBase):
         result = super().run(tmp, task_vars)
         del tmp  # tmp is unused
 
+        # Commits deferred by earlier tasks are stored as a host fact, so they
+        # survive across tasks, roles and plays.
+        pending = task_vars.get("ansible_facts", {}).get("panos_pending_commit")
+
+        if boolean(self._task.args.get("coalesce", False)):
+            pending = merge_commit_args(pending, commit_args)
+
+            result["changed"] = False
+            result["msg"] = "Commit deferred."
+            result["pending_commit"] = pending
+            result["ansible_facts"] = {"panos_pending_commit": pending}
+
+            return result
+
+        if pending:
+            display.debug("panos_commit: merging pending commit {0}".format(pending))
+            commit_args = merge_commit_args(pending, commit_args)
+
         start = datetime.now()
+        phases = dict()
 
         if delay:
             time.sleep(delay)
+            phases["delay"] = delay
 
         try:
+            phase_start = time.time()
             changes_result = self._connection.op("check pending-changes", is_xml=False)
             changes = ET.fromstring(changes_result).findtext(".//result")
+            phases["pending_changes"] = round(time.time() - phase_start, 3)
+
+            if changes != "no" and auto_scope:
+                phase_start = time.time()
+                scope = commit_scope(
+                    config_changes(
+                        self._connection.op("show config list changes", is_xml=False)
+                    ),
+                    commit_args["admins"],
+                )
+                phases["scope"] = round(time.time() - phase_start, 3)
+                display.debug("commit scope: {0}".format(scope))
+
+                if scope is None:
+                    changes = "no"
+                else:
+                    for key, exclude in scope.items():
+                        commit_args[key] = commit_args[key] or exclude
+
+                    result["scope"] = scope
 
             if changes == "no":
                 result["changed"] = False
                 result["msg"] = "No changes to commit."
+                result["ansible_facts"] = {"panos_pending_commit": {}}
             else:
                 if not self._play_context.check_mode:
+                    phase_start = time.time()
                     commit = self._connection.commit(**commit_args)
                     commit_job = ET.fromstring(commit).findtext(".//job")
                     display.debug("commit job: {0}".format(commit_job))
-
-                    commit_result = self._connection.poll_for_job(
-                        commit_job, interval=sleep, timeout=timeout
-                    )
+                    phases["commit"] = round(time.time() - phase_start, 3)
 
                     result["changed"] = True
-                    result["stdout"] = json.dumps(xmltodict.parse(commit_result))
-                    result["stdout_xml"] = commit_result
+                    result["msg"] = "Commit started."
+                    result["job_id"] = commit_job
+                    result["ansible_facts"] = {"panos_pending_commit": {}}
+
+                    if wait:
+                        history = None
+
+                        # Partial commits are usually faster, so they're kept
+                        # in their own series.
+                        partial = any(
+                            commit_args[key]
+                            for key in commit_args
+                            if key.startswith("exclude_") or key == "admins"
+                        )
+                        job_type = "commit-partial" if partial else "commit"
+
+                        if history_dir:
+                            history = JobHistory(
+                                history_dir, self._connection.version()["serial"]
+                            )
+
+                            # Explicit arguments win over predictions.
+                            if "timeout" not in self._task.args:
+                                timeout = history.timeout(job_type, timeout)
+                            if "sleep" not in self._task.args:
+                                sleep = history.poll_interval(job_type, sleep)
+
+                        phase_start = time.time()
+                        commit_result = self._connection.poll_for_job(
+                            commit_job,
+                            interval=sleep,
+                            timeout=timeout,
+                            min_interval=min(self.DEFAULT_MIN_SLEEP, sleep),
+                        )
+                        phases["job"] = round(time.time() - phase_start, 3)
+
+                        if history:
+                            result["outlier"] = history.record(
+                                job_type, phases["job"], partial=partial
+                            )
+
+                            # The commit succeeded, so only warn if the
+                            # history can't be written.
+                            try:
+                                history.save()
+                            except (IOError, OSError) as e:
+                                display.warning(
+                                    "Unable to save commit history: {0}".format(e)
+                                )
+
+                            if result["outlier"]:
+                                display.warning(
+                                    "Commit took {0}s, much longer than usual.".format(
+                                        phases["job"]
+                                    )
+                                )
+
+                        result["msg"] = "Commit completed."
+                        result["stdout"] = json.dumps(xml_to_dict(commit_result))
+                        result["stdout_xml"] = commit_result
                 else:
                     result["changed"] = True
 
@@ -118,9 +234,8 @@ class ActionModule(ActionBase):
 
         elapsed = datetime.now() - start
         result["elapsed"] = elapsed.seconds
+        result["phases"] = phases
 
         self._remove_tmp_path(self._connection._shell.tmpdir)
 
-        result["msg"] = "Commit completed."
-
         return result
@@ -0,0 +1,164 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.mrichardson03.panos.plugins.httpapi.panos import (
+    TimedOutException,
+)
+
+display = Display()
+
+
+class ActionModule(ActionBase):
+    TRANSFERS_FILES = False
+    _VALID_ARGS = frozenset(
+        (
+            "device_groups",
+            "templates",
+            "serials",
+            "description",
+            "include_template",
+            "validate",
+            "sleep",
+            "timeout",
+            "workers",
+        )
+    )
+
+    DEFAULT_MIN_SLEEP = 1
+    DEFAULT_SLEEP = 10
+    DEFAULT_TIMEOUT = 1800
+    DEFAULT_WORKERS = 4
+
+    @staticmethod
+    def device_results(job):
+        """
+        Returns the per-firewall results of a finished push job.
+
+        :param job: Job, as returned by poll_for_jobs().
+        :returns: List of dicts, one per firewall.
+        """
+        devices = []
+        root = ET.fromstring(job["response"])
+
+        for entry in root.iterfind("./result/job/devices/entry"):
+            serial = entry.findtext("serial-no")
+            messages = [
+                line.text for line in entry.iterfind("./details//line") if line.text
+            ]
+
+            devices.append(
+                {
+                    "serial": serial,
+                    "name": entry.findtext("devicename"),
+                    "job_id": job["id"],
+                    "result": entry.findtext("result"),
+                    "status": entry.findtext("status"),
+                    "elapsed": job["devices"].get(serial, job["elapsed"]),
+                    "messages": messages,
+                }
+            )
+
+        return devices
+
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None:
+            task_vars = dict()
+
+        sleep = int(self._task.args.get("sleep", self.DEFAULT_SLEEP))
+        timeout = int(self._task.args.get("timeout", self.DEFAULT_TIMEOUT))
+        workers = int(self._task.args.get("workers", self.DEFAULT_WORKERS))
+
+        push_args = dict()
+        push_args["device_groups"] = self._task.args.get("device_groups", None)
+        push_args["templates"] = self._task.args.get("templates", None)
+        push_args["serials"] = self._task.args.get("serials", None)
+        push_args["description"] = self._task.args.get("description", None)
+        push_args["include_template"] = boolean(
+            self._task.args.get("include_template", False)
+        )
+        push_args["validate"] = boolean(self._task.args.get("validate", False))
+
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp is unused
+
+        if not push_args["device_groups"] and not push_args["templates"]:
+            result["failed"] = True
+            result["msg"] = "One of 'device_groups' or 'templates' is required."
+            return result
+
+        start = datetime.now()
+
+        try:
+            if not self._connection.is_panorama():
+                raise ConnectionError("panos_commit_all requires a Panorama device.")
+
+            if not self._play_context.check_mode:
+                job_ids = self._connection.commit_all(**push_args)
+                display.debug("commit-all jobs: {0}".format(job_ids))
+
+                jobs = self._connection.poll_for_jobs(
+                    job_ids,
+                    interval=sleep,
+                    timeout=timeout,
+                    min_interval=min(self.DEFAULT_MIN_SLEEP, sleep),
+                    workers=workers,
+                )
+
+                devices = []
+
+                for job in jobs:
+                    devices.extend(self.device_results(job))
+
+                failed = [d["serial"] for d in devices if d["result"] != "OK"]
+
+                result["changed"] = bool(job_ids) and not push_args["validate"]
+                result["jobs"] = job_ids
+                result["devices"] = devices
+
+                if failed:
+                    result["failed"] = True
+                    result["msg"] = "Push failed on {0}.".format(", ".join(failed))
+                elif job_ids:
+                    result["msg"] = "Pushed to {0} firewalls.".format(len(devices))
+                else:
+                    result["msg"] = "Nothing to push."
+            else:
+                result["changed"] = True
+
+        except ConnectionError as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+
+        except TimedOutException as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+
+        elapsed = datetime.now() - start
+        result["elapsed"] = elapsed.seconds
+
+        self._remove_tmp_path(self._connection._shell.tmpdir)
+
+        return result
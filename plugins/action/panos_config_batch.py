@@ -0,0 +1,125 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_text
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    common_xpath,
+    config_element_changed,
+    minify_xml,
+    relative_xpath,
+)
+
+display = Display()
+
+
+class ActionModule(ActionBase):
+    TRANSFERS_FILES = False
+    _VALID_ARGS = frozenset(["elements", "edit", "workers"])
+
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp is unused
+
+        default_edit = self._task.args.get("edit", False)
+        workers = int(self._task.args.get("workers", 1))
+
+        elements = []
+        for element in self._task.args.get("elements") or []:
+            if not element.get("xpath") or not element.get("element"):
+                raise AnsibleError("Each element requires 'xpath' and 'element'")
+
+            try:
+                element_xml = minify_xml(element["element"])
+            except ValueError as e:
+                raise AnsibleError(
+                    "Invalid element for {0}: {1}".format(element["xpath"], to_text(e))
+                )
+
+            elements.append(
+                {
+                    "xpath": element["xpath"],
+                    "element": element_xml,
+                    "edit": element.get("edit", default_edit),
+                    "layer": element.get("layer"),
+                }
+            )
+
+        result["changed"] = False
+        result["results"] = []
+
+        if not elements:
+            return result
+
+        try:
+            # Retrieve the configuration containing all the elements once.
+            root_xpath = common_xpath([e["xpath"] for e in elements])
+            display.vvv("panos_config_batch: retrieving {0}".format(root_xpath))
+
+            root = ET.fromstring(self._connection.get(root_xpath)).find("./result/")
+
+            operations = []
+            for element in elements:
+                existing = None
+                if root is not None:
+                    existing = root.find(relative_xpath(root_xpath, element["xpath"]))
+
+                try:
+                    changed = config_element_changed(
+                        existing, element["element"], element["edit"]
+                    )
+                except ET.ParseError as e:
+                    raise AnsibleError(
+                        "Invalid element for {0}: {1}".format(
+                            element["xpath"], to_text(e)
+                        )
+                    )
+
+                result["results"].append(
+                    {"xpath": element["xpath"], "changed": changed}
+                )
+
+                if changed:
+                    operation = {
+                        "action": "edit" if element["edit"] else "set",
+                        "xpath": element["xpath"],
+                        "element": element["element"],
+                    }
+                    if element["layer"] is not None:
+                        operation["layer"] = int(element["layer"])
+
+                    operations.append(operation)
+
+            # Push all the changed elements together.
+            if operations and not self._play_context.check_mode:
+                self._connection.multi_config(operations, workers=workers)
+
+            result["changed"] = bool(operations)
+
+        except ConnectionError as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+
+        return result
@@ -0,0 +1,114 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import tempfile
+
+from ansible.errors import AnsibleActionFail, AnsibleError
+from ansible.module_utils._text import to_bytes, to_text
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+
+display = Display()
+
+LOAD_MODES = ["merge", "replace", "append"]
+
+
+class ActionModule(ActionBase):
+    TRANSFERS_FILES = False
+    _VALID_ARGS = frozenset(
+        ["src", "content", "filename", "from_xpath", "to_xpath", "mode"]
+    )
+
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp is unused
+
+        src = self._task.args.get("src", None)
+        content = self._task.args.get("content", None)
+        filename = self._task.args.get("filename", None)
+        to_xpath = self._task.args.get("to_xpath", None)
+        from_xpath = self._task.args.get("from_xpath", to_xpath)
+        mode = self._task.args.get("mode", "merge")
+
+        if (src is None) == (content is None):
+            raise AnsibleActionFail("Exactly one of 'src' or 'content' is required")
+
+        if to_xpath is None:
+            raise AnsibleActionFail("'to_xpath' is required")
+
+        if mode not in LOAD_MODES:
+            raise AnsibleActionFail(
+                "'mode' must be one of {0}".format(", ".join(LOAD_MODES))
+            )
+
+        path = None
+        remove = False
+
+        try:
+            if src is not None:
+                try:
+                    path = self._find_needle("files", src)
+                except AnsibleError as e:
+                    raise AnsibleActionFail(to_text(e))
+            else:
+                # Rendered content is staged in a file so it can be streamed.
+                fd, path = tempfile.mkstemp(suffix=".xml")
+                remove = True
+                with os.fdopen(fd, "wb") as f:
+                    f.write(to_bytes(content, errors="surrogate_or_strict"))
+
+            if filename is None:
+                filename = (
+                    os.path.basename(path) if src is not None else "ansible-import.xml"
+                )
+
+            result["filename"] = filename
+            result["size"] = os.path.getsize(path)
+
+            if not self._play_context.check_mode:
+                display.vvv(
+                    "panos_config_import: uploading {0} as {1} ({2} bytes)".format(
+                        path, filename, result["size"]
+                    )
+                )
+                self._connection.import_config(path, filename)
+
+                display.vvv(
+                    "panos_config_import: loading {0} to {1}".format(
+                        from_xpath, to_xpath
+                    )
+                )
+                self._connection.load_config_partial(
+                    filename, from_xpath, to_xpath, mode
+                )
+
+            result["changed"] = True
+
+        except ConnectionError as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+
+        finally:
+            if remove:
+                os.remove(path)
+
+        return result
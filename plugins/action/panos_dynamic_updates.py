@@ -16,29 +16,93 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import os
+import re
 import xml.etree.ElementTree
 
 from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_text
+from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.plugins.action import ActionBase
 from ansible.utils.display import Display
+from ansible_collections.mrichardson03.panos.plugins.module_utils.cache import (
+    DEFAULT_CACHE_DIR,
+    ResultCache,
+    cached_op,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.job_history import (
+    JobHistory,
+    run_job,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    find_image,
+)
 
 display = Display()
 
 
+# Names of content images, such as 'panupv2-all-contents-8500-7000'.
+CONTENT_FILES = {
+    "content": r"-contents-(\d+-\d+)$",
+    "anti-virus": r"-antivirus-(\d+-\d+)$",
+    "wildfire": r"-wildfire-(\d+-\d+)$",
+}
+
+# Content types, in the order they must be installed.
+INSTALL_ORDER = ["content", "anti-virus", "wildfire"]
+
+# Elements of 'show system info' with the installed version of each type.
+INSTALLED_VERSIONS = {
+    "content": "app-version",
+    "anti-virus": "av-version",
+    "wildfire": "wildfire-version",
+}
+
+
+def check_cmd(content_type):
+    return "<request><{0}><upgrade><check/></upgrade></{0}></request>".format(
+        content_type
+    )
+
+
+def content_key(version):
+    """Sort key for content versions like '8500-7000'."""
+    return tuple(int(part) for part in version.split("-") if part.isdigit())
+
+
 class ActionModule(ActionBase):
     TRANSFERS_FILES = False
-    _VALID_ARGS = frozenset(["content_type"])
+    _VALID_ARGS = frozenset(
+        [
+            "content_type",
+            "history_dir",
+            "image_dir",
+            "cache_ttl",
+            "cache_dir",
+            "force_refresh",
+        ]
+    )
+
+    DEFAULT_TIMEOUT = 600
 
     def _get_latest_content_version(self, content_type):
+        """
+        Returns the latest version of a content type, or None if it is
+        already installed.  The file name and checksum of the latest version
+        are kept in '_latest_files'.
+        """
         latest_version = ""
         latest_version_first = 0
         latest_version_second = 0
         latest_version_current = "no"
 
-        cmd = "<request><{0}><upgrade><check/></upgrade></{0}></request>".format(
-            content_type
+        op_xml, cached = cached_op(
+            self._connection,
+            check_cmd(content_type),
+            cache=self._cache,
+            refresh=self._refresh,
         )
-        op_xml = self._connection.op(cmd=cmd)
+        self._cached = self._cached or cached
         op_doc = xml.etree.ElementTree.fromstring(op_xml)
 
         for entry in op_doc.findall(".//entry"):
@@ -57,6 +121,10 @@ class ActionModule(ActionBase):
                 latest_version_first = version_first
                 latest_version_second = version_second
                 latest_version_current = current
+                self._latest_files[content_type] = (
+                    entry.findtext("./filename"),
+                    entry.findtext("./sha256"),
+                )
 
         if latest_version_current == "yes":
             return None
@@ -64,22 +132,123 @@ class ActionModule(ActionBase):
         else:
             return latest_version
 
-    def _download_install_content(self, content_type):
-        download = (
-            "<request>"
-            "<{0}><upgrade><download><latest/></download></upgrade></{0}>"
-            "</request>".format(content_type)
+    def _get_latest_local_version(self, content_type, image_dir):
+        """
+        Returns the latest version of a content type in a local image
+        directory, or None if it is already installed.  Used when the device
+        cannot reach the update servers.
+        """
+        pattern = CONTENT_FILES[content_type]
+        latest = None
+
+        for filename in os.listdir(image_dir):
+            match = re.search(pattern, filename)
+
+            if match and (latest is None or content_key(match.group(1)) > latest[0]):
+                latest = (content_key(match.group(1)), match.group(1), filename)
+
+        if latest is None:
+            return None
+
+        info = xml.etree.ElementTree.fromstring(
+            self._connection.op("show system info", is_xml=False)
+        )
+        installed = info.findtext(".//{0}".format(INSTALLED_VERSIONS[content_type]))
+
+        if installed and content_key(installed) >= latest[0]:
+            return None
+
+        self._latest_files[content_type] = (latest[2], None)
+
+        return latest[1]
+
+    def _warn_outlier(self, job_type, outliers):
+        display.warning(
+            "panos_dynamic_updates: {0} took much longer than usual".format(job_type)
+        )
+        outliers.append(job_type)
+
+    def _download_content(self, content_types, history=None):
+        """
+        Starts downloads of the latest version of each content type at the
+        same time, then waits for all of them.
+
+        :returns: List of outlier job types.
+        """
+        outliers = []
+        job_ids = []
+
+        for content_type in content_types:
+            display.debug("panos_dynamic_updates: download {0}".format(content_type))
+
+            download = (
+                "<request>"
+                "<{0}><upgrade><download><latest/></download></upgrade></{0}>"
+                "</request>".format(content_type)
+            )
+
+            response = self._connection.op(download)
+            job_ids.append(
+                xml.etree.ElementTree.fromstring(response).findtext(".//job")
+            )
+
+        # The downloads run together, so wait for the slowest one.
+        timeout = self.DEFAULT_TIMEOUT
+        if history:
+            timeout = max(
+                history.timeout("{0}-download".format(t), timeout)
+                for t in content_types
+            )
+
+        jobs = self._connection.poll_for_jobs(
+            job_ids, interval=5, timeout=timeout, min_interval=1
         )
 
-        self._connection.op(download, poll=True)
+        for content_type, job in zip(content_types, jobs):
+            job_result = xml.etree.ElementTree.fromstring(job["response"])
+
+            if job_result.findtext("./result/job/result") != "OK":
+                raise AnsibleError("download of {0} failed".format(content_type))
+
+            job_type = "{0}-download".format(content_type)
+
+            if history and history.record(job_type, job["elapsed"]):
+                self._warn_outlier(job_type, outliers)
+
+        if history:
+            history.save()
+
+        return outliers
+
+    def _install_content(self, content_type, history=None, path=None):
+        """
+        Installs the latest version of a content type, or the uploaded file
+        'path'.
+
+        :returns: List of outlier job types.
+        """
+        outliers = []
+
+        if path:
+            install_target = "<file>{0}</file>".format(os.path.basename(path))
+        else:
+            install_target = "<version>latest</version>"
 
         install = (
             "<request><{0}><upgrade><install>"
-            "<version>latest</version><commit>no</commit>"
-            "</install></upgrade></{0}></request>".format(content_type)
+            "{1}<commit>no</commit>"
+            "</install></upgrade></{0}></request>".format(content_type, install_target)
+        )
+
+        job_type = "{0}-install".format(content_type)
+        _, outlier = run_job(
+            self._connection, install, job_type, history=history, interval=5
         )
 
-        self._connection.op(install, poll=True)
+        if outlier:
+            self._warn_outlier(job_type, outliers)
+
+        return outliers
 
     def run(self, tmp=None, task_vars=None):
         if task_vars is None:
@@ -89,16 +258,42 @@ class ActionModule(ActionBase):
         del tmp
 
         content_types = self._task.args.get("content_type", ["content"])
+        history_dir = self._task.args.get("history_dir", None)
+        image_dir = self._task.args.get("image_dir", None)
+        cache_ttl = int(self._task.args.get("cache_ttl", 0))
+        cache_dir = self._task.args.get("cache_dir", DEFAULT_CACHE_DIR)
+        history = None
+        self._latest_files = {}
+        self._cache = None
+        self._cached = False
+        self._refresh = boolean(self._task.args.get("force_refresh", False))
+
+        if cache_ttl:
+            self._cache = ResultCache(
+                cache_dir, self._connection.version()["serial"], cache_ttl
+            )
+
+        if history_dir and not self._play_context.check_mode:
+            history = JobHistory(history_dir, self._connection.version()["serial"])
+            result["outliers"] = []
+
+        updates = []
 
         for content_type in content_types:
-            if content_type not in ["content", "anti-virus", "wildfire"]:
+            if content_type not in INSTALL_ORDER:
                 raise AnsibleError(
                     "'content_type' must be one of 'content', 'anti-virus', 'wildfire'"
                 )
 
             display.debug("panos_dynamic_updates: checking {0}".format(content_type))
 
-            latest_version = self._get_latest_content_version(content_type)
+            try:
+                latest_version = self._get_latest_content_version(content_type)
+            except Exception:
+                if not image_dir:
+                    raise
+
+                latest_version = self._get_latest_local_version(content_type, image_dir)
 
             if latest_version is not None:
                 display.debug(
@@ -106,9 +301,51 @@ class ActionModule(ActionBase):
                         latest_version, content_type
                     )
                 )
-                if not self._play_context.check_mode:
-                    self._download_install_content(content_type)
+                updates.append(content_type)
                 result["changed"] = True
                 result[content_type] = latest_version
 
+        if self._cache:
+            result["cached"] = self._cached
+
+        if self._play_context.check_mode or not updates:
+            return result
+
+        # Upload images found locally, and download the rest all at once.
+        paths = {}
+        outliers = []
+
+        for content_type in updates:
+            filename, sha256 = self._latest_files.get(content_type, (None, None))
+
+            try:
+                paths[content_type] = find_image(image_dir, filename, sha256)
+            except ValueError as e:
+                raise AnsibleError(to_text(e))
+
+            if paths[content_type]:
+                display.debug(
+                    "panos_dynamic_updates: upload {0}".format(paths[content_type])
+                )
+                self._connection.import_file(content_type, paths[content_type])
+
+        downloads = [t for t in updates if not paths[t]]
+
+        if downloads:
+            outliers.extend(self._download_content(downloads, history))
+
+        # Applications must be installed before the threat signatures that
+        # depend on them.
+        for content_type in sorted(updates, key=INSTALL_ORDER.index):
+            outliers.extend(
+                self._install_content(content_type, history, paths[content_type])
+            )
+
+            # The cached check no longer shows the installed version.
+            if self._cache:
+                self._cache.invalidate(check_cmd(content_type))
+
+        if history:
+            result["outliers"] = outliers
+
         return result
@@ -0,0 +1,115 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from ansible.module_utils._text import to_text
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.mrichardson03.panos.plugins.httpapi.panos import (
+    TimedOutException,
+)
+
+display = Display()
+
+
+class ActionModule(ActionBase):
+    TRANSFERS_FILES = False
+    _VALID_ARGS = frozenset(("job_ids", "sleep", "timeout", "workers"))
+
+    DEFAULT_MIN_SLEEP = 1
+    DEFAULT_SLEEP = 10
+    DEFAULT_TIMEOUT = 600
+    DEFAULT_WORKERS = 4
+
+    @staticmethod
+    def job_result(job):
+        """
+        Summarizes a finished job.
+
+        :param job: Job, as returned by poll_for_jobs().
+        :returns: Dict describing the job.
+        """
+        root = ET.fromstring(job["response"])
+
+        return {
+            "id": job["id"],
+            "type": root.findtext("./result/job/type"),
+            "result": root.findtext("./result/job/result"),
+            "details": [
+                line.text
+                for line in root.iterfind("./result/job/details//line")
+                if line.text
+            ],
+            "elapsed": job["elapsed"],
+        }
+
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None:
+            task_vars = dict()
+
+        sleep = int(self._task.args.get("sleep", self.DEFAULT_SLEEP))
+        timeout = int(self._task.args.get("timeout", self.DEFAULT_TIMEOUT))
+        workers = int(self._task.args.get("workers", self.DEFAULT_WORKERS))
+
+        # Tasks that did not start a job register no job ID, skip those.
+        job_ids = [
+            to_text(job_id) for job_id in self._task.args.get("job_ids") or [] if job_id
+        ]
+
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp is unused
+
+        start = datetime.now()
+
+        try:
+            jobs = self._connection.poll_for_jobs(
+                job_ids,
+                interval=sleep,
+                timeout=timeout,
+                min_interval=min(self.DEFAULT_MIN_SLEEP, sleep),
+                workers=workers,
+            )
+
+            result["jobs"] = [self.job_result(job) for job in jobs]
+
+            failed = [j["id"] for j in result["jobs"] if j["result"] != "OK"]
+
+            if failed:
+                result["failed"] = True
+                result["msg"] = "Job(s) {0} failed.".format(", ".join(failed))
+            else:
+                result["msg"] = "{0} job(s) completed.".format(len(job_ids))
+
+        except ConnectionError as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+
+        except TimedOutException as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+
+        elapsed = datetime.now() - start
+        result["changed"] = False
+        result["elapsed"] = elapsed.seconds
+
+        self._remove_tmp_path(self._connection._shell.tmpdir)
+
+        return result
@@ -19,18 +19,26 @@ __metaclass__ = type
 
 import time
 
-import xmltodict
 from ansible.errors import AnsibleError
 from ansible.module_utils._text import to_text
 from ansible.plugins.action import ActionBase
 from ansible.utils.display import Display
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    get_nested_key,
+    wait_for_restart,
+    xml_to_dict,
+)
 
 display = Display()
 
 
 class ActionModule(ActionBase):
     TRANSFERS_FILES = False
-    _VALID_ARGS = frozenset(["authcode"])
+    _VALID_ARGS = frozenset(["authcode", "restart_timeout", "timeout"])
+
+    DEFAULT_RESTART_TIMEOUT = 300
+    DEFAULT_SLEEP = 5
+    DEFAULT_TIMEOUT = 600
 
     def _apply_authcode(self, authcode):
         """Activates features using an authcode."""
@@ -38,6 +46,8 @@ class ActionModule(ActionBase):
             authcode
         )
 
+        result = None
+
         # Catch any exceptions here because things get weird when the management
         # plane restarts.
         try:
@@ -50,6 +60,23 @@ class ActionModule(ActionBase):
         else:
             return False
 
+    def _wait_for_ready(self, task_vars, timeout):
+        """Waits for the device to be ready, using the panos_check action."""
+        task = self._task.copy()
+        task.args = {"timeout": timeout}
+
+        check = self._shared_loader_obj.action_loader.get(
+            "mrichardson03.panos.panos_check",
+            task=task,
+            connection=self._connection,
+            play_context=self._play_context,
+            loader=self._loader,
+            templar=self._templar,
+            shared_loader_obj=self._shared_loader_obj,
+        )
+
+        return check.run(task_vars=task_vars)
+
     def _fetch_licenses(self):
         """Retrieves info on licensees."""
         cmd = "request license info"
@@ -59,13 +86,13 @@ class ActionModule(ActionBase):
         except Exception as e:
             raise AnsibleError("Error retreiving license info.") from e
 
-        parsed = xmltodict.parse(result, force_list=("entry,"))
-        licenses = parsed.get("response").get("result").get("licenses", None)
+        parsed = xml_to_dict(result)
+        licenses = get_nested_key(parsed, ["response", "result", "licenses"])
 
         if licenses is None:
             return []
         else:
-            return parsed.get("response").get("result").get("licenses").get("entry", [])
+            return licenses.get("entry", [])
 
     def run(self, tmp=None, task_vars=None):
         if task_vars is None:
@@ -75,18 +102,31 @@ class ActionModule(ActionBase):
         del tmp
 
         authcode = self._task.args.get("authcode", None)
+        restart_timeout = int(
+            self._task.args.get("restart_timeout", self.DEFAULT_RESTART_TIMEOUT)
+        )
+        timeout = int(self._task.args.get("timeout", self.DEFAULT_TIMEOUT))
+
+        start = time.time()
+        phases = dict()
 
         if authcode:
-            if self._apply_authcode(authcode):
-                # Activating a VM license causes a management plane restart.
-                # Sleep for a completely unscientific amount of time,
-                # then see if the autocommit has succeeded.
-                time.sleep(600)
+            phase_start = time.time()
+            applied = self._apply_authcode(authcode)
+            phases["activate"] = round(time.time() - phase_start, 3)
 
-                self._execute_module(
-                    module_name="mrichardson03.panos.panos_check",
-                    task_vars=task_vars,
+            if applied:
+                # Activating a VM license causes a management plane restart.
+                # Wait for it to go down, then for the autocommit to succeed.
+                phase_start = time.time()
+                result["restarted"] = wait_for_restart(
+                    self._connection, restart_timeout, self.DEFAULT_SLEEP
                 )
+                phases["restart"] = round(time.time() - phase_start, 3)
+
+                phase_start = time.time()
+                self._wait_for_ready(task_vars, timeout)
+                phases["ready"] = round(time.time() - phase_start, 3)
 
                 result["changed"] = True
 
@@ -94,5 +134,7 @@ class ActionModule(ActionBase):
 
         result["serial"] = version["serial"]
         result["licenses"] = self._fetch_licenses()
+        result["elapsed"] = round(time.time() - start, 3)
+        result["phases"] = phases
 
         return result
@@ -18,16 +18,163 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import re
+import xml.etree.ElementTree as ET
+
 import yaml
 from ansible.errors import AnsibleActionFail, AnsibleError
 from ansible.module_utils._text import to_text
 from ansible.plugins.action import ActionBase
 from ansible.utils.display import Display
+from ansible_collections.mrichardson03.panos.plugins.module_utils.cache import (
+    DEFAULT_CACHE_DIR,
+    cached_parse,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    config_element_changed,
+    minify_xml,
+    relative_xpath,
+    split_xpath,
+)
 from yaml.error import YAMLError
 
 display = Display()
 
 
+def is_template(value):
+    """Checks if a string contains any Jinja markers and needs templating."""
+    return isinstance(value, str) and any(m in value for m in ("{{", "{%", "{#"))
+
+
+def parse_snippet_group(data):
+    """Parses the contents of a snippet group file."""
+    return yaml.safe_load(to_text(data, errors="surrogate_or_strict"))
+
+
+def group_xpaths(xpaths):
+    """
+    Groups xpaths by the configuration subtree they fall under, so each
+    subtree only needs to be retrieved once.
+
+    An xpath ending in an 'entry' is grouped under its parent, so all the
+    entries in a list share a subtree.  Subtrees contained in other subtrees
+    are merged into them.
+
+    :param xpaths: List of xpaths.
+    :returns: Dict of subtree xpath to a dict of each xpath under it and its
+    path relative to the subtree.
+    """
+    containers = {}
+    for xpath in xpaths:
+        steps = split_xpath(xpath)
+        if len(steps) > 1 and steps[-1].startswith("entry["):
+            steps = steps[:-1]
+        containers[xpath] = steps
+
+    roots = []
+    for steps in sorted(containers.values(), key=len):
+        if not any(steps[: len(root)] == root for root in roots):
+            roots.append(steps)
+
+    groups = {}
+    for xpath, steps in containers.items():
+        root = "/" + "/".join(next(r for r in roots if steps[: len(r)] == r))
+        groups.setdefault(root, {})[xpath] = relative_xpath(root, xpath)
+
+    return groups
+
+
+def defined_names(xpath, element):
+    """
+    Finds the names of the entries a snippet creates, from either its xpath
+    or the top level entries in its element.
+    """
+    names = set()
+
+    match = re.search(r"entry\[@name=['\"]([^'\"]+)['\"]\]$", xpath or "")
+    if match:
+        names.add(match.group(1))
+
+    try:
+        wrapped = ET.fromstring("<wrapped>" + (element or "") + "</wrapped>")
+        names.update(e.attrib["name"] for e in wrapped.findall("./entry[@name]"))
+    except ET.ParseError:
+        pass
+
+    return names
+
+
+def referenced_names(element):
+    """Finds all the text values in a snippet's element, such as members."""
+    try:
+        wrapped = ET.fromstring("<wrapped>" + (element or "") + "</wrapped>")
+    except ET.ParseError:
+        return set()
+
+    return set(e.text.strip() for e in wrapped.iter() if e.text and e.text.strip())
+
+
+def snippet_layers(snippets):
+    """
+    Sorts snippets into layers, where each snippet only depends on snippets in
+    earlier layers.
+
+    A snippet depends on the snippets named in its 'depends' list, and on any
+    earlier snippet whose xpath overlaps with its own or that creates an
+    object it refers to by name.
+
+    :param snippets: List of dicts with the keys 'name', 'xpath', 'element'
+    and 'depends'.
+    :returns: List of layer numbers, in the same order as 'snippets'.
+    """
+    index = dict((s["name"], i) for i, s in enumerate(snippets))
+    steps = [split_xpath(s["xpath"] or "") for s in snippets]
+    defined = [defined_names(s["xpath"], s["element"]) for s in snippets]
+
+    depends = []
+    for i, snippet in enumerate(snippets):
+        deps = set()
+
+        for name in snippet.get("depends") or []:
+            if name not in index:
+                raise AnsibleActionFail(
+                    "Snippet '{0}' depends on unknown snippet '{1}'".format(
+                        snippet["name"], name
+                    )
+                )
+            deps.add(index[name])
+
+        refs = referenced_names(snippet["element"])
+
+        for j in range(i):
+            common = min(len(steps[i]), len(steps[j]))
+            if steps[i][:common] == steps[j][:common] or defined[j] & refs:
+                deps.add(j)
+
+        depends.append(deps)
+
+    layers = [None] * len(snippets)
+
+    def _layer(i, seen):
+        if layers[i] is None:
+            if i in seen:
+                raise AnsibleActionFail(
+                    "Snippet '{0}' has a circular dependency".format(
+                        snippets[i]["name"]
+                    )
+                )
+
+            seen = seen | {i}
+            layers[i] = max([_layer(j, seen) + 1 for j in depends[i]] + [0])
+
+        return layers[i]
+
+    for i in range(len(snippets)):
+        _layer(i, set())
+
+    return layers
+
+
 class ActionModule(ActionBase):
     @staticmethod
     def _extract_snippet_group_variables(snippet_group_def):
@@ -70,16 +217,19 @@ class ActionModule(ActionBase):
         except AnsibleError as e:
             raise AnsibleActionFail(to_text(e))
 
-        with open(src_file, "rb") as f:
-            try:
-                src_file_data = to_text(f.read(), errors="surrogate_or_strict")
-
-                snippet_group = yaml.safe_load(src_file_data)
+        cache_dir = self._task.args.get("cache_dir", DEFAULT_CACHE_DIR)
+        workers = int(self._task.args.get("workers", 1))
 
-            except UnicodeError:
-                raise AnsibleActionFail("Source files must be utf-8 encoded")
-            except YAMLError:
-                raise AnsibleActionFail("Could not load Snippets file")
+        try:
+            snippet_group, cached = cached_parse(
+                src_file, parse_snippet_group, cache_dir=cache_dir
+            )
+            display.vvv("snippet group cached: {0}".format(cached))
+
+        except UnicodeError:
+            raise AnsibleActionFail("Source files must be utf-8 encoded")
+        except YAMLError:
+            raise AnsibleActionFail("Could not load Snippets file")
 
         if "snippets" not in snippet_group:
             raise AnsibleActionFail("Could not load Snippets file")
@@ -90,38 +240,124 @@ class ActionModule(ActionBase):
         # allow user to override any variable defined therein via the task_vars
         task_var_defaults.update(task_vars)
 
+        # Render all of the snippets first.
+        snippets = []
         for snippet in snippet_group["snippets"]:
-            snippet_name = snippet.get("name", None)
-            xpath_tpl = snippet.get("xpath", None)
-            element_tpl = snippet.get("element", None)
-            cmd = snippet.get("cmd", "set")
-
-            if cmd == "edit":
-                override = True
-            else:
-                override = False
-
-            with self._templar.set_temporary_context(
-                available_variables=task_var_defaults
-            ):
-                xpath = self._templar.do_template(xpath_tpl)
-                element = self._templar.do_template(element_tpl)
-
-                display.vvv("xpath is now: {0}".format(xpath))
-                display.vvv("element is now: {0}".format(element))
-
-                module_args = {"xpath": xpath, "element": element, "override": override}
-
-                snippet_result = self._execute_module(
-                    module_name="panos_config_element",
-                    module_args=module_args,
-                    task_vars=task_var_defaults,
+            xpath = snippet.get("xpath", None)
+            element = snippet.get("element", None)
+
+            # Only run strings that contain Jinja through the templar.
+            if is_template(xpath) or is_template(element):
+                with self._templar.set_temporary_context(
+                    available_variables=task_var_defaults
+                ):
+                    if is_template(xpath):
+                        xpath = self._templar.do_template(xpath)
+                    if is_template(element):
+                        element = self._templar.do_template(element)
+
+            try:
+                element = minify_xml(element or "")
+            except ValueError as e:
+                raise AnsibleActionFail(
+                    "Snippet '{0}' has invalid XML: {1}".format(
+                        snippet.get("name", None), to_text(e)
+                    )
                 )
 
-                result[snippet_name] = snippet_result
-                display.vvv(str(snippet_result))
+            display.vvv("xpath is now: {0}".format(xpath))
+            display.vvv("element is now: {0}".format(element))
+
+            snippets.append(
+                {
+                    "name": snippet.get("name", None),
+                    "xpath": xpath,
+                    "element": element,
+                    "edit": snippet.get("cmd", "set") == "edit",
+                    "depends": snippet.get("depends", []),
+                }
+            )
 
-                if snippet_result.get("changed", True):
+        layers = snippet_layers(snippets)
+
+        try:
+            existing = self._get_existing([s["xpath"] for s in snippets])
+
+            # Compare each snippet against the existing configuration locally.
+            operations = []
+            for snippet, layer in zip(snippets, layers):
+                current = existing.get(snippet["xpath"])
+
+                try:
+                    changed = config_element_changed(
+                        current, snippet["element"], snippet["edit"]
+                    )
+                except ET.ParseError as e:
+                    raise AnsibleActionFail(
+                        "Snippet '{0}' has invalid XML: {1}".format(
+                            snippet["name"], to_text(e)
+                        )
+                    )
+
+                before = ""
+                if current is not None:
+                    before = to_text(ET.tostring(current, encoding="unicode"))
+
+                result[snippet["name"]] = {
+                    "changed": changed,
+                    "diff": {"before": before, "after": snippet["element"]},
+                }
+
+                if changed:
                     result["changed"] = True
+                    operations.append(
+                        {
+                            "action": "edit" if snippet["edit"] else "set",
+                            "xpath": snippet["xpath"],
+                            "element": snippet["element"],
+                            "layer": layer,
+                        }
+                    )
+
+            # Push all the changed snippets together.  Independent snippets
+            # are spread over several requests when 'workers' is set.
+            if operations and not self._play_context.check_mode:
+                operations.sort(key=lambda o: o["layer"])
+                self._connection.multi_config(operations, workers=workers)
+
+        except ConnectionError as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
 
         return result
+
+    def _get_existing(self, xpaths):
+        """
+        Retrieves the existing configuration at each xpath, retrieving each
+        distinct configuration subtree only once.
+
+        :param xpaths: List of xpaths.
+        :returns: Dict of xpath to Element, or None if it does not exist.
+        """
+        existing = {}
+
+        for root_xpath, members in group_xpaths(xpaths).items():
+            display.vvv("retrieving subtree: {0}".format(root_xpath))
+
+            root = ET.fromstring(self._connection.get(root_xpath)).find("./result/")
+
+            for xpath, relative in members.items():
+                if root is None:
+                    existing[xpath] = None
+                    continue
+
+                try:
+                    existing[xpath] = root.find(relative)
+                except SyntaxError:
+                    # Predicates ElementTree doesn't understand, retrieve
+                    # these directly.
+                    existing[xpath] = ET.fromstring(self._connection.get(xpath)).find(
+                        "./result/"
+                    )
+
+        return existing
@@ -16,13 +16,34 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import os
+import re
+import xml.etree.ElementTree as ET
+from functools import total_ordering
+
 from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_text
+from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.plugins.action import ActionBase
 from ansible.utils.display import Display
+from ansible_collections.mrichardson03.panos.plugins.module_utils.cache import (
+    DEFAULT_CACHE_DIR,
+    ResultCache,
+    cached_op,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.job_history import (
+    JobHistory,
+    run_job,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    find_image,
+    wait_for_restart,
+)
 
 display = Display()
 
 
+@total_ordering
 class PanOSVersion(object):
     def __init__(self, version):
         try:
@@ -35,6 +56,13 @@ class PanOSVersion(object):
         self.major = int(self.major)
         self.minor = int(self.minor)
 
+    def _key(self):
+        # Hotfix releases look like '10.1.6-h3'.
+        match = re.match(r"(\d+)(?:-h(\d+))?", self.patch)
+        patch, hotfix = match.groups() if match else (0, 0)
+
+        return (self.major, self.minor, int(patch), int(hotfix or 0))
+
     def __eq__(self, other):
         if (
             self.major == other.major
@@ -45,6 +73,12 @@ class PanOSVersion(object):
         else:
             return False
 
+    def __lt__(self, other):
+        return self._key() < other._key()
+
+    def __hash__(self):
+        return hash((self.major, self.minor, self.patch))
+
     def __str__(self):
         s = "{0}.{1}.{2}".format(self.major, self.minor, self.patch)
 
@@ -53,6 +87,11 @@ class PanOSVersion(object):
 
         return s
 
+    @property
+    def base(self):
+        """Base image of the feature release this version is part of."""
+        return PanOSVersion("{0}.{1}.0".format(self.major, self.minor))
+
 
 def is_valid_upgrade(current, target):
     # Patch version upgrade (major and minor versions match)
@@ -63,74 +102,293 @@ def is_valid_upgrade(current, target):
     elif (current.major == target.major) and (current.minor + 1 == target.minor):
         return True
 
-    # Upgrade major version (9.1.0 -> 10.0.0)
-    elif (current.major + 1 == target.major) and (target.minor == 0):
-        return True
-
+    # Upgrading the major version (9.1.0 -> 10.0.0) is only valid from its
+    # last minor version, which needs the list of releases (see
+    # plan_upgrade()).
     else:
         return False
 
 
+def next_feature(current, features):
+    """
+    Returns the feature release that follows 'current', which is the next
+    minor version, or the next major version's first release if 'current' is
+    the last minor version of its major version.
+
+    :param current: (major, minor) of the running feature release.
+    :param features: Known (major, minor) feature releases.
+    :returns: (major, minor) of the next feature release, or None.
+    """
+    (major, minor) = current
+
+    if (major, minor + 1) in features:
+        return (major, minor + 1)
+
+    if any(f[0] == major and f[1] > minor for f in features):
+        # Minor versions are missing, so the next one isn't known.
+        return None
+
+    if (major + 1, 0) in features:
+        return (major + 1, 0)
+
+    return None
+
+
+def plan_upgrade(current, target, available):
+    """
+    Works out the versions to install to get from 'current' to 'target'.
+
+    Upgrades go through every feature release in turn, so each intermediate
+    hop is the base image of the next feature release.
+
+    :param current: Running version.
+    :param target: Desired version.
+    :param available: Versions available to the device.
+    :returns: List of versions to install in order, ending with 'target'.
+    """
+    path = []
+    features = set((v.major, v.minor) for v in available)
+    features.add((target.major, target.minor))
+    feature = (current.major, current.minor)
+
+    while feature < (target.major, target.minor):
+        feature = next_feature(feature, features)
+
+        if feature is None:
+            break
+
+        if feature < (target.major, target.minor):
+            base = PanOSVersion("{0}.{1}.0".format(*feature))
+
+            if base not in available:
+                break
+
+            path.append(base)
+
+    if feature != (target.major, target.minor):
+        raise AnsibleError("upgrade is invalid: ({0} -> {1})".format(current, target))
+
+    path.append(target)
+
+    return path
+
+
+def required_images(current, path):
+    """
+    Returns the images that must be downloaded to install each version in
+    'path', including base images of new feature releases.
+    """
+    images = []
+
+    for hop in path:
+        if (hop.major, hop.minor) != (current.major, current.minor) and hop.base != hop:
+            images.append(hop.base)
+
+        images.append(hop)
+        current = hop
+
+    return images
+
+
+CHECK_CMD = "<request><system><software><check></check></software></system></request>"
+
+
 class ActionModule(ActionBase):
     TRANSFERS_FILES = False
     _VALID_ARGS = frozenset(
-        ["version", "sync_to_peer", "download", "install", "restart", "timeout"]
+        [
+            "version",
+            "sync_to_peer",
+            "download",
+            "install",
+            "restart",
+            "timeout",
+            "history_dir",
+            "image_dir",
+            "cache_ttl",
+            "cache_dir",
+            "force_refresh",
+        ]
     )
 
-    def _do_upgrade(
+    DEFAULT_RESTART_TIMEOUT = 300
+    DEFAULT_SLEEP = 10
+
+    def _run_job(self, cmd, job_type, timeout, history=None):
+        # Explicit timeouts win over predictions.
+        response, outlier = run_job(
+            self._connection,
+            cmd,
+            job_type,
+            history=history,
+            timeout=timeout,
+            predict="timeout" not in self._task.args,
+        )
+
+        if outlier:
+            display.warning(
+                "panos_software: {0} took much longer than usual".format(job_type)
+            )
+            self._outliers.append(job_type)
+
+        return response
+
+    def _check(self, image_dir=None):
+        """
+        Refreshes the list of available software.
+
+        If the device cannot reach the update servers and 'image_dir' is set,
+        the images in 'image_dir' are used as the list instead.
+
+        :param image_dir: Local image directory.
+        :returns: Dict of available versions to dicts with 'downloaded',
+        'filename' and 'sha256'.
+        """
+        try:
+            response, self._cached = cached_op(
+                self._connection, CHECK_CMD, cache=self._cache, refresh=self._refresh
+            )
+        except Exception:
+            if not image_dir:
+                raise
+
+            display.debug("panos_software: check failed, using {0}".format(image_dir))
+
+            return self._local_images(image_dir)
+
+        return dict(
+            (
+                PanOSVersion(entry.findtext("version")),
+                {
+                    "downloaded": entry.findtext("downloaded") == "yes",
+                    "filename": entry.findtext("filename"),
+                    "sha256": entry.findtext("sha256"),
+                },
+            )
+            for entry in ET.fromstring(response).iterfind(".//versions/entry")
+            if entry.findtext("version")
+        )
+
+    @staticmethod
+    def _local_images(image_dir):
+        """
+        Lists the software images in a local image directory.  Images are
+        named like 'PanOS_vm-10.1.3'.
+        """
+        images = {}
+
+        for filename in sorted(os.listdir(image_dir)):
+            match = re.match(r"PanOS_[^-]+-(\d+\.\d+\.\d+(?:-h\d+)?)$", filename)
+
+            if match:
+                images[PanOSVersion(match.group(1))] = {
+                    "downloaded": False,
+                    "filename": filename,
+                    "sha256": None,
+                }
+
+        return images
+
+    def _download(
         self,
-        current,
-        target,
+        images,
         sync_to_peer=True,
-        download=True,
-        install=True,
         timeout=600,
+        history=None,
+        image_dir=None,
+        available=None,
     ):
-        display.debug(
-            "panos_software: performing upgrade ({0} -> {1})".format(current, target)
-        )
+        """
+        Uploads images found in 'image_dir', then downloads the rest all at
+        the same time and waits for all of them.
+        """
+        job_ids = []
+        downloads = []
 
-        cmd = "<request><system><software><check></check></software></system></request>"
-        self._connection.op(cmd)
+        for image in images:
+            entry = (available or {}).get(image, {})
 
-        if download and (
-            (current.major != target.major) or (current.minor != target.minor)
-        ):
-            base = PanOSVersion("{0}.{1}.0".format(target.major, target.minor))
-            display.debug("panos_software: download new base version: {0}".format(base))
+            try:
+                path = find_image(image_dir, entry.get("filename"), entry.get("sha256"))
+            except ValueError as e:
+                raise AnsibleError(to_text(e))
+
+            if path:
+                display.debug("panos_software: upload version: {0}".format(image))
+                self._connection.import_file("software", path)
+                self._uploaded.append(str(image))
+                continue
+
+            display.debug("panos_software: download version: {0}".format(image))
 
             cmd = (
                 "<request><system><software><download>"
                 "<version>{0}</version><sync-to-peer>{1}</sync-to-peer>"
                 "</download></software></system></request>".format(
-                    base, "yes" if sync_to_peer else "no"
+                    image, "yes" if sync_to_peer else "no"
                 )
             )
 
-            self._connection.op(cmd, poll=True, poll_interval=10, poll_timeout=timeout)
+            response = self._connection.op(cmd)
+            job_ids.append(ET.fromstring(response).findtext(".//job"))
+            downloads.append(image)
 
-        if download:
-            display.debug("panos_software: download target version: {0}".format(target))
+        if not job_ids:
+            return
 
-            cmd = (
-                "<request><system><software><download>"
-                "<version>{0}</version><sync-to-peer>{1}</sync-to-peer>"
-                "</download></software></system></request>".format(
-                    target, "yes" if sync_to_peer else "no"
-                )
-            )
+        if history and "timeout" not in self._task.args:
+            timeout = history.timeout("download", timeout)
+
+        jobs = self._connection.poll_for_jobs(
+            job_ids, interval=self.DEFAULT_SLEEP, timeout=timeout, min_interval=1
+        )
 
-            self._connection.op(cmd, poll=True, poll_interval=10, poll_timeout=timeout)
+        for image, job in zip(downloads, jobs):
+            if ET.fromstring(job["response"]).findtext("./result/job/result") != "OK":
+                raise AnsibleError("download of {0} failed".format(image))
 
-        if install:
-            display.debug("panos_software: install target version: {0}".format(target))
-            cmd = (
-                "<request><system><software><install>"
-                "<version>{0}</version>"
-                "</install></software></system></request>".format(target)
-            )
+            if history and history.record("download", job["elapsed"]):
+                display.warning("panos_software: download took much longer than usual")
+                self._outliers.append("download")
+
+        if history:
+            history.save()
+
+    def _install(self, version, timeout=600, history=None):
+        display.debug("panos_software: install version: {0}".format(version))
+
+        cmd = (
+            "<request><system><software><install>"
+            "<version>{0}</version>"
+            "</install></software></system></request>".format(version)
+        )
+
+        self._run_job(cmd, "install", timeout, history)
+
+    def _restart(self, task_vars, timeout=600):
+        """Restarts the device and waits for it to be ready again."""
+        display.debug("panos_software: restarting device")
+
+        self._connection.op("request restart system", is_xml=False)
 
-            self._connection.op(cmd, poll=True, poll_interval=10, poll_timeout=timeout)
+        wait_for_restart(self._connection, self.DEFAULT_RESTART_TIMEOUT)
+
+        task = self._task.copy()
+        task.args = {"timeout": timeout}
+
+        check = self._shared_loader_obj.action_loader.get(
+            "mrichardson03.panos.panos_check",
+            task=task,
+            connection=self._connection,
+            play_context=self._play_context,
+            loader=self._loader,
+            templar=self._templar,
+            shared_loader_obj=self._shared_loader_obj,
+        )
+
+        check.run(task_vars=task_vars)
+
+        return PanOSVersion(self._connection.version(refresh=True)["sw-version"])
 
     def run(self, tmp=None, task_vars=None):
         if task_vars is None:
@@ -148,26 +406,96 @@ class ActionModule(ActionBase):
         install = bool(self._task.args.get("install", True))
         restart = bool(self._task.args.get("restart", False))
         timeout = int(self._task.args.get("timeout", 600))
+        history_dir = self._task.args.get("history_dir", None)
+        image_dir = self._task.args.get("image_dir", None)
+        cache_ttl = int(self._task.args.get("cache_ttl", 0))
+        cache_dir = self._task.args.get("cache_dir", DEFAULT_CACHE_DIR)
+        self._cache = None
+        self._cached = False
+        self._refresh = boolean(self._task.args.get("force_refresh", False))
 
         current = PanOSVersion(self._connection.version()["sw-version"])
 
+        if cache_ttl:
+            self._cache = ResultCache(
+                cache_dir, self._connection.version()["serial"], cache_ttl
+            )
+
         if target != current:
             result["changed"] = True
             result["msg"] = "Installed PAN-OS version {0}.".format(target)
 
-            if not is_valid_upgrade(current, target):
+            if is_valid_upgrade(current, target):
+                available = {}
+                path = [target]
+            else:
+                available = self._check(image_dir)
+                path = plan_upgrade(current, target, list(available))
+
+            result["path"] = [str(v) for v in path]
+
+            if len(path) > 1 and install and not restart:
                 raise AnsibleError(
-                    "upgrade is invalid: ({0} -> {1})".format(current, target)
+                    "upgrade ({0} -> {1}) requires restarts, set 'restart'".format(
+                        current, target
+                    )
                 )
 
             if not self._play_context.check_mode:
-                self._do_upgrade(
-                    current,
-                    target,
-                    sync_to_peer=sync_to_peer,
-                    download=download,
-                    install=install,
-                )
+                history = None
+                self._outliers = []
+                self._uploaded = []
+
+                if history_dir:
+                    history = JobHistory(
+                        history_dir, self._connection.version()["serial"]
+                    )
+
+                if not available:
+                    available = self._check(image_dir)
+
+                if download:
+                    images = [
+                        image
+                        for image in required_images(current, path)
+                        if not available.get(image, {}).get("downloaded")
+                    ]
+
+                    if images:
+                        self._download(
+                            images,
+                            sync_to_peer=sync_to_peer,
+                            timeout=timeout,
+                            history=history,
+                            image_dir=image_dir,
+                            available=available,
+                        )
+
+                    result["uploaded"] = self._uploaded
+
+                if install:
+                    for hop in path:
+                        self._install(hop, timeout=timeout, history=history)
+
+                        if hop != target:
+                            current = self._restart(task_vars, timeout=timeout)
+
+                            if current != hop:
+                                raise AnsibleError(
+                                    "device is running {0} after installing {1}".format(
+                                        current, hop
+                                    )
+                                )
+
+                if history:
+                    result["outliers"] = self._outliers
+
+                # The cached check no longer shows what is downloaded.
+                if self._cache:
+                    self._cache.invalidate(CHECK_CMD)
+
+            if self._cache:
+                result["cached"] = self._cached
 
             if restart:
                 display.debug("panos_software: restarting device")
@@ -32,3 +32,14 @@ options:
             - present
             - absent
 """
+
+    TARGET = """
+options:
+    target:
+        description:
+            - Serial number of a firewall managed by Panorama.
+            - When set, the module connects to Panorama, and its requests are proxied through
+              Panorama to this firewall.  This overrides the C(ansible_panos_target) connection
+              variable.
+        type: str
+"""
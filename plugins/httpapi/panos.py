@@ -33,13 +33,27 @@ options:
             - Use API key for authentication instead of username and password
         vars:
             - name: ansible_api_key
+    target:
+        type: str
+        description:
+            - Serial number of a firewall managed by Panorama.  When set, the
+              connection is made to Panorama, and all API requests are proxied
+              through it to this firewall.
+        vars:
+            - name: ansible_panos_target
 """
 
+import os
+import threading
 import time
+import uuid
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 from ansible.module_utils.basic import to_text
+from ansible.module_utils.six import BytesIO
 from ansible.module_utils.six.moves import urllib
 from ansible.module_utils.six.moves.urllib.error import HTTPError
 from ansible.plugins.httpapi import HttpApiBase
@@ -109,12 +123,93 @@ class TimedOutException(Exception):
     pass
 
 
+class MultipartFile(object):
+    """
+    File-like object containing a multipart/form-data request body with a
+    single file, read from disk as the body is sent instead of being loaded
+    into memory.
+    """
+
+    def __init__(self, path, filename=None, field="file"):
+        """
+        :param path: Path of the file to send.
+        :param filename: File name to send, defaults to the name of 'path'.
+        :param field: Form field name.
+        """
+        self.boundary = uuid.uuid4().hex
+        self.content_type = "multipart/form-data; boundary={0}".format(self.boundary)
+
+        self._head = (
+            "--{0}\r\n"
+            'Content-Disposition: form-data; name="{1}"; filename="{2}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n".format(
+                self.boundary, field, filename or os.path.basename(path)
+            )
+        ).encode("utf-8")
+        self._tail = "\r\n--{0}--\r\n".format(self.boundary).encode("utf-8")
+        self._size = os.path.getsize(path)
+        self._file = open(path, "rb")
+        self._parts = [BytesIO(self._head), self._file, BytesIO(self._tail)]
+
+    def __len__(self):
+        return len(self._head) + self._size + len(self._tail)
+
+    def read(self, size=-1):
+        chunks = []
+
+        while self._parts and (size < 0 or size > 0):
+            chunk = self._parts[0].read(size)
+
+            if not chunk:
+                self._parts.pop(0)
+                continue
+
+            chunks.append(chunk)
+
+            if size > 0:
+                size -= len(chunk)
+
+        return b"".join(chunks)
+
+    def close(self):
+        self._file.close()
+
+
+def next_poll_interval(progress, elapsed, min_interval, max_interval):
+    """
+    Calculates how long to wait before polling a job again.
+
+    When the job reports progress, the remaining time is estimated from the
+    rate of progress so far, and the next poll happens halfway through that
+    estimate.  Without progress, the interval grows with the time elapsed.
+    The result is always between 'min_interval' and 'max_interval'.
+
+    :param progress: Job progress reported by the device (percent), or None.
+    :param elapsed: Seconds since polling started.
+    :param min_interval: Shortest interval, in seconds.
+    :param max_interval: Longest interval, in seconds.
+    """
+    try:
+        progress = int(progress)
+    except (TypeError, ValueError):
+        progress = 0
+
+    if 0 < progress < 100:
+        interval = elapsed * (100 - progress) / progress / 2
+    else:
+        interval = elapsed / 4
+
+    return min(max_interval, max(min_interval, interval))
+
+
 class HttpApi(HttpApiBase):
     def __init__(self, connection):
         super().__init__(connection)
 
         self._api_key = None
         self._device_info = None
+        self._target_info = {}
+        self._local = threading.local()
 
     def api_key(self):
         """
@@ -136,6 +231,33 @@ class HttpApi(HttpApiBase):
 
         return self._api_key
 
+    def _current_target(self):
+        """
+        Returns the serial number of the firewall requests are proxied to, or
+        None if requests go to the connected device.
+        """
+        if hasattr(self._local, "target"):
+            return self._local.target
+
+        return self.get_option("target")
+
+    @contextmanager
+    def _targeting(self, target):
+        """
+        Proxies the requests made by the current thread to 'target' until the
+        context exits.
+        """
+        previous = getattr(self._local, "target", self)
+        self._local.target = target
+
+        try:
+            yield
+        finally:
+            if previous is self:
+                del self._local.target
+            else:
+                self._local.target = previous
+
     def keygen(self, username, password):
         """
         Generates an API key for the requested user.  If successful, this key
@@ -152,7 +274,11 @@ class HttpApi(HttpApiBase):
         params = {"type": "keygen", "user": username, "password": password}
 
         data = urllib.parse.urlencode(params)
-        code, response = self.send_request(data)
+
+        # Keys are always generated on the connected device, since Panorama
+        # keys are accepted for proxied requests.
+        with self._targeting(None):
+            code, response = self.send_request(data)
 
         # Will throw exception if credentials are bad.
         response = self._validate_response(code, response)
@@ -292,6 +418,102 @@ class HttpApi(HttpApiBase):
         """
         pass
 
+    def multi_config(self, operations, max_size=int(4.5e6), workers=1):
+        """
+        Applies several configuration changes in as few API calls as possible.
+
+        Operations are sent in order as 'multi-config' requests, which PAN-OS
+        applies atomically.  Operations are split over several requests when
+        needed to stay under the XML API request size limit.
+
+        Operations can be given a 'layer'.  When 'workers' is greater than one,
+        layers are applied in ascending order, and the operations within a
+        layer are treated as independent of each other and split over up to
+        'workers' concurrent requests.
+
+        :param operations: List of dicts with the keys 'action' ('set', 'edit'
+        or 'delete'), 'xpath' and 'element', and optionally 'layer'.  For
+        'set', 'element' can contain several elements.
+        :param max_size: Maximum size of the encoded request data.
+        :param workers: Maximum number of requests to send at once.
+        :returns: List of responses, one per request sent.
+
+        Reference:
+        https://docs.paloaltonetworks.com/pan-os/10-0/pan-os-panorama-api/pan-os-xml-api-request-types/configuration-api/multi-config.html
+        """
+
+        layers = {}
+
+        for idx, operation in enumerate(operations):
+            op_el = ET.Element(
+                operation["action"], {"id": str(idx + 1), "xpath": operation["xpath"]}
+            )
+
+            element = operation.get("element")
+            if element:
+                op_el.extend(ET.fromstring("<wrapped>" + element + "</wrapped>"))
+
+            op_xml = to_text(ET.tostring(op_el, encoding="unicode"))
+            layer = operation.get("layer", 0) if workers > 1 else 0
+
+            layers.setdefault(layer, []).append(op_xml)
+
+        responses = []
+
+        for layer in sorted(layers):
+            ops = layers[layer]
+
+            # Spread the layer evenly over the workers before splitting on size.
+            parts = min(max(workers, 1), len(ops))
+            size = -(-len(ops) // parts)
+
+            batches = []
+            for start in range(0, len(ops), size):
+                batches.extend(self._split_batch(ops[start : start + size], max_size))
+
+            responses.extend(self._parallel(self._send_multi_config, batches, workers))
+
+        return responses
+
+    @staticmethod
+    def _split_batch(ops, max_size):
+        """
+        Splits a list of 'multi-config' operations into batches whose encoded
+        size stays under 'max_size'.
+        """
+        batches = []
+        batch = []
+        size = 0
+
+        for op_xml in ops:
+            op_size = len(urllib.parse.quote_plus(op_xml))
+
+            if batch and size + op_size > max_size:
+                batches.append(batch)
+                batch = []
+                size = 0
+
+            batch.append(op_xml)
+            size += op_size
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def _send_multi_config(self, batch):
+        params = {
+            "type": "config",
+            "key": self.api_key(),
+            "action": "multi-config",
+            "element": "<multi-config>{0}</multi-config>".format("".join(batch)),
+        }
+
+        data = urllib.parse.urlencode(params)
+        code, response = self.send_request(data)
+
+        return self._validate_response(code, response)
+
     def override(self, xpath, element):
         """
         Overrides a setting that has been pushed to a firewall from a template.
@@ -376,18 +598,96 @@ class HttpApi(HttpApiBase):
 
         return self._validate_response(code, response)
 
-    def commit_all(self, validate=False, device_groups=None, vsys=None, serials=None):
+    def commit_all(
+        self,
+        device_groups=None,
+        templates=None,
+        serials=None,
+        description=None,
+        include_template=False,
+        validate=False,
+    ):
         """
         Push policy and template configuration from a Panorama device.
 
-        :param device_groups: Commit to specific device groups.
-        :param vsys: Commit to specific virtual system.
-        :param serials: Commit to specific firewall serial numbers.
+        A separate push is started for each device group and template, so
+        the pushes run concurrently on Panorama.
+
+        :param device_groups: Push to these device groups.
+        :param templates: Push to these templates.
+        :param serials: Only push to the firewalls with these serial numbers.
+        :param description: Description to add to the push.
+        :param include_template: Include device and network templates when
+        pushing to device groups.
+        :param validate: Only validate the push, without applying it.
+        :returns: List of job IDs started.
 
         Reference:
         https://docs.paloaltonetworks.com/pan-os/10-0/pan-os-panorama-api/pan-os-xml-api-request-types/commit-configuration-api/commit-all.html
         """
-        pass
+        cmds = []
+
+        for device_group in device_groups or []:
+            cmd = ET.Element("commit-all")
+            shared_policy = ET.SubElement(cmd, "shared-policy")
+            entry = ET.SubElement(
+                ET.SubElement(shared_policy, "device-group"),
+                "entry",
+                {"name": device_group},
+            )
+
+            if serials:
+                devices = ET.SubElement(entry, "devices")
+
+                for serial in serials:
+                    ET.SubElement(devices, "entry", {"name": serial})
+
+            if include_template:
+                ET.SubElement(shared_policy, "include-template").text = "yes"
+
+            cmds.append((cmd, shared_policy))
+
+        for template in templates or []:
+            cmd = ET.Element("commit-all")
+            template_element = ET.SubElement(cmd, "template")
+            ET.SubElement(template_element, "name").text = template
+
+            if serials:
+                devices = ET.SubElement(template_element, "device")
+
+                for serial in serials:
+                    ET.SubElement(devices, "member").text = serial
+
+            cmds.append((cmd, template_element))
+
+        job_ids = []
+
+        for cmd, push in cmds:
+            if description:
+                ET.SubElement(push, "description").text = description
+
+            if validate:
+                ET.SubElement(push, "validate-only").text = "yes"
+
+            params = {
+                "type": "commit",
+                "action": "all",
+                "key": self.api_key(),
+                "cmd": ET.tostring(cmd),
+            }
+
+            data = urllib.parse.urlencode(params)
+            code, response = self.send_request(data)
+
+            # No job is started if there is nothing to push.
+            job_id = ET.fromstring(self._validate_response(code, response)).findtext(
+                ".//job"
+            )
+
+            if job_id:
+                job_ids.append(job_id)
+
+        return job_ids
 
     def op(
         self,
@@ -438,10 +738,194 @@ class HttpApi(HttpApiBase):
         else:
             return response
 
+    def op_batch(self, cmds, is_xml=True, validate=True, workers=1):
+        """
+        Runs several operational commands in a single call.
+
+        Each command is run on its own HTTP request, so when 'workers' is
+        greater than one the commands run concurrently over separate HTTP
+        sessions.  Errors are reported per command instead of stopping the
+        batch.
+
+        :param cmds: List of commands to run.
+        :param is_xml: Commands are in XML format.
+        :param validate: Whether the responses should be validated.
+        :param workers: Maximum number of commands to run at once.
+        :returns: List of dicts with the keys 'cmd', 'stdout', 'elapsed' and
+        'msg', in the same order as 'cmds'.
+        """
+
+        def _run(cmd):
+            start = time.time()
+            result = {"cmd": cmd, "stdout": None, "msg": None}
+
+            try:
+                result["stdout"] = self.op(cmd, is_xml=is_xml, validate=validate)
+            except ConnectionError as e:
+                result["msg"] = to_text(e)
+
+            result["elapsed"] = round(time.time() - start, 3)
+
+            return result
+
+        return self._parallel(_run, cmds, workers)
+
+    def log(
+        self,
+        log_type="traffic",
+        query=None,
+        nlogs=None,
+        skip=None,
+        poll_interval=1,
+        poll_timeout=600,
+    ):
+        """
+        Retrieves logs from the device.
+
+        Log retrieval is an asynchronous job on the device, so the query is
+        enqueued and then polled until the job completes.  Use 'nlogs' and
+        'skip' to walk through large result sets one page at a time.
+
+        :param log_type: Type of log to retrieve ('traffic', 'threat',
+        'system', etc.)
+        :param query: Log filter, using the same syntax as the web interface.
+        :param nlogs: Number of logs to retrieve (maximum 5000).
+        :param skip: Number of logs to skip, used for paging.
+        :param poll_interval: How often to poll for job completion (in seconds).
+        :param poll_timeout: Maximum amount of time to poll (in seconds).
+        :returns: String containing XML response.
+
+        Reference:
+        https://docs.paloaltonetworks.com/pan-os/10-0/pan-os-panorama-api/pan-os-xml-api-request-types/retrieve-logs-api.html
+        """
+        params = {"type": "log", "key": self.api_key(), "log-type": log_type}
+
+        if query:
+            params.update({"query": query})
+
+        if nlogs is not None:
+            params.update({"nlogs": nlogs})
+
+        if skip is not None:
+            params.update({"skip": skip})
+
+        data = urllib.parse.urlencode(params)
+        code, response = self.send_request(data)
+        response = self._validate_response(code, response)
+
+        job_id = ET.fromstring(response).findtext("./result/job")
+
+        if job_id is None:
+            raise ConnectionError("Could not find job id in log response.")
+
+        params = {
+            "type": "log",
+            "key": self.api_key(),
+            "action": "get",
+            "job-id": job_id,
+        }
+
+        data = urllib.parse.urlencode(params)
+        max_end_time = datetime.utcnow() + timedelta(seconds=poll_timeout)
+
+        while datetime.utcnow() < max_end_time:
+            code, response = self.send_request(data)
+            response = self._validate_response(code, response)
+
+            status = ET.fromstring(response).findtext("./result/job/status")
+
+            display.vvvv("log(): job_id {0} status = {1}".format(job_id, status))
+
+            if status == "FIN":
+                return response
+            else:
+                time.sleep(poll_interval)
+
+        raise TimedOutException("Timed out waiting for log job id {0}".format(job_id))
+
     # reports
     # export
-    # import
-    # log
+
+    def import_file(self, category, path, filename=None):
+        """
+        Uploads a file to the device, such as a software or content image.
+
+        The file is streamed from disk, so it is not subject to the size limit
+        of other API requests.
+
+        :param category: Type of file ('software', 'anti-virus', 'content',
+        'wildfire', ...).
+        :param path: Path of the file on the controller.
+        :param filename: File name to upload as, defaults to the name of
+        'path'.
+        :returns: Response data.
+
+        Reference:
+        https://docs.paloaltonetworks.com/pan-os/10-0/pan-os-panorama-api/pan-os-xml-api-request-types/import-files-api.html
+        """
+        params = {"type": "import", "category": category, "key": self.api_key()}
+        if self._current_target():
+            params["target"] = self._current_target()
+
+        body = MultipartFile(path, filename)
+        headers = {"Content-Type": body.content_type, "Content-Length": str(len(body))}
+
+        display.vvvv(
+            "import_file(): category = {0}, path = {1}, size = {2}".format(
+                category, path, len(body)
+            )
+        )
+
+        try:
+            response, response_data = self.connection.send(
+                "/api/?{0}".format(urllib.parse.urlencode(params)),
+                body,
+                method="POST",
+                headers=headers,
+            )
+            code, data = response.getcode(), response_data.getvalue()
+        except HTTPError as e:
+            code, data = e.code, e.read()
+        finally:
+            body.close()
+
+        return self._validate_response(code, data)
+
+    def import_config(self, path, filename=None):
+        """
+        Uploads a configuration file to the device, where it can be loaded
+        with 'load_config_partial'.
+
+        :param path: Path of the configuration file on the controller.
+        :param filename: File name to save the configuration as on the
+        device, defaults to the name of 'path'.
+        :returns: Response data.
+        """
+        return self.import_file("configuration", path, filename)
+
+    def load_config_partial(self, filename, from_xpath, to_xpath, mode="merge"):
+        """
+        Loads part of a saved configuration file into the candidate
+        configuration.
+
+        :param filename: Name of the saved configuration file on the device.
+        :param from_xpath: Xpath of the configuration to load from the file.
+        :param to_xpath: Xpath in the candidate configuration to load it to.
+        :param mode: 'merge', 'replace' or 'append'.
+        :returns: Response data.
+
+        Reference:
+        https://docs.paloaltonetworks.com/pan-os/10-0/pan-os-panorama-api/pan-os-xml-api-request-types/import-files-api/import-and-load-a-partial-configuration.html
+        """
+        load = ET.Element("load")
+        partial = ET.SubElement(ET.SubElement(load, "config"), "partial")
+        ET.SubElement(partial, "from").text = filename
+        ET.SubElement(partial, "from-xpath").text = from_xpath
+        ET.SubElement(partial, "to-xpath").text = to_xpath
+        ET.SubElement(partial, "mode").text = mode
+
+        return self.op(to_text(ET.tostring(load, encoding="unicode")))
+
     # user-id
 
     def version(self, refresh=False):
@@ -452,8 +936,11 @@ class HttpApi(HttpApiBase):
 
         :returns: Dict containing device info.
         """
-        if self._device_info and refresh is False:  # pragma: no cover
-            return self._device_info
+        target = self._current_target()
+        cached = self._device_info if target is None else self._target_info.get(target)
+
+        if cached and refresh is False:  # pragma: no cover
+            return cached
 
         params = {"type": "version", "key": self.api_key()}
 
@@ -463,26 +950,33 @@ class HttpApi(HttpApiBase):
         root = ET.fromstring(response)
         result = root.find("./result")
 
-        self._device_info = {}
-        self._device_info.update(
-            {
-                "sw-version": result.findtext("sw-version"),
-                "multi-vsys": result.findtext("multi-vsys"),
-                "model": result.findtext("model"),
-                "serial": result.findtext("serial"),
-            }
-        )
+        device_info = {
+            "sw-version": result.findtext("sw-version"),
+            "multi-vsys": result.findtext("multi-vsys"),
+            "model": result.findtext("model"),
+            "serial": result.findtext("serial"),
+        }
+
+        if target is None:
+            self._device_info = device_info
+        else:
+            self._target_info[target] = device_info
 
-        display.vvvv("version = {0}".format(self._device_info))
+        display.vvvv("version = {0}".format(device_info))
 
-        return self._device_info
+        return device_info
 
-    def poll_for_job(self, job_id, interval=5, timeout=600):
+    def poll_for_job(self, job_id, interval=5, timeout=600, min_interval=None):
         """
         Polls for job completion.
 
         :param job_id: ID of job to poll for.
         :param interval: Poll interval, in seconds.
+        :param timeout: Maximum amount of time to poll (in seconds).
+        :param min_interval: If set, poll adaptively instead of at a fixed
+        interval.  Polling starts at this interval and uses the progress
+        reported by the job to decide when to check again, never waiting
+        longer than 'interval'.
         """
         cmd = "<show><jobs><id>{0}</id></jobs></show>".format(job_id)
 
@@ -492,6 +986,7 @@ class HttpApi(HttpApiBase):
             )
         )
 
+        start = time.time()
         max_end_time = datetime.utcnow() + timedelta(seconds=timeout)
 
         while datetime.utcnow() < max_end_time:
@@ -509,21 +1004,185 @@ class HttpApi(HttpApiBase):
 
             if status.text == "FIN":
                 return result
+            elif min_interval is not None:
+                time.sleep(
+                    next_poll_interval(
+                        root.findtext("./result/job/progress"),
+                        time.time() - start,
+                        min_interval,
+                        interval,
+                    )
+                )
             else:
                 time.sleep(interval)
 
         raise TimedOutException("Timed out waiting for job id {0}".format(job_id))
 
+    def poll_for_jobs(
+        self, job_ids, interval=5, timeout=600, min_interval=None, workers=1
+    ):
+        """
+        Polls for completion of several jobs at once.
+
+        Each round checks every unfinished job, using up to 'workers'
+        concurrent requests.  For jobs that push to firewalls, the time each
+        firewall was first seen finished is recorded.
+
+        :param job_ids: IDs of jobs to poll for.
+        :param interval: Poll interval, in seconds.
+        :param timeout: Maximum amount of time to poll (in seconds).
+        :param min_interval: If set, poll adaptively, as in poll_for_job().
+        :param workers: Maximum number of concurrent requests.
+        :returns: List of dicts with the 'id', final 'response', 'elapsed'
+        seconds and per-firewall 'devices' timings of each job, in the same
+        order as 'job_ids'.
+        """
+        jobs = dict(
+            (str(job_id), {"id": str(job_id), "elapsed": None, "devices": {}})
+            for job_id in job_ids
+        )
+        pending = list(jobs)
+
+        display.vvvv(
+            "poll_for_jobs(): job_ids = {0}, interval = {1}, timeout = {2}".format(
+                pending, interval, timeout
+            )
+        )
+
+        start = time.time()
+
+        def _show(job_id):
+            return self.op(
+                "<show><jobs><id>{0}</id></jobs></show>".format(job_id), is_xml=True
+            )
+
+        while time.time() - start < timeout:
+            responses = self._parallel(_show, pending, workers)
+            elapsed = time.time() - start
+            sleep = interval
+
+            for job_id, response in zip(list(pending), responses):
+                job = jobs[job_id]
+                root = ET.fromstring(response)
+                status = root.findtext("./result/job/status")
+
+                if status is None:
+                    raise ConnectionError("Could not find status element in job.")
+
+                for entry in root.iterfind("./result/job/devices/entry"):
+                    serial = entry.findtext("serial-no")
+
+                    if serial not in job["devices"] and entry.findtext(
+                        "result"
+                    ) not in (
+                        None,
+                        "PEND",
+                    ):
+                        job["devices"][serial] = round(elapsed, 3)
+
+                if status == "FIN":
+                    job["response"] = response
+                    job["elapsed"] = round(elapsed, 3)
+                    pending.remove(job_id)
+                elif min_interval is not None:
+                    sleep = min(
+                        sleep,
+                        next_poll_interval(
+                            root.findtext("./result/job/progress"),
+                            elapsed,
+                            min_interval,
+                            interval,
+                        ),
+                    )
+
+            display.vvvv("poll_for_jobs(): pending = {0}".format(pending))
+
+            if not pending:
+                return [jobs[str(job_id)] for job_id in job_ids]
+
+            time.sleep(sleep)
+
+        raise TimedOutException(
+            "Timed out waiting for job ids {0}".format(", ".join(pending))
+        )
+
+    def _parallel(self, func, items, workers=1):
+        """
+        Calls 'func' once for each item, using up to 'workers' threads.
+
+        :param func: Callable taking a single item.
+        :param items: List of items.
+        :param workers: Maximum number of concurrent calls.
+        :returns: List of results, in the same order as 'items'.
+        """
+        if workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        # The proxy target is kept per thread, so pass it on to the workers.
+        target = self._current_target()
+
+        def _run(item):
+            with self._targeting(target):
+                return func(item)
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            return list(executor.map(_run, items))
+
+    def proxy(self, target, method, *args, **kwargs):
+        """
+        Calls another method of this plugin with its requests proxied through
+        Panorama to a managed firewall.
+
+        :param target: Serial number of the firewall.
+        :param method: Name of the method to call, such as 'op'.
+        :returns: Return value of the method.
+        """
+        if method.startswith("_") or method in ("proxy", "fan_out"):
+            raise ConnectionError("Method '{0}' cannot be proxied".format(method))
+
+        with self._targeting(target):
+            return getattr(self, method)(*args, **kwargs)
+
+    def fan_out(self, targets, method, args=None, kwargs=None, workers=1):
+        """
+        Calls a method for several managed firewalls through Panorama, over
+        this single authenticated connection.
+
+        Errors are reported per firewall instead of stopping the others.
+
+        :param targets: List of firewall serial numbers.
+        :param method: Name of the method to call, such as 'op'.
+        :param args: List of positional arguments for the method.
+        :param kwargs: Dict of keyword arguments for the method.
+        :param workers: Maximum number of firewalls to call at once.
+        :returns: List of dicts with the keys 'target', 'result', 'msg' and
+        'elapsed', in the same order as 'targets'.
+        """
+        args = args or []
+        kwargs = kwargs or {}
+
+        def _run(target):
+            start = time.time()
+            result = {"target": target, "result": None, "msg": None}
+
+            try:
+                result["result"] = self.proxy(target, method, *args, **kwargs)
+            except ConnectionError as e:
+                result["msg"] = to_text(e)
+
+            result["elapsed"] = round(time.time() - start, 3)
+
+            return result
+
+        return self._parallel(_run, targets, workers)
+
     def is_panorama(self):
         """
         Returns if the connected device is a Panorama instance.
 
         :returns: Boolean if this device is a Panorama or not.
         """
-        if self._device_info is None:
-            self.version()
-
-        return True if self._device_info["model"] == "Panorama" else False
+        return True if self.version()["model"] == "Panorama" else False
 
     def update_auth(self, response, response_text):
         """
@@ -572,6 +1231,10 @@ class HttpApi(HttpApiBase):
         if headers is None:
             headers = {}
 
+        target = self._current_target()
+        if target and data:
+            data += "&" + urllib.parse.urlencode({"target": target})
+
         if len(data.encode("utf-8")) > int(5e6):
             raise ConnectionError("Data too large for XML API request")
 
@@ -0,0 +1,196 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_CACHE_DIR = "~/.ansible/cache/mrichardson03.panos"
+
+
+def write_json(filename, data):
+    """
+    Atomically writes data to a JSON file, so concurrent readers never see a
+    partially written file.
+
+    :param filename: File to write.
+    :param data: JSON serializable data.
+    """
+    path = os.path.dirname(filename)
+
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    fd, tmp = tempfile.mkstemp(dir=path, prefix="." + os.path.basename(filename))
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+
+        os.replace(tmp, filename)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+
+class ResultCache(object):
+    """
+    Results of slow commands for a single device, such as update server
+    checks, kept in a JSON file named after the device serial number so they
+    can be reused by later tasks and playbook runs.
+    """
+
+    def __init__(self, path, serial, ttl):
+        """
+        :param path: Directory containing cache files.
+        :param serial: Serial number of the device.
+        :param ttl: Number of seconds results stay fresh.
+        """
+        self.path = os.path.expanduser(path)
+        self.serial = serial
+        self.ttl = ttl
+        self.filename = os.path.join(self.path, "{0}.json".format(serial))
+
+    def _load(self):
+        try:
+            with open(self.filename) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, data):
+        write_json(self.filename, data)
+
+    def get(self, key):
+        """
+        :param key: Cache key, such as the command that was run.
+        :returns: Cached value, or None if it is missing or stale.
+        """
+        entry = self._load().get(key)
+
+        if entry is None or time.time() - entry.get("time", 0) > self.ttl:
+            return None
+
+        return entry.get("value")
+
+    def set(self, key, value):
+        """
+        :param key: Cache key.
+        :param value: JSON serializable value to cache.
+        """
+        data = self._load()
+        data[key] = {"time": time.time(), "value": value}
+        self._save(data)
+
+    def invalidate(self, key):
+        """
+        Removes a value, such as after a change that makes it stale.
+
+        :param key: Cache key.
+        """
+        data = self._load()
+
+        if data.pop(key, None) is not None:
+            self._save(data)
+
+
+def cached_op(connection, cmd, cache=None, refresh=False):
+    """
+    Runs an operational command, reusing a fresh cached result if there is
+    one.
+
+    :param connection: Connection to the device.
+    :param cmd: Command to run, in XML format.
+    :param cache: ResultCache to use, if any.
+    :param refresh: Run the command even if a fresh result is cached.
+    :returns: Tuple of the command output and whether it came from the cache.
+    """
+    if cache is not None and not refresh:
+        response = cache.get(cmd)
+
+        if response is not None:
+            return response, True
+
+    response = connection.op(cmd)
+
+    if cache is not None:
+        cache.set(cmd, response)
+
+    return response, False
+
+
+def cached_parse(filename, parse, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Parses a file, reusing the result of an earlier parse if the file has not
+    changed since.
+
+    Ansible runs each host's task in its own worker process, so the parsed
+    result is kept on disk to share it between hosts and playbook runs.  The
+    file's modification time and size identify the version that was parsed.
+
+    :param filename: File to parse.
+    :param parse: Function taking the file's contents and returning a JSON
+    serializable result.
+    :param cache_dir: Directory containing cache files, or None to always
+    parse the file.
+    :returns: Tuple of the parsed result and whether it came from the cache.
+    """
+    filename = os.path.abspath(filename)
+    stat = os.stat(filename)
+    key = {"path": filename, "mtime": stat.st_mtime, "size": stat.st_size}
+
+    cache_file = None
+
+    if cache_dir:
+        cache_file = os.path.join(
+            os.path.expanduser(cache_dir),
+            "parsed",
+            "{0}.json".format(hashlib.sha256(filename.encode("utf-8")).hexdigest()),
+        )
+
+        try:
+            with open(cache_file) as f:
+                entry = json.load(f)
+
+            if isinstance(entry, dict) and entry.get("key") == key:
+                return entry["value"], True
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+
+    with open(filename, "rb") as f:
+        value = parse(f.read())
+
+    if cache_file:
+        # The cache is only an optimization, so a result that can't be
+        # stored (for example, YAML dates aren't JSON serializable) just
+        # removes any stale entry.  write_json() removes its own partly
+        # written file.
+        try:
+            write_json(cache_file, {"key": key, "value": value})
+        except (IOError, OSError, TypeError, ValueError):
+            try:
+                os.remove(cache_file)
+            except (IOError, OSError):
+                pass
+
+    return value, False
@@ -0,0 +1,254 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import time
+
+from ansible_collections.mrichardson03.panos.plugins.module_utils.cache import (
+    write_json,
+)
+
+
+class JobHistory(object):
+    """
+    Durations of past jobs on a single device, kept in a JSON file named
+    after the device serial number.
+
+    The history is used to predict how long the next job of the same type
+    should take, to set its timeout and poll interval, and to flag jobs that
+    took much longer than usual.
+    """
+
+    # Number of durations kept per job type.
+    MAX_ENTRIES = 20
+
+    # Number of durations needed before making predictions.
+    MIN_SAMPLES = 3
+
+    # Never predict a timeout shorter than this (in seconds).
+    MIN_TIMEOUT = 60
+
+    def __init__(self, path, serial):
+        """
+        :param path: Directory containing history files.
+        :param serial: Serial number of the device.
+        """
+        self.path = os.path.expanduser(path)
+        self.serial = serial
+        self.filename = os.path.join(self.path, "{0}.json".format(serial))
+        self.jobs = self.load(self.filename)
+
+    @staticmethod
+    def load(filename):
+        """
+        Loads a history file.
+
+        :param filename: File to load.
+        :returns: Dict of job type to list of entries, empty if the file does
+        not exist or cannot be read.
+        """
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        return data.get("jobs", {}) if isinstance(data, dict) else {}
+
+    def save(self):
+        """
+        Writes the history file.  The file is replaced atomically, so readers
+        never see a partial file.
+        """
+        write_json(self.filename, {"serial": self.serial, "jobs": self.jobs})
+
+    def durations(self, job_type):
+        """
+        :param job_type: Type of job, such as 'commit'.
+        :returns: List of recorded durations, oldest first.
+        """
+        return [entry["duration"] for entry in self.jobs.get(job_type, [])]
+
+    def record(self, job_type, duration, **info):
+        """
+        Records the duration of a finished job.
+
+        :param job_type: Type of job.
+        :param duration: Number of seconds the job took.
+        :param info: Extra information to store with the entry.
+        :returns: True if the job was an outlier compared to earlier jobs.
+        """
+        outlier = self.is_outlier(job_type, duration)
+
+        entry = dict(info, duration=round(duration, 3), time=int(time.time()))
+        entries = self.jobs.setdefault(job_type, [])
+        entries.append(entry)
+        del entries[: -self.MAX_ENTRIES]
+
+        return outlier
+
+    def is_outlier(self, job_type, duration):
+        """
+        A job is an outlier if it took more than three standard deviations
+        above the mean, and at least half again as long as the median.
+
+        :param job_type: Type of job.
+        :param duration: Number of seconds the job took.
+        :returns: True if the job is an outlier.
+        """
+        stats = summarize(self.durations(job_type))
+
+        if stats["count"] < self.MIN_SAMPLES:
+            return False
+
+        return duration > max(stats["mean"] + 3 * stats["stdev"], 1.5 * stats["median"])
+
+    def timeout(self, job_type, default):
+        """
+        Predicts a timeout for the next job: three times the longest recorded
+        duration.  The prediction can only raise the timeout, so a job that
+        is slower than earlier ones is still given the default.
+
+        :param job_type: Type of job.
+        :param default: Timeout to use without enough history, and the
+        shortest timeout returned.
+        :returns: Timeout, in seconds.
+        """
+        durations = self.durations(job_type)
+
+        if len(durations) < self.MIN_SAMPLES:
+            return default
+
+        return int(max(default, self.MIN_TIMEOUT, 3 * max(durations)))
+
+    def poll_interval(self, job_type, default):
+        """
+        Predicts a poll interval for the next job: a tenth of the median
+        recorded duration, but never more than 'default'.
+
+        :param job_type: Type of job.
+        :param default: Interval to use without enough history.
+        :returns: Interval, in seconds.
+        """
+        stats = summarize(self.durations(job_type))
+
+        if stats["count"] < self.MIN_SAMPLES:
+            return default
+
+        return int(min(default, max(1, stats["median"] / 10)))
+
+
+def summarize(durations):
+    """
+    Summarizes a list of durations.
+
+    :param durations: List of durations, in seconds.
+    :returns: Dict of count, mean, median, stdev, min, max and last.
+    """
+    count = len(durations)
+
+    if not count:
+        return {"count": 0}
+
+    ordered = sorted(durations)
+    mean = sum(durations) / count
+    middle = count // 2
+
+    if count % 2:
+        median = ordered[middle]
+    else:
+        median = (ordered[middle - 1] + ordered[middle]) / 2
+
+    return {
+        "count": count,
+        "mean": round(mean, 3),
+        "median": round(median, 3),
+        "stdev": round((sum((d - mean) ** 2 for d in durations) / count) ** 0.5, 3),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "last": durations[-1],
+    }
+
+
+def export_history(path):
+    """
+    Summarizes every history file in a directory.
+
+    :param path: Directory containing history files.
+    :returns: Dict of serial number to dict of job type to summary.
+    """
+    history = {}
+    path = os.path.expanduser(path)
+
+    if not os.path.isdir(path):
+        return history
+
+    for name in sorted(os.listdir(path)):
+        if name.startswith(".") or not name.endswith(".json"):
+            continue
+
+        jobs = JobHistory.load(os.path.join(path, name))
+
+        history[name[: -len(".json")]] = dict(
+            (
+                job_type,
+                dict(
+                    summarize([entry["duration"] for entry in entries]),
+                    entries=entries,
+                ),
+            )
+            for job_type, entries in jobs.items()
+        )
+
+    return history
+
+
+def run_job(
+    connection, cmd, job_type, history=None, interval=10, timeout=600, predict=True
+):
+    """
+    Runs an operational command that starts a job and waits for the job to
+    finish, recording how long it took.
+
+    :param connection: Connection to the device.
+    :param cmd: Command to run, in XML format.
+    :param job_type: Type of job, used as the history key.
+    :param history: JobHistory to use, if any.
+    :param interval: Poll interval, in seconds.
+    :param timeout: Maximum amount of time to poll (in seconds).
+    :param predict: Use the history to set the timeout and poll interval.
+    :returns: Tuple of the job result and whether the job was an outlier.
+    """
+    if history and predict:
+        timeout = history.timeout(job_type, timeout)
+        interval = history.poll_interval(job_type, interval)
+
+    start = time.time()
+    response = connection.op(
+        cmd, poll=True, poll_interval=interval, poll_timeout=timeout
+    )
+
+    if history is None:
+        return response, False
+
+    outlier = history.record(job_type, time.time() - start)
+    history.save()
+
+    return response, outlier
@@ -0,0 +1,448 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+
+from ansible.module_utils._text import to_text
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    xml_compare,
+)
+
+DEVICE_XPATH = "/config/devices/entry[@name='localhost.localdomain']"
+
+DEFAULT_LOCATIONS = [{"vsys": "vsys1"}]
+
+
+def location_xpath(location):
+    """
+    Returns the xpath of a location that can contain objects.
+
+    :param location: 'shared', or a dict with a 'vsys' or 'device_group' key.
+    :returns: Xpath of the location.
+    :raises ValueError: If the location is not valid.
+    """
+    if location == "shared" or (isinstance(location, dict) and location.get("shared")):
+        return "/config/shared"
+
+    if isinstance(location, dict):
+        if location.get("vsys"):
+            return "{0}/vsys/entry[@name='{1}']".format(DEVICE_XPATH, location["vsys"])
+        if location.get("device_group"):
+            return "{0}/device-group/entry[@name='{1}']".format(
+                DEVICE_XPATH, location["device_group"]
+            )
+
+    raise ValueError(
+        "Invalid location {0}, must be 'shared' or have a 'vsys' or "
+        "'device_group' key".format(location)
+    )
+
+
+class ObjectSchema(object):
+    """
+    Describes how an object type is stored in the configuration, so objects
+    can be built, compared and pushed in bulk.
+
+    Each field is a dict with the keys:
+
+    - 'name': Name of the field in the task arguments.
+    - 'path': Path of the field's element under the object's entry, which
+      can refer to other fields (for example, 'protocol/{protocol}/port').
+      None if the field is only used in other fields' paths.
+    - 'kind': 'text' (default), 'members' for a list of member elements, or
+      'empty' for an element that is always present and has no value.
+    - 'required', 'default', 'choices': Validation of the field's value.
+    - 'aliases': Other names accepted for the field.
+    """
+
+    def __init__(self, container, fields, one_of=None):
+        """
+        :param container: Tag of the element containing the objects, such as
+        'address'.
+        :param fields: List of field dicts.
+        :param one_of: List of lists of fields, where exactly one field in
+        each list must be set.
+        """
+        self.container = container
+        self.fields = fields
+        self.one_of = one_of or []
+
+    @property
+    def valid_args(self):
+        """Arguments accepted by an action using this schema."""
+        names = ["name", "state", "objects", "purge", "locations"]
+
+        for field in self.fields:
+            if field.get("kind") != "empty":
+                names.append(field["name"])
+                names.extend(field.get("aliases", []))
+
+        return frozenset(names)
+
+    def normalize(self, obj):
+        """
+        Applies defaults and aliases to an object and validates it.
+
+        :param obj: Dict of field values.
+        :returns: Dict of field values, with every field present.
+        :raises ValueError: If the object is not valid.
+        """
+        if not obj.get("name"):
+            raise ValueError("Each {0} object requires 'name'".format(self.container))
+
+        result = {"name": obj["name"]}
+
+        for field in self.fields:
+            value = obj.get(field["name"])
+
+            for alias in field.get("aliases", []):
+                if value is None:
+                    value = obj.get(alias)
+
+            if value is None:
+                value = field.get("default")
+
+            if value is None and field.get("required"):
+                raise ValueError(
+                    "{0} object '{1}' requires '{2}'".format(
+                        self.container, obj["name"], field["name"]
+                    )
+                )
+
+            if value is not None and field.get("choices"):
+                if value not in field["choices"]:
+                    raise ValueError(
+                        "'{0}' must be one of {1}".format(
+                            field["name"], ", ".join(field["choices"])
+                        )
+                    )
+
+            if field.get("kind") == "members" and value is not None:
+                value = list(value)
+
+            result[field["name"]] = value
+
+        for names in self.one_of:
+            if len([n for n in names if result[n]]) != 1:
+                raise ValueError(
+                    "{0} object '{1}' requires exactly one of {2}".format(
+                        self.container, obj["name"], ", ".join(names)
+                    )
+                )
+
+        return result
+
+    def element(self, obj):
+        """
+        Builds the XML element for a normalized object.
+
+        :param obj: Dict of field values, as returned by normalize().
+        :returns: Element for the object.
+        """
+        entry = ET.Element("entry", {"name": obj["name"]})
+
+        for field in self.fields:
+            kind = field.get("kind", "text")
+            value = obj.get(field["name"])
+
+            if field.get("path") is None:
+                continue
+            if kind != "empty" and (value is None or value == []):
+                continue
+
+            node = entry
+            for tag in field["path"].format(**obj).split("/"):
+                child = node.find(tag)
+                node = child if child is not None else ET.SubElement(node, tag)
+
+            if kind == "members":
+                for member in value:
+                    ET.SubElement(node, "member").text = to_text(member)
+            elif kind == "text":
+                node.text = to_text(value)
+
+        return entry
+
+
+def _text(name, path=None, **kwargs):
+    return dict(name=name, path=name if path is None else path, **kwargs)
+
+
+def _members(name, path=None, **kwargs):
+    return _text(name, path, kind="members", **kwargs)
+
+
+SCHEMAS = {
+    "address": ObjectSchema(
+        "address",
+        [
+            dict(
+                name="address_type",
+                path=None,
+                default="ip-netmask",
+                choices=["ip-netmask", "ip-range", "fqdn"],
+                aliases=["type"],
+            ),
+            _text("value", "{address_type}", required=True),
+            _text("description"),
+            _members("tag", aliases=["tags"]),
+        ],
+    ),
+    "service": ObjectSchema(
+        "service",
+        [
+            dict(name="protocol", path=None, default="tcp", choices=["tcp", "udp"]),
+            _text("destination_port", "protocol/{protocol}/port", required=True),
+            _text("source_port", "protocol/{protocol}/source-port"),
+            dict(name="override", path="protocol/{protocol}/override/no", kind="empty"),
+            _text("description"),
+            _members("tag", aliases=["tags"]),
+        ],
+    ),
+    "tag": ObjectSchema(
+        "tag",
+        [
+            _text("color"),
+            _text("comments"),
+        ],
+    ),
+    "address_group": ObjectSchema(
+        "address-group",
+        [
+            _members("static_value", "static"),
+            _text("dynamic_value", "dynamic/filter"),
+            _text("description"),
+            _members("tag", aliases=["tags"]),
+        ],
+        one_of=[["static_value", "dynamic_value"]],
+    ),
+    "service_group": ObjectSchema(
+        "service-group",
+        [
+            _members("value", "members", required=True),
+            _members("tag", aliases=["tags"]),
+        ],
+    ),
+}
+
+
+def entry_xpath(container_xpath, name):
+    """Returns the xpath of the object 'name' in a container."""
+    return "{0}/entry[@name='{1}']".format(container_xpath, name)
+
+
+def existing_objects(response, container):
+    """
+    Parses the objects out of a 'get' of an object container.
+
+    :param response: Response to the 'get'.
+    :param container: Tag of the container element.
+    :returns: Dict of object name to Element.
+    """
+    element = ET.fromstring(response).find("./result/{0}".format(container))
+
+    if element is None:
+        return {}
+
+    return dict((e.attrib["name"], e) for e in element.findall("entry"))
+
+
+def diff_objects(existing, desired, purge=False):
+    """
+    Compares existing objects to desired ones.
+
+    :param existing: Dict of object name to existing Element.
+    :param desired: Dict of object name to desired Element.
+    :param purge: Delete existing objects that are not desired.
+    :returns: Dict with the lists of object names to 'add', 'modify' and
+    'delete'.
+    """
+    delta = {"add": [], "modify": [], "delete": []}
+
+    for name, element in desired.items():
+        if name not in existing:
+            delta["add"].append(name)
+        elif not xml_compare(existing[name], element):
+            delta["modify"].append(name)
+
+    if purge:
+        delta["delete"] = [name for name in existing if name not in desired]
+
+    return delta
+
+
+def delta_operations(container_xpath, delta, desired):
+    """
+    Builds the 'multi-config' operations that apply a delta.
+
+    :param container_xpath: Xpath of the object container.
+    :param delta: Delta, as returned by diff_objects().
+    :param desired: Dict of object name to desired Element.
+    :returns: List of operations for HttpApi.multi_config().
+    """
+    operations = []
+
+    for name in delta["add"] + delta["modify"]:
+        operations.append(
+            {
+                "action": "edit",
+                "xpath": entry_xpath(container_xpath, name),
+                "element": to_text(ET.tostring(desired[name], encoding="unicode")),
+            }
+        )
+
+    for name in delta["delete"]:
+        operations.append(
+            {"action": "delete", "xpath": entry_xpath(container_xpath, name)}
+        )
+
+    return operations
+
+
+def sync_objects(
+    connection,
+    schema,
+    objects,
+    purge=False,
+    state="present",
+    locations=None,
+    check_mode=False,
+):
+    """
+    Synchronizes objects of one type with the device, retrieving the
+    existing objects once per location and pushing only the differences for
+    all locations together in batched requests.
+
+    :param connection: Connection to the device.
+    :param schema: ObjectSchema for the object type.
+    :param objects: List of object dicts.
+    :param purge: Delete existing objects that are not in 'objects'.
+    :param state: If 'absent', delete the objects instead.
+    :param locations: List of locations to synchronize, as accepted by
+    location_xpath().  Defaults to vsys1.
+    :param check_mode: Only calculate the differences.
+    :returns: Dict with 'changed', the lists of object names 'added',
+    'modified' and 'deleted' across all locations, and the same lists for
+    each location in 'locations'.
+    :raises ValueError: If an object or location is not valid.
+    """
+    if not locations:
+        locations = DEFAULT_LOCATIONS
+
+    xpaths = [location_xpath(location) for location in locations]
+
+    # Build the desired objects once, for all locations.
+    desired = {}
+    if state != "absent":
+        for obj in objects:
+            obj = schema.normalize(obj)
+            desired[obj["name"]] = schema.element(obj)
+
+    operations = []
+    result = {
+        "changed": False,
+        "added": [],
+        "modified": [],
+        "deleted": [],
+        "locations": [],
+    }
+
+    for location, xpath in zip(locations, xpaths):
+        container_xpath = "{0}/{1}".format(xpath, schema.container)
+
+        existing = existing_objects(connection.get(container_xpath), schema.container)
+
+        if state == "absent":
+            names = [obj["name"] for obj in objects]
+            delta = {
+                "add": [],
+                "modify": [],
+                "delete": [name for name in names if name in existing],
+            }
+        else:
+            delta = diff_objects(existing, desired, purge)
+
+        operations.extend(delta_operations(container_xpath, delta, desired))
+
+        result["locations"].append(
+            {
+                "location": location,
+                "added": delta["add"],
+                "modified": delta["modify"],
+                "deleted": delta["delete"],
+            }
+        )
+
+        for key, names in (
+            ("added", delta["add"]),
+            ("modified", delta["modify"]),
+            ("deleted", delta["delete"]),
+        ):
+            result[key].extend(n for n in names if n not in result[key])
+
+    if operations and not check_mode:
+        connection.multi_config(operations)
+
+    result["changed"] = bool(operations)
+
+    return result
+
+
+def object_task(connection, schema, args, check_mode=False):
+    """
+    Runs an object action's task, which either manages a single object given
+    by the task arguments or a list of them given in 'objects'.
+
+    :param connection: Connection to the device.
+    :param schema: ObjectSchema for the object type.
+    :param args: Task arguments.
+    :param check_mode: Only calculate the differences.
+    :returns: Task result.
+    :raises ValueError: If the arguments are not valid.
+    """
+    objects = args.get("objects")
+    purge = False
+
+    if objects is None:
+        if args.get("name") is None:
+            raise ValueError("One of 'name' or 'objects' is required")
+
+        objects = [
+            dict(
+                (k, v)
+                for k, v in args.items()
+                if k not in ("state", "purge", "locations")
+            )
+        ]
+
+    elif args.get("name") is not None:
+        raise ValueError("'name' and 'objects' are mutually exclusive")
+
+    else:
+        purge = args.get("purge", False)
+
+    return sync_objects(
+        connection,
+        schema,
+        objects,
+        purge=purge,
+        state=args.get("state", "present"),
+        locations=args.get("locations"),
+        check_mode=check_mode,
+    )
@@ -17,7 +17,11 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import hashlib
+import os
 import re
+import time
+import xml.etree.ElementTree as ET
 from functools import reduce
 
 from ansible.module_utils.basic import AnsibleModule
@@ -31,6 +35,7 @@ class PanOSAnsibleModule(AnsibleModule):
         api_endpoint=None,
         with_state=False,
         with_enabled_state=False,
+        with_target=False,
         *args,
         **kwargs
     ):
@@ -47,12 +52,271 @@ class PanOSAnsibleModule(AnsibleModule):
                 "choices": ["present", "absent", "enabled", "disabled"],
             }
 
+        if with_target:
+            spec["target"] = {"type": "str"}
+
         argument_spec.update(spec)
 
         super().__init__(argument_spec, *args, **kwargs)
 
         self.connection = Connection(self._socket_path)
 
+        if with_target and self.params["target"]:
+            self.connection = TargetConnection(self.connection, self.params["target"])
+
+
+class TargetConnection(object):
+    """
+    Connection that proxies every call through Panorama to one of its managed
+    firewalls, using the 'proxy' method of the httpapi plugin.
+    """
+
+    def __init__(self, connection, target):
+        """
+        :param connection: Connection to Panorama.
+        :param target: Serial number of the firewall.
+        """
+        self._connection = connection
+        self._target = target
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def _call(*args, **kwargs):
+            return self._connection.proxy(self._target, name, *args, **kwargs)
+
+        return _call
+
+
+def xml_compare(one, two, excludes=None):
+    """
+    Compares the contents of two xml.etree.ElementTrees for equality.
+
+    :param one: First ElementTree.
+    :param two: Second ElementTree.
+    :param excludes: List of tag attributes to disregard.
+    """
+    if excludes is None:
+        excludes = ["admin", "dirtyId", "time", "uuid"]
+
+    if one is None or two is None:
+        return False
+
+    if one.tag != two.tag:
+        # Tag does not match.
+        return False
+
+    # Compare attributes.
+    for name, value in one.attrib.items():
+        if name not in excludes:
+            if two.attrib.get(name) != value:
+                return False
+
+    for name, value in two.attrib.items():
+        if name not in excludes:
+            if one.attrib.get(name) != value:
+                return False
+
+    if not text_compare(one.text, two.text):
+        # Text differs at this node.
+        return False
+
+    # Sort children by tag name to make sure they're compared in order.
+    children_one = sorted(one, key=lambda e: e.tag)
+    children_two = sorted(two, key=lambda e: e.tag)
+
+    if len(children_one) != len(children_two):
+        # Number of children differs.
+        return False
+
+    for child_one, child_two in zip(children_one, children_two):
+        if not xml_compare(child_one, child_two, excludes):
+            # Child documents do not match.
+            return False
+
+    return True
+
+
+def text_compare(one, two):
+    """Compares the contents of two XML text attributes."""
+    if not one and not two:
+        return True
+    return (one or "").strip() == (two or "").strip()
+
+
+def iterpath(node, tag=None, path="."):
+    """
+    Similar to Element.iter(), but the iterator gives each element's path along
+    with the element itself.
+
+    Reference: https://docs.python.org/3/library/xml.etree.elementtree.html#xml.etree.ElementTree.Element.iter
+
+    Taken from: https://stackoverflow.com/questions/13136334/get-xpath-dynamically-using-elementtree-getpath
+    """
+    if tag == "*":
+        tag = None
+
+    if tag is None or node.tag == tag:
+        yield node, path
+
+    for child in node:
+        if child.tag == "entry":
+            _child_path = "{0}/{1}[@name='{2}']".format(
+                path, child.tag, child.attrib["name"]
+            )
+        else:
+            _child_path = "{0}/{1}".format(path, child.tag)
+
+        for child, child_path in iterpath(child, tag, path=_child_path):
+            yield child, child_path
+
+
+def xml_contained(big, small):
+    """
+    Check to see if all the XML elements with no children in "small" are
+    present in "big", at the same locations in the tree.
+
+    This ensures all the configuration in "small" is contained in "big", but
+    "big" can have configuration not contained in "small".
+
+    :param big: Big document ElementTree.
+    :param small: Small document ElementTree.
+    """
+
+    if big is None or small is None:
+        return False
+
+    for element, path in iterpath(small):
+
+        # Elements with "member" children must have all their children be equal.
+        if element.find("*/member/..") is not None:
+            big_element = big.find(path)
+
+            if not xml_compare(big_element, element):
+                return False
+
+        # Elements with no children at the same point in the tree must match
+        # exactly.
+        elif len(element) == 0 and (element.tag != "member"):
+            big_element = big.find(path)
+
+            if not xml_compare(big_element, element):
+                return False
+
+    return True
+
+
+def config_element_changed(existing, element_xml, edit=False):
+    """
+    Checks if applying an element to the configuration would change it.
+
+    :param existing: Existing configuration at the element's xpath, as an
+    Element, or None if there is none.
+    :param element_xml: Element to apply, in XML format.  When 'edit' is
+    false, this can be several elements.
+    :param edit: If true, the element replaces the existing configuration.
+    If false, it is merged with the existing configuration.
+    :returns: True if the configuration would change.
+    """
+    if edit:
+        # Edit action is a regular comparison between the two XML documents
+        # for equality.
+        return not xml_compare(existing, ET.fromstring(element_xml))
+
+    # When using set action, element can be an invalid XML document with
+    # several top-level elements.
+    try:
+        element = ET.fromstring(element_xml)
+    except ET.ParseError:
+        element = None
+
+    # The element is the one at the xpath, such as a whole zone entry.
+    if element is not None and (existing is None or element.tag == existing.tag):
+        return not xml_contained(existing, element)
+
+    if existing is None:
+        return True
+
+    # The element(s) are children merged into the element at the xpath.  Wrap
+    # them in a copy of it, and only compare them against the children they
+    # set, so member lists are compared without its other children.
+    wrapped = ET.fromstring("<wrapped>" + element_xml + "</wrapped>")
+    wrapped.tag = existing.tag
+    wrapped.attrib = dict(existing.attrib)
+
+    keys = set((child.tag, child.get("name")) for child in wrapped)
+    big = ET.Element(existing.tag, existing.attrib)
+    big.extend(child for child in existing if (child.tag, child.get("name")) in keys)
+
+    return not xml_contained(big, wrapped)
+
+
+def minify_xml(xml):
+    """
+    Removes whitespace that is only used for formatting from XML, such as
+    indentation and blank lines left by templates.  Text values, including
+    whitespace-only values of elements with no children, are left alone.
+
+    :param xml: XML to minify, which can contain several elements.
+    :returns: Minified XML.
+    :raises ValueError: If the XML is not well formed.
+    """
+    try:
+        wrapped = ET.fromstring("<wrapped>" + xml + "</wrapped>")
+    except ET.ParseError as e:
+        raise ValueError("Invalid XML: {0}".format(e))
+
+    for element in wrapped.iter():
+        if len(element) and element.text is not None and not element.text.strip():
+            element.text = None
+        if element.tail is not None and not element.tail.strip():
+            element.tail = None
+
+    return "".join(ET.tostring(child, encoding="unicode") for child in wrapped)
+
+
+# Splits an xpath into its steps, ignoring slashes inside predicates (for
+# example, "entry[@name='ethernet1/1']").
+XPATH_STEP = re.compile(r"(?:[^/\[]|\[[^\]]*\])+")
+
+
+def split_xpath(xpath):
+    """Splits an xpath into a list of steps."""
+    return XPATH_STEP.findall(xpath)
+
+
+def common_xpath(xpaths):
+    """
+    Finds the deepest xpath that contains all the given xpaths.
+
+    :param xpaths: List of xpaths.
+    :returns: Common ancestor xpath.
+    """
+    common = split_xpath(xpaths[0])
+
+    for xpath in xpaths[1:]:
+        steps = split_xpath(xpath)
+        length = 0
+        while length < min(len(common), len(steps)) and common[length] == steps[length]:
+            length += 1
+        common = common[:length]
+
+    return "/" + "/".join(common)
+
+
+def relative_xpath(root_xpath, xpath):
+    """
+    Converts an xpath into a path relative to one of its ancestors, which can
+    be used to find it in the ancestor's Element.
+
+    :param root_xpath: Xpath of the ancestor.
+    :param xpath: Xpath under the ancestor.
+    :returns: Relative path, such as "./system/login-banner".
+    """
+    steps = split_xpath(xpath)[len(split_xpath(root_xpath)) :]
+    return "/".join(["."] + steps)
+
 
 def cmd_xml(cmd):
     def _cmd_xml(args, obj):
@@ -98,3 +362,300 @@ def get_nested_key(d, key_list):
     """
 
     return reduce(lambda val, key: val.get(key) if val else None, key_list, d)
+
+
+def wait_for_restart(connection, timeout, interval=5):
+    """
+    Waits for the management plane of a device to go down, such as after a
+    restart has been requested.
+
+    :param connection: Connection to the device.
+    :param timeout: Maximum number of seconds to wait.
+    :param interval: Number of seconds between checks.
+    :returns: True if the management plane went down.
+    """
+    max_end_time = time.time() + timeout
+
+    while time.time() < max_end_time:
+        try:
+            connection.version(refresh=True)
+        except Exception:
+            return True
+
+        time.sleep(interval)
+
+    return False
+
+
+def file_sha256(path, block_size=1 << 20):
+    """
+    Returns the SHA-256 checksum of a file, reading it in blocks.
+
+    :param path: Path of the file.
+    :param block_size: Number of bytes to read at a time.
+    :returns: Hex digest.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def find_image(image_dir, filename, sha256=None):
+    """
+    Looks for an image in a local image directory.
+
+    :param image_dir: Directory containing images.
+    :param filename: File name of the image.
+    :param sha256: Expected checksum of the image, if known.
+    :returns: Path of the image, or None if it is not in the directory.
+    :raises ValueError: If the image does not match the expected checksum.
+    """
+    if not image_dir or not filename:
+        return None
+
+    path = os.path.join(image_dir, os.path.basename(filename))
+
+    if not os.path.isfile(path):
+        return None
+
+    if sha256 and file_sha256(path) != sha256.lower():
+        raise ValueError("Checksum mismatch for image {0}".format(path))
+
+    return path
+
+
+def merge_commit_args(pending, new):
+    """
+    Merges the arguments of two commits into a single commit covering both.
+
+    Descriptions are combined, admin scopes are joined (a commit without an
+    admin scope covers all admins), a force commit wins, and a section is
+    only excluded if both commits exclude it.
+
+    :param pending: Arguments of the pending commit, or None.
+    :param new: Arguments of the new commit.
+    :returns: Dict of merged commit arguments.
+    """
+    if not pending:
+        return dict(new)
+
+    merged = {"force": bool(pending.get("force")) or bool(new.get("force"))}
+
+    for key in [
+        "exclude_device_and_network",
+        "exclude_policy_and_objects",
+        "exclude_shared_objects",
+    ]:
+        merged[key] = bool(pending.get(key)) and bool(new.get(key))
+
+    descriptions = []
+
+    for description in [pending.get("description"), new.get("description")]:
+        for part in (description or "").split("; "):
+            if part and part not in descriptions:
+                descriptions.append(part)
+
+    merged["description"] = "; ".join(descriptions) or None
+
+    if pending.get("admins") and new.get("admins"):
+        admins = list(pending["admins"])
+        admins.extend(a for a in new["admins"] if a not in admins)
+        merged["admins"] = admins
+    else:
+        merged["admins"] = None
+
+    return merged
+
+
+# Configuration nodes covered by the 'policy-and-objects' and 'shared-object'
+# sections of a partial commit.
+OBJECT_NODES = (
+    "address",
+    "address-group",
+    "application",
+    "application-filter",
+    "application-group",
+    "dynamic-user-group",
+    "external-list",
+    "profile-group",
+    "profiles",
+    "region",
+    "schedule",
+    "service",
+    "service-group",
+    "tag",
+    "threats",
+)
+
+
+def config_changes(xml):
+    """
+    Parses the output of 'show config list changes'.
+
+    :param xml: Command output.
+    :returns: List of dicts with the 'xpath', 'owner' and 'action' of each
+    change.
+    """
+    return [
+        {
+            "xpath": entry.findtext("xpath"),
+            "owner": entry.findtext("owner"),
+            "action": entry.findtext("action"),
+        }
+        for entry in ET.fromstring(xml).iterfind(".//journal/entry")
+    ]
+
+
+def commit_section(xpath):
+    """
+    Returns the partial commit section that covers a configuration change.
+
+    :param xpath: XPath of the change.
+    :returns: 'device-and-network', 'policy-and-objects', 'shared-object', or
+    None if the change is not covered by a single section.
+    """
+    parts = re.sub(r"\[[^\]]*\]", "", xpath or "").strip("/").split("/")
+
+    if parts[:2] == ["config", "shared"] and len(parts) > 2:
+        return "shared-object" if parts[2] in OBJECT_NODES else None
+
+    if parts[:3] != ["config", "devices", "entry"] or len(parts) < 4:
+        return None
+
+    if parts[3] in ["vsys", "device-group"]:
+        if len(parts) > 5 and (parts[5] in OBJECT_NODES or "rulebase" in parts[5]):
+            return "policy-and-objects"
+        elif len(parts) <= 5 or parts[3] == "device-group":
+            return None
+
+    return "device-and-network"
+
+
+def commit_scope(changes, admins=None):
+    """
+    Works out the narrowest partial commit covering a set of changes.
+
+    :param changes: List of changes, as returned by config_changes().
+    :param admins: Only consider changes made by these administrators.
+    :returns: Dict of exclude flags for commit(), or None if there are no
+    changes to commit.
+    """
+    if admins:
+        changes = [c for c in changes if c["owner"] in admins]
+
+    if not changes:
+        return None
+
+    sections = set(commit_section(c["xpath"]) for c in changes)
+
+    # Commit everything if any change falls outside the known sections.
+    if None in sections:
+        sections = set(["device-and-network", "policy-and-objects", "shared-object"])
+
+    return {
+        "exclude_device_and_network": "device-and-network" not in sections,
+        "exclude_policy_and_objects": "policy-and-objects" not in sections,
+        "exclude_shared_objects": "shared-object" not in sections,
+    }
+
+
+def paged_records(fetch_page, page_size, record_path="./result/entry"):
+    """
+    Generator that walks a paged API result, yielding one record at a time.
+
+    Only a single page of the result is held in memory at once, so the
+    memory used stays the same no matter how large the result set is.
+
+    :param fetch_page: Callable taking (skip, count) and returning the XML
+    response for that page.
+    :param page_size: Number of records to request per page, or None if the
+    result is not paged.
+    :param record_path: Path to the record elements, relative to the root of
+    each response.
+    """
+    skip = 0
+
+    while True:
+        root = ET.fromstring(fetch_page(skip, page_size))
+        records = root.findall(record_path)
+
+        for record in records:
+            yield record
+
+        if page_size is None or len(records) < page_size:
+            return
+
+        skip += len(records)
+
+
+# Elements that are always returned as lists by xml_to_dict().
+FORCE_LIST = ("entry", "member")
+
+
+def xml_to_dict(xml, force_list=FORCE_LIST):
+    """
+    Converts an XML document into a dictionary.
+
+    The output uses the same conventions as xmltodict: attributes are prefixed
+    with '@', text alongside attributes or children is stored in '#text', and
+    elements that repeat become lists.  Elements named in 'force_list' are
+    always lists, so one 'entry' has the same shape as many.
+
+    :param xml: XML string, or ElementTree element.
+    :param force_list: Element names that are always converted to lists.
+    """
+    if isinstance(xml, (str, bytes)):
+        xml = ET.fromstring(xml)
+
+    return {xml.tag: _element_to_dict(xml, frozenset(force_list))}
+
+
+def _element_to_dict(element, force_list):
+    text = element.text
+    if text is not None:
+        text = text.strip() or None
+
+    if len(element) == 0 and not element.attrib:
+        return text
+
+    d = {}
+
+    for name, value in element.attrib.items():
+        d["@" + name] = value
+
+    for child in element:
+        tag = child.tag
+        value = _element_to_dict(child, force_list)
+
+        if tag in force_list:
+            if tag in d:
+                d[tag].append(value)
+            else:
+                d[tag] = [value]
+        elif tag not in d:
+            d[tag] = value
+        elif isinstance(d[tag], list):
+            d[tag].append(value)
+        else:
+            d[tag] = [d[tag], value]
+
+    if text is not None:
+        d["#text"] = text
+
+    return d
+
+
+def record_dict(element):
+    """
+    Converts a record element into a dictionary, using the same conventions
+    as xml_to_dict().
+
+    :param element: ElementTree element.
+    """
+    d = _element_to_dict(element, frozenset(FORCE_LIST))
+
+    return d if isinstance(d, dict) else {"#text": d}
@@ -32,7 +32,7 @@ options:
     name:
         description:
             - Name of object to create.
-        required: true
+            - Required unless I(objects) is given.
         type: str
     value:
         description:
@@ -53,6 +53,29 @@ options:
             - List of tags to add to this address object.
         type: list
         elements: str
+    objects:
+        description:
+            - List of address objects to synchronize in one task, instead of a single object.
+            - Each object takes the keys I(name), I(value), I(address_type), I(description) and I(tag).
+            - Existing objects are retrieved once, and only objects that need to be added or changed
+              are pushed, in batched requests.
+            - Mutually exclusive with I(name).
+        type: list
+        elements: dict
+    purge:
+        description:
+            - When using I(objects), delete existing address objects that are not in the list.
+        type: bool
+        default: false
+    locations:
+        description:
+            - List of locations to manage the objects in.  Each location is either C(shared), or a
+              dict with a C(vsys) or C(device_group) key naming the vsys or Panorama device group.
+            - Objects are built once, the existing objects in each location are retrieved and
+              compared, and the changes for all locations are pushed together.
+            - Defaults to C(vsys1).
+        type: list
+        elements: raw
 """
 
 EXAMPLES = """
@@ -82,6 +105,19 @@ EXAMPLES = """
   panos_address_object:
     name: 'Test-Two'
     state: 'absent'
+
+- name: Create object 'Test-Four' in every device group
+  panos_address_object:
+    name: 'Test-Four'
+    value: '4.4.4.4'
+    locations:
+      - device_group: 'branch'
+      - device_group: 'datacenter'
+
+- name: Synchronize address objects from IPAM, removing any others
+  panos_address_object:
+    objects: '{{ ipam_objects }}'
+    purge: true
 """
 
 RETURN = """
@@ -93,12 +129,24 @@ msg:
     description: A string with an error message, if any.
     returned: failure, always
     type: str
-diff:
-    description:
-        - Information about the differences between the previous and current
-          state.
-        - Contains 'before' and 'after' keys.
-    returned: success, when needed
-    type: dict
+added:
+    description: Names of the objects that were added.
+    returned: success
+    type: list
+    elements: str
+modified:
+    description: Names of the objects that were changed.
+    returned: success
+    type: list
+    elements: str
+deleted:
+    description: Names of the objects that were deleted.
+    returned: success
+    type: list
     elements: str
+locations:
+    description: Names of the objects added, modified and deleted in each location.
+    returned: success
+    type: list
+    elements: dict
 """
@@ -26,6 +26,11 @@ short_description: Checks to see if a PAN-OS device is ready for configuration.
 description:
     - Checks to see if the autocommit job on a PAN-OS device has completed,
       marking the device ready for configuration.
+    - Before each API check, a TCP connection and TLS handshake to the device
+      are attempted, so checks are cheap while the device is down.  The probe
+      connects directly, so it is only a hint: the API is still checked every
+      third attempt when the probe fails, and the probe is skipped when the
+      connection uses an HTTP(S) proxy.
 author:
     - Michael Richardson (@mrichardson03)
 version_added: '1.0.0'
@@ -38,9 +43,17 @@ options:
       - Number of seconds to wait before starting checks.
     default: 0
     type: int
+  min_sleep:
+    description:
+      - Number of seconds to wait after the first failed check.  The wait
+        doubles after each failed check, up to I(sleep).
+      - The wait is reset to this value when the device becomes reachable
+        again after being down.
+    default: 5
+    type: int
   sleep:
     description:
-      - Number of seconds to wait in between checks.
+      - Maximum number of seconds to wait in between checks.
     default: 60
     type: int
   timeout:
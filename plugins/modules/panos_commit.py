@@ -63,9 +63,51 @@ options:
             - Commit only the changes made by the specified administrators.
         type: list
         elements: str
+    auto_scope:
+        description:
+            - Look at the pending changes and perform the narrowest partial
+              commit that covers them.  Sections of the configuration without
+              changes are excluded from the commit.
+            - If I(admins) is set, only the changes made by those
+              administrators are considered.
+            - A full commit is performed if any change cannot be placed in a
+              single section.
+        type: bool
+        default: False
+    coalesce:
+        description:
+            - Do not commit now.  Instead, record the commit as pending in the
+              I(panos_pending_commit) host fact, merging it with any commit
+              already pending.
+            - The next C(panos_commit) task for the host without I(coalesce)
+              performs a single commit covering all pending commits.  Their
+              descriptions are combined, their admin scopes are joined, and
+              a section is only excluded if every commit excluded it.
+        type: bool
+        default: False
+    delay:
+        description:
+            - Number of seconds to wait before checking for pending changes.
+        type: int
+        default: 0
+    history_dir:
+        description:
+            - Directory on the controller used to keep a history of commit
+              durations for each device, in a file named after the device
+              serial number.
+            - When set, the timeout and poll interval of the commit are
+              predicted from earlier commits unless I(timeout) or I(sleep)
+              are given, and commits taking much longer than usual are
+              flagged.  A predicted timeout is never shorter than the
+              default of I(timeout).
+            - Partial commits are kept separately from full commits.
+            - Use C(panos_job_history) to export the history.
+        type: path
     sleep:
         description:
-            - Check commit status every X seconds.
+            - Maximum number of seconds between commit status checks.  The
+              status is checked sooner when the progress reported by the
+              commit job shows it is close to finishing.
         type: int
         default: 10
     timeout:
@@ -73,6 +115,14 @@ options:
             - Generate an error if commit has not completed after X seconds.
         type: int
         default: 600
+    wait:
+        description:
+            - Wait for the commit job to finish.
+            - If false, the task returns as soon as the commit has been
+              started.  Use C(panos_job_wait) with the returned I(job_id) to
+              wait for it later.
+        type: bool
+        default: True
 """
 
 EXAMPLES = """
@@ -82,6 +132,29 @@ EXAMPLES = """
 - name: commit changes by specified admins to firewall
   panos_commit:
     admins: ['admin1','admin2']
+
+- name: Commit only the sections changed by the automation user
+  panos_commit:
+    admins: ['automation']
+    auto_scope: true
+
+- name: Defer the commit until later in the playbook
+  panos_commit:
+    description: 'Address objects'
+    coalesce: true
+
+- name: Commit everything deferred so far
+  panos_commit:
+
+- name: Start a commit without waiting for it
+  panos_commit:
+    wait: false
+  register: commit
+
+- name: Wait for the commit later
+  panos_job_wait:
+    job_ids: ['{{ commit.job_id }}']
+  when: commit.job_id is defined
 """
 
 RETURN = """
@@ -93,14 +166,48 @@ msg:
     description: A string with an error message, if any.
     returned: failure, always
     type: str
+job_id:
+    description: ID of the commit job.
+    returned: When a commit was started.
+    type: str
+    sample: "42"
 stdout:
     description: output of the commit job as a JSON formatted string
-    returned: always
+    returned: When 'wait' is true.
     type: str
     sample: "{system: {app-release-date: 2017/05/01  15:09:12}}"
 stdout_xml:
     description: output of the commit job as an XML formatted string
-    returned: always
+    returned: When 'wait' is true.
     type: str
     sample: "<response status=success><result><system><hostname>fw2</hostname>"
+elapsed:
+    description: Number of seconds the task took.
+    returned: always
+    type: int
+outlier:
+    description: If the commit took much longer than earlier commits.
+    returned: When 'history_dir' is set and the commit finished.
+    type: bool
+pending_commit:
+    description: Arguments of the pending commit, after merging.
+    returned: When 'coalesce' is true.
+    type: dict
+scope:
+    description: Sections excluded from the commit by I(auto_scope).
+    returned: When 'auto_scope' is true and there are changes to commit.
+    type: dict
+    sample: {"exclude_device_and_network": true,
+             "exclude_policy_and_objects": false,
+             "exclude_shared_objects": true}
+phases:
+    description:
+        - Number of seconds spent in each phase of the commit.
+        - C(delay) is the initial delay, C(pending_changes) the pending
+          changes check, C(scope) working out the commit scope, C(commit)
+          submitting the commit, and C(job) waiting for the commit job to
+          finish.
+    returned: always
+    type: dict
+    sample: {"pending_changes": 0.21, "commit": 0.45, "job": 14.2}
 """
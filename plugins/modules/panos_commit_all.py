@@ -0,0 +1,128 @@
+#!/usr/bin/python
+
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: panos_commit_all
+short_description: Push configuration from Panorama to firewalls.
+description:
+    - Pushes device group and template configuration from Panorama to the
+      managed firewalls.
+    - A push is started for each device group and template, and all pushes
+      are tracked concurrently.  The result and timing of the push to each
+      firewall are reported.
+author:
+    - Michael Richardson (@mrichardson03)
+version_added: '1.0.0'
+notes:
+    - Only Panorama is supported.
+    - Check mode is supported.
+options:
+    device_groups:
+        description:
+            - Device groups to push.
+            - One of I(device_groups) or I(templates) is required.
+        type: list
+        elements: str
+    templates:
+        description:
+            - Templates or template stacks to push.
+        type: list
+        elements: str
+    serials:
+        description:
+            - Only push to the firewalls with these serial numbers.
+        type: list
+        elements: str
+    description:
+        description:
+            - Description to add to the push.
+        type: str
+    include_template:
+        description:
+            - Include device and network templates when pushing device groups.
+        type: bool
+        default: False
+    validate:
+        description:
+            - Only validate the push, without applying it to the firewalls.
+        type: bool
+        default: False
+    sleep:
+        description:
+            - Maximum number of seconds between push status checks.
+        type: int
+        default: 10
+    timeout:
+        description:
+            - Generate an error if the pushes have not completed after X
+              seconds.
+        type: int
+        default: 1800
+    workers:
+        description:
+            - Maximum number of push jobs to check at the same time.
+        type: int
+        default: 4
+"""
+
+EXAMPLES = """
+- name: Push device groups and their templates
+  panos_commit_all:
+    device_groups: ['branch-east', 'branch-west']
+    include_template: true
+
+- name: Push a template to two firewalls
+  panos_commit_all:
+    templates: ['branch']
+    serials: ['007000001111', '007000002222']
+"""
+
+RETURN = """
+changed:
+    description: A boolean value indicating if the task had to make changes.
+    returned: always
+    type: bool
+msg:
+    description: A string with an error message, if any.
+    returned: failure, always
+    type: str
+jobs:
+    description: IDs of the push jobs started.
+    returned: success
+    type: list
+    elements: str
+devices:
+    description:
+        - Result of the push to each firewall.
+        - C(elapsed) is the number of seconds after the pushes started that
+          the firewall was first seen finished.
+    returned: success
+    type: list
+    elements: dict
+    sample: [{"serial": "007000001111", "name": "fw1", "job_id": "12",
+              "result": "OK", "status": "commit succeeded", "elapsed": 41.2,
+              "messages": []}]
+elapsed:
+    description: Number of seconds the task took.
+    returned: always
+    type: int
+"""
@@ -0,0 +1,92 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: panos_config_batch
+short_description: Sets several configuration elements at once.
+description:
+    - Sets several arbitrary configuration elements in a single pass.
+    - The configuration containing all of the elements is retrieved once, each element is compared
+      to it locally with the same logic as M(mrichardson03.panos.panos_config_element), and only the
+      changed elements are pushed, together in batched requests.
+author:
+    - Michael Richardson (@mrichardson03)
+version_added: '1.0.0'
+notes:
+    - Panorama is supported.
+    - Check mode is supported.
+    - The common ancestor of all the xpaths is retrieved, so elements far apart in the configuration
+      retrieve a large part of it.
+options:
+    elements:
+        description:
+            - List of elements to set.  Each element is a dict with the keys I(xpath), I(element),
+              and optionally I(edit), which have the same meaning as in
+              M(mrichardson03.panos.panos_config_element).
+            - Each element can also set an integer I(layer), which orders it when I(workers) is
+              greater than one.  See I(workers).
+        type: list
+        elements: dict
+        required: true
+    edit:
+        description:
+            - Default value of I(edit) for elements that do not set it.
+        type: bool
+        default: false
+    workers:
+        description:
+            - Maximum number of concurrent requests used to push the changed elements.
+            - With the default of one, the changed elements are pushed in the order given, so an
+              element can refer to objects created by earlier elements.
+            - When greater than one, elements are applied layer by layer in ascending I(layer)
+              order, and the elements within a layer are treated as independent of each other
+              and pushed concurrently in no particular order.  Elements without a I(layer) are
+              in layer 0, so only use this with independent elements, or give dependent elements
+              a higher I(layer) than the elements they refer to.
+        type: int
+        default: 1
+"""
+
+EXAMPLES = """
+- name: Configure system settings and address objects
+  panos_config_batch:
+    elements:
+      - xpath: "/config/devices/entry[@name='localhost.localdomain']/deviceconfig/system"
+        element: "<timezone>UTC</timezone>"
+      - xpath: "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']/address"
+        element: "<address>{{ lookup('template', 'address.xml.j2') }}</address>"
+        edit: true
+"""
+
+RETURN = """
+changed:
+    description: A boolean value indicating if the task had to make changes.
+    returned: always
+    type: bool
+msg:
+    description: A string with an error message, if any.
+    returned: failure, always
+    type: str
+results:
+    description: The xpath of each element and whether it was changed.
+    returned: success
+    type: list
+    elements: dict
+"""
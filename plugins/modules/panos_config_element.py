@@ -36,6 +36,7 @@ notes:
     - Panorama is supported.
 extends_documentation_fragment:
     - mrichardson03.panos.fragments.state
+    - mrichardson03.panos.fragments.target
 options:
     xpath:
         description:
@@ -45,6 +46,8 @@ options:
     element:
         description:
             - The element, in XML format.
+            - Whitespace used only for formatting, such as indentation, is removed before the
+              element is compared and sent.  Text values are not changed.
         type: str
     edit:
         description:
@@ -101,129 +104,15 @@ diff:
 import xml.etree.ElementTree
 
 from ansible.module_utils.connection import ConnectionError
-from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (  # noqa: F401
     PanOSAnsibleModule,
+    config_element_changed,
+    minify_xml,
+    xml_compare,
+    xml_contained,
 )
 
 
-def xml_compare(one, two, excludes=None):
-    """
-    Compares the contents of two xml.etree.ElementTrees for equality.
-
-    :param one: First ElementTree.
-    :param two: Second ElementTree.
-    :param excludes: List of tag attributes to disregard.
-    """
-    if excludes is None:
-        excludes = ["admin", "dirtyId", "time", "uuid"]
-
-    if one is None or two is None:
-        return False
-
-    if one.tag != two.tag:
-        # Tag does not match.
-        return False
-
-    # Compare attributes.
-    for name, value in one.attrib.items():
-        if name not in excludes:
-            if two.attrib.get(name) != value:
-                return False
-
-    for name, value in two.attrib.items():
-        if name not in excludes:
-            if one.attrib.get(name) != value:
-                return False
-
-    if not text_compare(one.text, two.text):
-        # Text differs at this node.
-        return False
-
-    # Sort children by tag name to make sure they're compared in order.
-    children_one = sorted(one, key=lambda e: e.tag)
-    children_two = sorted(two, key=lambda e: e.tag)
-
-    if len(children_one) != len(children_two):
-        # Number of children differs.
-        return False
-
-    for child_one, child_two in zip(children_one, children_two):
-        if not xml_compare(child_one, child_two, excludes):
-            # Child documents do not match.
-            return False
-
-    return True
-
-
-def text_compare(one, two):
-    """Compares the contents of two XML text attributes."""
-    if not one and not two:
-        return True
-    return (one or "").strip() == (two or "").strip()
-
-
-def iterpath(node, tag=None, path="."):
-    """
-    Similar to Element.iter(), but the iterator gives each element's path along
-    with the element itself.
-
-    Reference: https://docs.python.org/3/library/xml.etree.elementtree.html#xml.etree.ElementTree.Element.iter
-
-    Taken from: https://stackoverflow.com/questions/13136334/get-xpath-dynamically-using-elementtree-getpath
-    """
-    if tag == "*":
-        tag = None
-
-    if tag is None or node.tag == tag:
-        yield node, path
-
-    for child in node:
-        if child.tag == "entry":
-            _child_path = "{0}/{1}[@name='{2}']".format(
-                path, child.tag, child.attrib["name"]
-            )
-        else:
-            _child_path = "{0}/{1}".format(path, child.tag)
-
-        for child, child_path in iterpath(child, tag, path=_child_path):
-            yield child, child_path
-
-
-def xml_contained(big, small):
-    """
-    Check to see if all the XML elements with no children in "small" are
-    present in "big", at the same locations in the tree.
-
-    This ensures all the configuration in "small" is contained in "big", but
-    "big" can have configuration not contained in "small".
-
-    :param big: Big document ElementTree.
-    :param small: Small document ElementTree.
-    """
-
-    if big is None or small is None:
-        return False
-
-    for element, path in iterpath(small):
-
-        # Elements with "member" children must have all their children be equal.
-        if element.find("*/member/..") is not None:
-            big_element = big.find(path)
-
-            if not xml_compare(big_element, element):
-                return False
-
-        # Elements with no children at the same point in the tree must match
-        # exactly.
-        elif len(element) == 0 and (element.tag != "member"):
-            big_element = big.find(path)
-
-            if not xml_compare(big_element, element):
-                return False
-
-    return True
-
-
 def main():
     module = PanOSAnsibleModule(
         argument_spec=dict(
@@ -233,6 +122,7 @@ def main():
         ),
         supports_check_mode=True,
         with_state=True,
+        with_target=True,
     )
 
     xpath = module.params["xpath"]
@@ -251,31 +141,18 @@ def main():
             if element_xml is None:
                 module.fail_json(msg="'element' is required when state is 'present'.")
 
-            if edit:
-                element = xml.etree.ElementTree.fromstring(element_xml)
+            try:
+                element_xml = minify_xml(element_xml)
+            except ValueError as e:
+                module.fail_json(msg="{0}".format(e))
 
-                # Edit action is a regular comparison between the two
-                # XML documents for equality.
-                if not xml_compare(existing, element):
-                    changed = True
+            if config_element_changed(existing, element_xml, edit):
+                changed = True
 
-                    if not module.check_mode:  # pragma: no cover
+                if not module.check_mode:  # pragma: no cover
+                    if edit:
                         module.connection.edit(xpath, element_xml)
-
-            else:
-                # When using set action, element can be an invalid XML document.
-                # Wrap it in a dummy tag if so.
-                try:
-                    element = xml.etree.ElementTree.fromstring(element_xml)
-                except xml.etree.ElementTree.ParseError:
-                    element = xml.etree.ElementTree.fromstring(
-                        "<wrapped>" + element_xml + "</wrapped>"
-                    )
-
-                if not xml_contained(existing, element):
-                    changed = True
-
-                    if not module.check_mode:  # pragma: no cover
+                    else:
                         module.connection.set(xpath, element_xml)
 
             diff = {
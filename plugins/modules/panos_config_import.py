@@ -0,0 +1,105 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: panos_config_import
+short_description: Loads a large configuration into the candidate configuration.
+description:
+    - Uploads a configuration file to the device and loads part of it into the candidate
+      configuration with C(load config partial).
+    - The file is streamed to the device, so it is not subject to the 5 MB limit of other API
+      requests, and loading it takes a single command no matter how many entries it contains.
+      This suits initial builds and large migrations.
+author:
+    - Michael Richardson (@mrichardson03)
+version_added: '1.0.0'
+notes:
+    - Panorama is supported.
+    - Check mode is supported, and only reports what would be uploaded.
+    - This module is not idempotent.  The configuration is uploaded and loaded on every run, and
+      the task always reports a change, including in check mode.  Use C(panos_config_element) or
+      C(panos_config_batch) for changes that should only be made when needed.
+options:
+    src:
+        description:
+            - Configuration file on the controller to upload, as found in the C(files) directory.
+            - The file must be a complete configuration document, rooted at C(<config>).
+            - Mutually exclusive with I(content).
+        type: str
+    content:
+        description:
+            - Configuration document to upload, such as the output of a template lookup.
+            - Mutually exclusive with I(src).
+        type: str
+    filename:
+        description:
+            - Name to save the configuration as on the device.
+            - Defaults to the name of I(src), or C(ansible-import.xml) when using I(content).
+        type: str
+    from_xpath:
+        description:
+            - Xpath of the configuration to load from the uploaded file.
+            - Defaults to I(to_xpath).
+        type: str
+    to_xpath:
+        description:
+            - Xpath in the candidate configuration to load the configuration to.
+        type: str
+        required: true
+    mode:
+        description:
+            - How the loaded configuration is combined with the candidate configuration.
+        choices: ['merge', 'replace', 'append']
+        type: str
+        default: 'merge'
+"""
+
+EXAMPLES = """
+- name: Load 20,000 address objects
+  panos_config_import:
+    content: "{{ lookup('template', 'addresses.xml.j2') }}"
+    to_xpath: "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']/address"
+    mode: replace
+
+- name: Migrate rules from another firewall's saved configuration
+  panos_config_import:
+    src: old-firewall.xml
+    from_xpath: "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys2']/rulebase"
+    to_xpath: "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']/rulebase"
+"""
+
+RETURN = """
+changed:
+    description: A boolean value indicating if the task had to make changes.
+    returned: always
+    type: bool
+msg:
+    description: A string with an error message, if any.
+    returned: failure, always
+    type: str
+filename:
+    description: Name the configuration was saved as on the device.
+    returned: success
+    type: str
+size:
+    description: Size of the uploaded configuration, in bytes.
+    returned: success
+    type: int
+"""
@@ -25,6 +25,9 @@ module: panos_dynamic_updates
 short_description: Installs PAN-OS dynamic updates.
 description:
     - Installs the latest version of one or more PAN-OS dynamic updates.
+    - Downloads of all types are started at the same time.  Once they have
+      all finished, the updates are installed in the order content,
+      anti-virus, WildFire.
 author:
     - 'Nathan Embery (@nembery)'
     - 'Michael Richardson (@mrichardson03)'
@@ -44,6 +47,46 @@ options:
             - content
             - anti-virus
             - wildfire
+    image_dir:
+        description:
+            - Directory on the controller containing content images, such as
+              C(panupv2-all-contents-8500-7000).  If the latest version is
+              found there, it is uploaded to the device and installed instead
+              of being downloaded by the device.
+            - Images are checked against the SHA-256 checksum reported by the
+              update servers.
+            - If the device cannot reach the update servers, the newest image
+              of each type in this directory is installed, if it is newer than
+              the installed version.
+        type: path
+    cache_ttl:
+        description:
+            - Number of seconds the result of the update server check is
+              reused for, per device, by later tasks and playbook runs.
+            - The cached result is discarded once the module makes a change.
+            - C(0) disables the cache.
+        type: int
+        default: 0
+    cache_dir:
+        description:
+            - Directory on the controller used to cache update server check
+              results, in a file named after the device serial number.
+        type: path
+        default: ~/.ansible/cache/mrichardson03.panos
+    force_refresh:
+        description:
+            - Check the update servers even if a fresh result is cached.
+        type: bool
+        default: False
+    history_dir:
+        description:
+            - Directory on the controller used to keep a history of download
+              and install durations for each device, in a file named after
+              the device serial number.
+            - When set, the timeout and poll interval of each job are
+              predicted from earlier jobs of the same type, and jobs taking
+              much longer than usual are flagged.
+        type: path
 """
 
 EXAMPLES = """
@@ -53,6 +96,11 @@ EXAMPLES = """
 - name: Install latest WildFire update
   panos_dynamic_updates:
     content_type: ['wildfire']
+
+- name: Install content and anti-virus from a local mirror
+  panos_dynamic_updates:
+    content_type: ['content', 'anti-virus']
+    image_dir: /srv/panos/content
 """
 
 RETURN = """
@@ -72,4 +120,14 @@ wildfire:
     description: WildFire version number, if installed.
     returned: if installed
     type: str
+cached:
+    description: If the update server check result came from the cache.
+    returned: When 'cache_ttl' is set.
+    type: bool
+outliers:
+    description: Jobs that took much longer than usual.
+    returned: When 'history_dir' is set.
+    type: list
+    elements: str
+    sample: ["anti-virus-install"]
 """
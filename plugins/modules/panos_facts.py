@@ -31,6 +31,8 @@ notes:
     - Panorama is supported.
     - Check mode is not supported.
 version_added: '1.0.0'
+extends_documentation_fragment:
+    - mrichardson03.panos.fragments.target
 """
 
 EXAMPLES = """
@@ -299,6 +301,7 @@ def main():
     module = PanOSAnsibleModule(
         argument_spec=dict(),
         supports_check_mode=False,
+        with_target=True,
     )
 
     ansible_facts = dict()
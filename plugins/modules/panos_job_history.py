@@ -0,0 +1,81 @@
+#!/usr/bin/python
+
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: panos_job_history
+short_description: Export the job duration history kept by other modules.
+description:
+    - Reads the job duration history kept by C(panos_commit),
+      C(panos_software) and C(panos_dynamic_updates) when their
+      I(history_dir) option is set, and summarizes it per device and job
+      type.
+    - Runs on the controller only, no connection to a device is made.
+author:
+    - Michael Richardson (@mrichardson03)
+version_added: '1.0.0'
+notes:
+    - Check mode is supported.
+options:
+    history_dir:
+        description:
+            - Directory on the controller containing the history files.
+        type: path
+        required: True
+    serials:
+        description:
+            - Only export the history of devices with these serial numbers.
+        type: list
+        elements: str
+"""
+
+EXAMPLES = """
+- name: Export job history
+  panos_job_history:
+    history_dir: '{{ playbook_dir }}/job_history'
+  register: job_history
+  run_once: true
+
+- name: Save job history
+  copy:
+    content: '{{ job_history.history | to_nice_json }}'
+    dest: '{{ playbook_dir }}/job_history.json'
+  delegate_to: localhost
+  run_once: true
+"""
+
+RETURN = """
+changed:
+    description: Always false.
+    returned: always
+    type: bool
+history:
+    description:
+        - History per device serial number and job type.
+        - Each job type has the count, mean, median, standard deviation,
+          minimum, maximum and last duration in seconds, and the recorded
+          entries.
+    returned: success
+    type: dict
+    sample: {"007000001222": {"commit": {"count": 3, "mean": 41.2,
+             "median": 40.1, "stdev": 2.3, "min": 39.0, "max": 44.5,
+             "last": 40.1, "entries": []}}}
+"""
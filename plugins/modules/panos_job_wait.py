@@ -0,0 +1,97 @@
+#!/usr/bin/python
+
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: panos_job_wait
+short_description: Wait for PAN-OS jobs to finish.
+description:
+    - Waits for one or more jobs on a PAN-OS device to finish, such as
+      commits started by C(panos_commit) with I(wait=false).
+    - All jobs are checked together, and are checked more often as they
+      report they are close to finishing.
+author:
+    - Michael Richardson (@mrichardson03)
+version_added: '1.0.0'
+notes:
+    - Panorama is supported.
+    - Check mode is supported.
+options:
+    job_ids:
+        description:
+            - IDs of the jobs to wait for.  Empty values are ignored.
+        type: list
+        elements: str
+        required: True
+    sleep:
+        description:
+            - Maximum number of seconds between job status checks.
+        type: int
+        default: 10
+    timeout:
+        description:
+            - Generate an error if the jobs have not completed after X
+              seconds.
+        type: int
+        default: 600
+    workers:
+        description:
+            - Maximum number of jobs to check at the same time.
+        type: int
+        default: 4
+"""
+
+EXAMPLES = """
+- name: Start commits on all firewalls
+  panos_commit:
+    wait: false
+  register: commit
+
+- name: Wait for the commits to finish
+  panos_job_wait:
+    job_ids: ['{{ commit.job_id | default(None) }}']
+"""
+
+RETURN = """
+changed:
+    description: Always false.
+    returned: always
+    type: bool
+msg:
+    description: A string with an error message, if any.
+    returned: always
+    type: str
+jobs:
+    description:
+        - Result of each job.
+        - C(elapsed) is the number of seconds after the task started that the
+          job was seen finished.
+    returned: success
+    type: list
+    elements: dict
+    sample: [{"id": "42", "type": "Commit", "result": "OK",
+              "details": ["Configuration committed successfully"],
+              "elapsed": 37.5}]
+elapsed:
+    description: Number of seconds the task took.
+    returned: always
+    type: int
+"""
@@ -37,6 +37,20 @@ options:
         description:
             - Authcode to be applied.
         type: str
+    restart_timeout:
+        description:
+            - Maximum number of seconds to wait for the management plane to
+              restart after the authcode is applied.  Not all licenses cause a
+              restart, so the module carries on if the management plane stays
+              up for this long.
+        type: int
+        default: 300
+    timeout:
+        description:
+            - Maximum number of seconds to wait for the device to be ready
+              after the management plane restarts.
+        type: int
+        default: 600
 """
 
 EXAMPLES = """
@@ -68,4 +82,21 @@ licenses:
     returned: success
     type: list
     elements: dict
+restarted:
+    description: If the management plane restarted after the authcode was applied.
+    returned: When the authcode was applied.
+    type: bool
+elapsed:
+    description: Number of seconds the task took.
+    returned: success
+    type: float
+phases:
+    description:
+        - Number of seconds spent in each phase.
+        - C(activate) is applying the authcode, C(restart) waiting for the
+          management plane to go down, and C(ready) waiting for the device to
+          be ready again.
+    returned: success
+    type: dict
+    sample: {"activate": 12.1, "restart": 20.3, "ready": 95.8}
 """
@@ -28,23 +28,105 @@ description:
 author:
     - 'Michael Richardson (@mrichardson03)'
 version_added: '1.0.0'
-requirements:
-    - xmltodict
 notes:
     - Checkmode is NOT supported.
     - Panorama is supported.
+extends_documentation_fragment:
+    - mrichardson03.panos.fragments.target
 options:
     cmd:
         description:
             - Execute this string directly as an operational command.
+            - When I(dest) is specified, the placeholders C({skip}) and
+              C({count}) in the command are replaced with the number of
+              records already retrieved and the page size for each page
+              requested.  Commands without C({skip}) are run once.
+            - One of I(cmd), I(cmds) or I(log_type) is required.
         type: str
-        required: true
+    cmds:
+        description:
+            - Execute a list of operational commands in a single task.
+            - Results for each command are returned in I(results).
+        type: list
+        elements: str
     cmd_is_xml:
         description:
             - If true, treat the cmd option as a string already in XML format.
             - If false, attempt to convert it to XML before execution.
         type: bool
         default: false
+    workers:
+        description:
+            - Maximum number of commands from I(cmds), or firewalls from
+              I(targets), to run at once.  Each command running at the same
+              time uses its own HTTP session.
+        type: int
+        default: 1
+    targets:
+        description:
+            - Run I(cmd) on each of these firewalls, given by serial number,
+              through the Panorama this task connects to.
+            - All firewalls share the single Panorama connection, so they do
+              not need to be reachable from the controller.
+            - Results for each firewall are returned in I(results).
+        type: list
+        elements: str
+    log_type:
+        description:
+            - Retrieve logs of this type using the log API instead of running
+              an operational command.  Requires I(dest).
+        type: str
+        choices:
+            - traffic
+            - threat
+            - url
+            - data
+            - wildfire
+            - tunnel
+            - auth
+            - userid
+            - hipmatch
+            - globalprotect
+            - decryption
+            - config
+            - system
+    log_query:
+        description:
+            - Log filter to use with I(log_type), in the same syntax as the
+              web interface.
+        type: str
+    dest:
+        description:
+            - Write the records returned by the command to this file on the
+              controller instead of returning the output.
+            - The result is retrieved one page at a time and written out as it
+              arrives, so memory use does not grow with the size of the result.
+        type: path
+    dest_format:
+        description:
+            - Format of the file written to I(dest).
+            - C(ndjson) writes one JSON object per line.
+            - C(csv) uses the fields of the first record as the header row.
+              Records are written as they arrive, so fields that only appear
+              in later records are left out, with a warning.
+        type: str
+        default: ndjson
+        choices:
+            - ndjson
+            - csv
+    page_size:
+        description:
+            - Number of records to request per page when writing to I(dest).
+            - Must be at least 1.
+        type: int
+        default: 500
+    records:
+        description:
+            - Path to the record elements in each response, relative to the
+              response root.
+            - Defaults to C(./result/entry) for commands, and
+              C(./result/log/logs/entry) for logs.
+        type: str
 """
 
 EXAMPLES = """
@@ -52,22 +134,57 @@ EXAMPLES = """
   panos_op:
     cmd: 'show system info'
 
+- name: show system info on a firewall through Panorama
+  panos_op:
+    cmd: 'show system info'
+    target: '007051000012345'
+
+- name: show system info on many firewalls through Panorama
+  panos_op:
+    cmd: 'show system info'
+    targets: '{{ firewall_serials }}'
+    workers: 10
+
 - name: show system info (as XML)
   panos_op:
     cmd: '<show><system><info/></system></show>'
     cmd_is_xml: true
+
+- name: Collect health data
+  panos_op:
+    cmds:
+      - 'show system resources'
+      - 'show session info'
+      - 'show high-availability state'
+    workers: 3
+
+- name: Export all threat logs from the last day
+  panos_op:
+    log_type: threat
+    log_query: '(receive_time in last-24-hrs)'
+    dest: /tmp/threats.ndjson
+
+- name: Export the routing table as CSV
+  panos_op:
+    cmd: '<show><routing><route><skip>{skip}</skip><count>{count}</count></route></routing></show>'
+    cmd_is_xml: true
+    records: './result/entry'
+    dest: /tmp/routes.csv
+    dest_format: csv
 """
 
 RETURN = """
 stdout:
     description: Output of the command in native XML format.
-    returned: always
+    returned: When 'dest' is not specified.
     type: str
     sample: "<response status=success><result><system><hostname>fw2</hostname>"
 
 stdout_dict:
-    description: Output of 'cmd', but converted into a dictionary format.
-    returned: When 'cmd' is specified.
+    description:
+        - Output of 'cmd', but converted into a dictionary format.
+        - C(entry) and C(member) elements are always lists.
+    returned: When 'cmd' is specified and 'dest' is not.
     type: dict
     sample: >
         {
@@ -81,57 +198,286 @@ stdout_dict:
                 }
             }
         }
-"""
 
-try:
-    import xmltodict
+dest:
+    description: File the records were written to.
+    returned: When 'dest' is specified.
+    type: str
+
+record_count:
+    description: Number of records written to 'dest'.
+    returned: When 'dest' is specified.
+    type: int
+
+results:
+    description: Result of each command, in the same order as 'cmds' or
+        'targets'.
+    returned: When 'cmds' or 'targets' is specified.
+    type: list
+    elements: dict
+    contains:
+        cmd:
+            description: Command that was run.
+            type: str
+        target:
+            description: Serial number of the firewall the command ran on,
+                when using 'targets'.
+            type: str
+        changed:
+            description: If the command could have changed the device.
+            type: bool
+        stdout:
+            description: Output of the command in native XML format.
+            type: str
+        stdout_dict:
+            description: Output of the command converted into a dictionary.
+            type: dict
+        elapsed:
+            description: Number of seconds the command took to run.
+            type: float
+        failed:
+            description: If the command failed.
+            type: bool
+        msg:
+            description: Error message, if the command failed.
+            type: str
+"""
 
-    HAS_LIB = True
-except ImportError:  # pragma: no cover
-    HAS_LIB = False
+import csv
+import json
 
 from ansible.module_utils.connection import ConnectionError
 from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
     PanOSAnsibleModule,
-    get_nested_key,
+    paged_records,
+    record_dict,
+    xml_to_dict,
 )
 
+LOG_RECORDS = "./result/log/logs/entry"
+OP_RECORDS = "./result/entry"
+
+
+def write_records(records, dest, dest_format):
+    """
+    Writes records to a file as they are generated.
+
+    :param records: Iterable of record elements.
+    :param dest: Path of file to write.
+    :param dest_format: 'ndjson' or 'csv'.
+    :returns: Tuple of the number of records written, and the sorted list of
+    fields left out of a CSV file because they were not in the header.
+    """
+    count = 0
+    dropped = set()
+
+    with open(dest, "w", newline="") as f:
+        writer = None
+
+        for record in records:
+            d = record_dict(record)
+
+            if dest_format == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(
+                        f, fieldnames=list(d.keys()), extrasaction="ignore"
+                    )
+                    writer.writeheader()
+
+                dropped.update(k for k in d if k not in writer.fieldnames)
+
+                writer.writerow(
+                    dict(
+                        (k, v if isinstance(v, str) or v is None else json.dumps(v))
+                        for k, v in d.items()
+                    )
+                )
+            else:
+                f.write(json.dumps(d) + "\n")
+
+            count += 1
+
+    return count, sorted(dropped)
+
+
+def is_safe_cmd(cmd, cmd_is_xml):
+    """
+    Returns if a command only displays information, and will not change the
+    device.
+
+    :param cmd: Command to check.
+    :param cmd_is_xml: Command is in XML format.
+    """
+    if cmd_is_xml:
+        safe_cmds = ["<diff>", "<show>"]
+    else:
+        safe_cmds = ["diff", "show"]
+
+    for safe_cmd in safe_cmds:
+        if cmd.find(safe_cmd) == 0:
+            return True
+
+    return False
+
 
 def main():
     module = PanOSAnsibleModule(
         argument_spec=dict(
-            cmd=dict(type="str", required=True),
+            cmd=dict(type="str"),
+            cmds=dict(type="list", elements="str"),
             cmd_is_xml=dict(default=False, type="bool"),
+            workers=dict(type="int", default=1),
+            log_type=dict(
+                type="str",
+                choices=[
+                    "traffic",
+                    "threat",
+                    "url",
+                    "data",
+                    "wildfire",
+                    "tunnel",
+                    "auth",
+                    "userid",
+                    "hipmatch",
+                    "globalprotect",
+                    "decryption",
+                    "config",
+                    "system",
+                ],
+            ),
+            log_query=dict(type="str"),
+            dest=dict(type="path"),
+            dest_format=dict(type="str", default="ndjson", choices=["ndjson", "csv"]),
+            page_size=dict(type="int", default=500),
+            records=dict(type="str"),
+            targets=dict(type="list", elements="str"),
         ),
+        required_one_of=[["cmd", "cmds", "log_type"]],
+        mutually_exclusive=[
+            ["cmd", "cmds", "log_type"],
+            ["cmds", "dest"],
+            ["targets", "target"],
+            ["targets", "cmds"],
+            ["targets", "dest"],
+            ["targets", "log_type"],
+        ],
+        required_by={"log_type": "dest"},
         supports_check_mode=False,
+        with_target=True,
     )
 
-    if not HAS_LIB:  # pragma: no cover
-        module.fail_json(msg="Missing required libraries.")
-
     cmd = module.params["cmd"]
     cmd_is_xml = module.params["cmd_is_xml"]
+    log_type = module.params["log_type"]
+    dest = module.params["dest"]
+    page_size = module.params["page_size"]
+
+    if page_size < 1:
+        module.fail_json(msg="'page_size' must be at least 1.")
 
     results = None
 
+    def write_dest(records, changed):
+        count, dropped = write_records(records, dest, module.params["dest_format"])
+
+        if dropped:
+            module.warn(
+                "Fields not in the first record were left out of {0}: {1}".format(
+                    dest, ", ".join(dropped)
+                )
+            )
+
+        module.exit_json(changed=changed, dest=dest, record_count=count)
+
     try:
-        changed = True
+        if log_type:
 
-        safe_cmds = ["diff", "show"]
-        safe_xml_cmds = ["<diff>", "<show>"]
+            def fetch_page(skip, count):
+                return module.connection.log(
+                    log_type=log_type,
+                    query=module.params["log_query"],
+                    nlogs=count,
+                    skip=skip,
+                )
+
+            write_dest(
+                paged_records(
+                    fetch_page, page_size, module.params["records"] or LOG_RECORDS
+                ),
+                False,
+            )
+
+        if module.params["cmds"]:
+            results = module.connection.op_batch(
+                module.params["cmds"],
+                is_xml=cmd_is_xml,
+                workers=module.params["workers"],
+            )
+
+            for result in results:
+                result["changed"] = not is_safe_cmd(result["cmd"], cmd_is_xml)
+                result["failed"] = result["msg"] is not None
+
+                if not result["failed"]:
+                    result["stdout_dict"] = xml_to_dict(result["stdout"])
+
+            changed = any(r["changed"] for r in results)
+
+            if any(r["failed"] for r in results):
+                module.fail_json(
+                    msg="One or more commands failed.", changed=changed, results=results
+                )
+
+            module.exit_json(changed=changed, results=results)
+
+        changed = not is_safe_cmd(cmd, cmd_is_xml)
+
+        if module.params["targets"]:
+            results = module.connection.fan_out(
+                module.params["targets"],
+                "op",
+                args=[cmd],
+                kwargs={"is_xml": cmd_is_xml},
+                workers=module.params["workers"],
+            )
+
+            for result in results:
+                result["stdout"] = result.pop("result")
+                result["changed"] = changed
+                result["failed"] = result["msg"] is not None
+
+                if not result["failed"]:
+                    result["stdout_dict"] = xml_to_dict(result["stdout"])
+
+            if any(r["failed"] for r in results):
+                module.fail_json(
+                    msg="Command failed on one or more firewalls.",
+                    changed=changed,
+                    results=results,
+                )
+
+            module.exit_json(changed=changed, results=results)
+
+        if dest:
+
+            def fetch_page(skip, count):
+                page_cmd = cmd.replace("{skip}", str(skip))
+                page_cmd = page_cmd.replace("{count}", str(count))
 
-        if cmd_is_xml:
-            for safe_xml_cmd in safe_xml_cmds:
-                if cmd.find(safe_xml_cmd) == 0:
-                    changed = False
+                return module.connection.op(page_cmd, is_xml=cmd_is_xml)
 
-        else:
-            for safe_cmd in safe_cmds:
-                if cmd.find(safe_cmd) == 0:
-                    changed = False
+            # Commands without a paging placeholder are only run once.
+            write_dest(
+                paged_records(
+                    fetch_page,
+                    page_size if "{skip}" in cmd else None,
+                    module.params["records"] or OP_RECORDS,
+                ),
+                changed,
+            )
 
         xml_output = module.connection.op(cmd, is_xml=cmd_is_xml)
-        obj_dict = xmltodict.parse(xml_output)
+        obj_dict = xml_to_dict(xml_output)
 
         results = {"changed": changed, "stdout": xml_output, "stdout_dict": obj_dict}
         module.exit_json(**results)
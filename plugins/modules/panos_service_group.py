@@ -0,0 +1,112 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: panos_service_group
+short_description: Create service groups on PAN-OS devices.
+description:
+    - Create service groups on PAN-OS devices.
+    - Can also synchronize a list of objects at once, pushing only the differences.
+author:
+    - Michael Richardson (@mrichardson03)
+version_added: '1.0.0'
+notes:
+    - Panorama is supported.
+    - Check mode is supported.
+extends_documentation_fragment:
+    - mrichardson03.panos.fragments.state
+options:
+    name:
+        description:
+            - Name of the object.
+            - Required unless I(objects) is given.
+        type: str
+    value:
+        description:
+            - List of services in the group.  Must specify if state is I(present).
+        type: list
+        elements: str
+    tag:
+        description:
+            - List of tags to add to the object.
+        type: list
+        elements: str
+    objects:
+        description:
+            - List of objects to synchronize in one task, instead of a single object.
+            - Each object takes the same keys as the single object options.
+            - Existing objects are retrieved once, and only objects that need to be added or changed
+              are pushed, in batched requests.
+            - Mutually exclusive with I(name).
+        type: list
+        elements: dict
+    purge:
+        description:
+            - When using I(objects), delete existing objects of this type that are not in the list.
+        type: bool
+        default: false
+    locations:
+        description:
+            - List of locations to manage the objects in.  Each location is either C(shared), or a
+              dict with a C(vsys) or C(device_group) key naming the vsys or Panorama device group.
+            - Objects are built once, the existing objects in each location are retrieved and
+              compared, and the changes for all locations are pushed together.
+            - Defaults to C(vsys1).
+        type: list
+        elements: raw
+"""
+
+EXAMPLES = """
+- name: Create service group
+  panos_service_group:
+    name: 'web'
+    value: ['service-http', 'service-https']
+"""
+
+RETURN = """
+changed:
+    description: A boolean value indicating if the task had to make changes.
+    returned: always
+    type: bool
+msg:
+    description: A string with an error message, if any.
+    returned: failure, always
+    type: str
+added:
+    description: Names of the objects that were added.
+    returned: success
+    type: list
+    elements: str
+modified:
+    description: Names of the objects that were changed.
+    returned: success
+    type: list
+    elements: str
+deleted:
+    description: Names of the objects that were deleted.
+    returned: success
+    type: list
+    elements: str
+locations:
+    description: Names of the objects added, modified and deleted in each location.
+    returned: success
+    type: list
+    elements: dict
+"""
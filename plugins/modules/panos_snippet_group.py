@@ -25,6 +25,9 @@ module: panos_snippet_group
 short_description: Sets arbitrary configuration elements from a snippet group definition file
 description:
     - This module will allow user the creation and use of custom configuration definitions using a YAML file
+    - All snippets are rendered first, and each configuration subtree they touch is only retrieved once.
+      Snippets are compared against the existing configuration locally, and all changed snippets are
+      applied together in a single multi-config request.
 author:
     - 'Nathan Embery (@nembery)'
 version_added: '1.0.0'
@@ -39,6 +42,24 @@ options:
             - The relative path to a snippet definition file to load
         type: str
         required: true
+    cache_dir:
+        description:
+            - Directory on the controller used to cache parsed snippet group files.
+            - A file is only parsed again after its modification time or size changes, so it is
+              parsed once for all hosts instead of once per host.
+            - Set to an empty string to disable the cache.
+        type: str
+        default: ~/.ansible/cache/mrichardson03.panos
+    workers:
+        description:
+            - Maximum number of concurrent requests used to apply changed snippets.
+            - Snippets are sorted into layers by their dependencies.  Layers are applied in order,
+              and the snippets in each layer are split over up to this many requests.
+            - A snippet depends on the snippets named in its C(depends) list, and on any earlier
+              snippet whose xpath overlaps with its own or that creates an object it refers to.
+            - With the default of C(1), all changed snippets are applied in a single request.
+        type: int
+        default: 1
 """
 
 EXAMPLES = """
@@ -49,6 +70,11 @@ EXAMPLES = """
   panos_snippet_group:
     src: bgp.yaml
 
+- name: Apply a large baseline configuration over several sessions
+  panos_snippet_group:
+    src: baseline.yaml
+    workers: 4
+
 """
 
 RETURN = """
@@ -39,6 +39,11 @@ options:
             - For example, if the PAN-OS device is currently running 9.1.0, and
               'version' is set to 10.0.2, the 10.0.0 base image will be
               downloaded and the 10.0.2 image will be downloaded and installed.
+            - If the version cannot be upgraded to directly, an upgrade path is
+              planned through the base images of intermediate releases.  All
+              images for the path are downloaded at once, then each release
+              is installed in turn, restarting and waiting for the device to
+              be ready in between.  I(restart) must be set for such upgrades.
         type: str
         required: true
     sync_to_peer:
@@ -71,6 +76,46 @@ options:
               error.
         type: int
         default: 600
+    image_dir:
+        description:
+            - Directory on the controller containing software images, such as
+              C(PanOS_vm-10.1.3).  Images found there are uploaded to the
+              device instead of being downloaded by the device from the update
+              servers.  Images not found are downloaded as usual.
+            - Images are checked against the SHA-256 checksum reported by the
+              update servers.
+            - If the device cannot reach the update servers, the images in
+              this directory are used as the list of available versions.  Keep
+              images for a single platform in each directory.
+        type: path
+    cache_ttl:
+        description:
+            - Number of seconds the result of the update server check is
+              reused for, per device, by later tasks and playbook runs.
+            - The cached result is discarded once the module makes a change.
+            - C(0) disables the cache.
+        type: int
+        default: 0
+    cache_dir:
+        description:
+            - Directory on the controller used to cache update server check
+              results, in a file named after the device serial number.
+        type: path
+        default: ~/.ansible/cache/mrichardson03.panos
+    force_refresh:
+        description:
+            - Check the update servers even if a fresh result is cached.
+        type: bool
+        default: False
+    history_dir:
+        description:
+            - Directory on the controller used to keep a history of download
+              and install durations for each device, in a file named after
+              the device serial number.
+            - When set, the timeout and poll interval of each job are
+              predicted from earlier jobs of the same type unless I(timeout)
+              is given, and jobs taking much longer than usual are flagged.
+        type: path
 """
 
 EXAMPLES = """
@@ -79,6 +124,11 @@ EXAMPLES = """
     version: '8.1.6'
     restart: true
 
+- name: Upgrade from PAN-OS 9.0 through 10.0 to 10.1.3
+  panos_software:
+    version: '10.1.3'
+    restart: true
+
 - name: Download PAN-OS 9.0.0 base image only
   panos_software:
     version: '9.0.0'
@@ -102,4 +152,25 @@ msg:
     description: A string with an error message, if any.
     returned: failure, always
     type: str
+uploaded:
+    description: Versions uploaded from I(image_dir).
+    returned: When images were needed.
+    type: list
+    elements: str
+path:
+    description: Versions installed in order, ending with the target version.
+    returned: When the device is not running the target version.
+    type: list
+    elements: str
+    sample: ["10.0.0", "10.1.3"]
+cached:
+    description: If the update server check result came from the cache.
+    returned: When 'cache_ttl' is set.
+    type: bool
+outliers:
+    description: Jobs that took much longer than usual.
+    returned: When 'history_dir' is set and an upgrade was performed.
+    type: list
+    elements: str
+    sample: ["install"]
 """
@@ -0,0 +1,114 @@
+# Copyright 2021 Palo Alto Networks, Inc
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+# Compares xml_to_dict() against xmltodict on a ~10 MB 'show session all'
+# style response.  Exits non-zero if xml_to_dict() is not at least twice as
+# fast.
+#
+# Usage (from the collection root, inside ansible_collections/mrichardson03):
+#
+#   python tests/benchmarks/xml_to_dict.py
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+import timeit
+
+import xmltodict
+from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
+    xml_to_dict,
+)
+
+ENTRY = """
+    <entry>
+      <dst>10.1.{0}.{1}</dst>
+      <xsource>192.168.{1}.{0}</xsource>
+      <source>192.168.{1}.{0}</source>
+      <xdst>10.1.{0}.{1}</xdst>
+      <xsport>{2}</xsport>
+      <xdport>443</xdport>
+      <sport>{2}</sport>
+      <dport>443</dport>
+      <proto>6</proto>
+      <from>trust</from>
+      <to>untrust</to>
+      <start-time>Mon May  3 10:12:{3:02d} 2021</start-time>
+      <nat>False</nat>
+      <srcnat>False</srcnat>
+      <dstnat>False</dstnat>
+      <proxy>False</proxy>
+      <decrypt-mirror>False</decrypt-mirror>
+      <state>ACTIVE</state>
+      <type>FLOW</type>
+      <total-byte-count>{4}</total-byte-count>
+      <idx>{5}</idx>
+      <vsys-idx>1</vsys-idx>
+      <vsys>vsys1</vsys>
+      <application>ssl</application>
+      <security-rule>allow-outbound</security-rule>
+      <ingress>ethernet1/2</ingress>
+      <egress>ethernet1/1</egress>
+      <flags> NS</flags>
+    </entry>"""
+
+TARGET_SIZE = 10 * 1024 * 1024
+RUNS = 3
+
+
+def build_document():
+    entries = []
+    size = 0
+    i = 0
+
+    while size < TARGET_SIZE:
+        entry = ENTRY.format(
+            i % 256, (i // 256) % 256, 1024 + i % 60000, i % 60, i * 7, i
+        )
+        entries.append(entry)
+        size += len(entry)
+        i += 1
+
+    return (
+        '<response status="success"><result>{0}</result></response>'.format(
+            "".join(entries)
+        ),
+        i,
+    )
+
+
+def main():
+    doc, count = build_document()
+
+    print("document: {0:.1f} MB, {1} entries".format(len(doc) / 1024 / 1024, count))
+
+    baseline = min(
+        timeit.repeat(
+            lambda: xmltodict.parse(doc, force_list=("entry", "member")),
+            number=1,
+            repeat=RUNS,
+        )
+    )
+    native = min(timeit.repeat(lambda: xml_to_dict(doc), number=1, repeat=RUNS))
+
+    print("xmltodict:   {0:.3f} s".format(baseline))
+    print("xml_to_dict: {0:.3f} s".format(native))
+    print("speedup:     {0:.2f}x".format(baseline / native))
+
+    return 0 if baseline / native >= 2 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
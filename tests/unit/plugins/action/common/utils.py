@@ -0,0 +1,45 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest import mock
+
+import pytest
+from ansible.playbook.play_context import PlayContext
+from ansible.playbook.task import Task
+
+
+class ActionTestCase:
+    """
+    Runs an action plugin against a mocked connection, the same way
+    ModuleTestCase runs a module.
+    """
+
+    @pytest.fixture
+    def connection_mock(self):
+        connection = mock.MagicMock()
+        connection._shell.tmpdir = None
+
+        return connection
+
+    def _run_action(self, connection, args, check_mode=False, task_vars=None):
+        action = self._action(connection, args, check_mode)
+
+        return action.run(task_vars=task_vars or {})
+
+    def _action(self, connection, args, check_mode=False):
+        task = mock.MagicMock(Task)
+        task.args = args
+        task.async_val = 0
+
+        play_context = PlayContext()
+        play_context.check_mode = check_mode
+
+        return self.action.ActionModule(
+            task,
+            connection,
+            play_context,
+            loader=None,
+            templar=None,
+            shared_loader_obj=None,
+        )
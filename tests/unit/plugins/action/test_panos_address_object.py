@@ -0,0 +1,91 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible.errors import AnsibleError
+from ansible_collections.mrichardson03.panos.plugins.action import panos_address_object
+
+from .common.utils import ActionTestCase
+
+ADDRESS = (
+    "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']"
+    "/address"
+)
+
+GET_ADDRESS = """
+<response status="success">
+    <result>
+        <address>
+            <entry name="web">
+                <ip-netmask>10.0.0.1</ip-netmask>
+                <tag>
+                    <member>prod</member>
+                </tag>
+            </entry>
+        </address>
+    </result>
+</response>
+"""
+
+
+class TestPanosAddressObject(ActionTestCase):
+    action = panos_address_object
+
+    def test_single_unchanged(self, connection_mock):
+        connection_mock.get.return_value = GET_ADDRESS
+
+        result = self._run_action(
+            connection_mock, {"name": "web", "value": "10.0.0.1", "tags": ["prod"]}
+        )
+
+        assert not result["changed"]
+        connection_mock.get.assert_called_once_with(ADDRESS)
+        connection_mock.multi_config.assert_not_called()
+
+    def test_single_changed(self, connection_mock):
+        connection_mock.get.return_value = GET_ADDRESS
+
+        result = self._run_action(
+            connection_mock,
+            {"name": "web", "address_type": "fqdn", "value": "web.example.com"},
+        )
+
+        assert result["changed"]
+        assert result["modified"] == ["web"]
+        connection_mock.multi_config.assert_called_once_with(
+            [
+                {
+                    "action": "edit",
+                    "xpath": ADDRESS + "/entry[@name='web']",
+                    "element": (
+                        '<entry name="web"><fqdn>web.example.com</fqdn></entry>'
+                    ),
+                }
+            ]
+        )
+
+    def test_single_absent(self, connection_mock):
+        connection_mock.get.return_value = GET_ADDRESS
+
+        result = self._run_action(connection_mock, {"name": "web", "state": "absent"})
+
+        assert result["changed"]
+        assert result["deleted"] == ["web"]
+        connection_mock.multi_config.assert_called_once_with(
+            [{"action": "delete", "xpath": ADDRESS + "/entry[@name='web']"}]
+        )
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            {"name": "web", "value": "10.0.0.1", "port": "80"},
+            {"name": "web", "value": "10.0.0.1", "address_type": "other"},
+            {"value": "10.0.0.1"},
+        ],
+    )
+    def test_invalid(self, connection_mock, args):
+        with pytest.raises(AnsibleError):
+            self._run_action(connection_mock, args)
+
+        connection_mock.multi_config.assert_not_called()
@@ -0,0 +1,110 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+
+import pytest
+from ansible_collections.mrichardson03.panos.plugins.action import panos_check
+from ansible_collections.mrichardson03.panos.plugins.action.panos_check import (
+    TimedOutException,
+    backoff,
+    check_autocommit,
+)
+
+from .common.utils import ActionTestCase
+
+JOB = "<job><id>{0}</id><type>{1}</type><result>{2}</result></job>"
+JOBS = "<response status='success'><result>{0}</result></response>"
+
+
+def _jobs(*jobs):
+    return ET.fromstring(JOBS.format("".join(JOB.format(*j) for j in jobs))).findall(
+        ".//job"
+    )
+
+
+@pytest.mark.parametrize(
+    "jobs,expected",
+    [
+        ([], False),
+        ([("1", "Commit", "OK")], True),
+        ([("1", "AutoCom", "PEND")], False),
+        ([("1", "AutoCom", "OK")], True),
+        # Only the newest autocommit matters, whatever the order.
+        ([("2", "AutoCom", "OK"), ("1", "AutoCom", "FAIL")], True),
+        ([("10", "AutoCom", "PEND"), ("9", "AutoCom", "OK")], False),
+    ],
+)
+def test_check_autocommit(jobs, expected):
+    assert check_autocommit(_jobs(*jobs) if jobs else []) is expected
+
+
+def test_backoff():
+    assert [backoff(a, 5, 60) for a in range(6)] == [5, 10, 20, 40, 60, 60]
+    assert backoff(1000, 5, 60) == 60
+
+
+READY = JOBS.format(JOB.format("1", "AutoCom", "OK"))
+NOT_READY = JOBS.format(JOB.format("1", "AutoCom", "PEND"))
+
+
+class TestPanosCheck(ActionTestCase):
+    action = panos_check
+
+    @pytest.fixture(autouse=True)
+    def sleep(self, mocker):
+        return mocker.patch("time.sleep")
+
+    def _check(self, connection_mock, mocker, probes):
+        action = self._action(connection_mock, {})
+        mocker.patch.object(action, "_probe", side_effect=probes)
+
+        action.do_until_success_or_timeout(600, 60, 5)
+
+    def test_reset_when_reachable(self, connection_mock, mocker, sleep):
+        connection_mock.op.side_effect = [NOT_READY, READY]
+
+        self._check(connection_mock, mocker, [False, False, True, True])
+
+        # The wait backs off while the device is down, and starts again from
+        # min_sleep once it is reachable.
+        assert [c[0][0] for c in sleep.call_args_list] == [5, 10, 5]
+        assert connection_mock.op.call_count == 2
+
+    def test_api_when_probe_fails(self, connection_mock, mocker, sleep):
+        connection_mock.op.return_value = READY
+
+        self._check(connection_mock, mocker, [False, False, False])
+
+        # The probe is only a hint, the API is still tried every few attempts.
+        assert sleep.call_count == 2
+        assert connection_mock.op.call_count == 1
+
+    def test_timeout(self, connection_mock, mocker):
+        connection_mock.op.return_value = NOT_READY
+        action = self._action(connection_mock, {})
+        mocker.patch.object(action, "_probe", return_value=True)
+
+        with pytest.raises(TimedOutException):
+            action.do_until_success_or_timeout(0, 60, 5)
+
+    def test_probe_skipped_with_proxy(self, connection_mock, mocker):
+        connection_mock.get_option.side_effect = {
+            "host": "fw",
+            "use_ssl": True,
+            "port": None,
+            "use_proxy": True,
+        }.get
+        probe = mocker.patch.object(panos_check, "probe", return_value=False)
+        action = self._action(connection_mock, {})
+
+        mocker.patch.object(
+            panos_check, "getproxies", return_value={"https": "http://proxy:3128"}
+        )
+        assert action._probe() is True
+        probe.assert_not_called()
+
+        mocker.patch.object(panos_check, "getproxies", return_value={})
+        assert action._probe() is False
+        probe.assert_called_once_with("fw", 443, use_ssl=True)
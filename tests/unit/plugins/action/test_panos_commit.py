@@ -0,0 +1,94 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible_collections.mrichardson03.panos.plugins.action import panos_commit
+from ansible_collections.mrichardson03.panos.plugins.httpapi.panos import (
+    TimedOutException,
+)
+
+from .common.utils import ActionTestCase
+
+CHANGES = "<response status='success'><result>{0}</result></response>"
+COMMIT = "<response status='success'><result><job>5</job></result></response>"
+JOB = (
+    "<response status='success'><result><job><id>5</id><type>Commit</type>"
+    "<result>OK</result></job></result></response>"
+)
+
+
+class TestPanosCommit(ActionTestCase):
+    action = panos_commit
+
+    @pytest.fixture(autouse=True)
+    def device(self, connection_mock):
+        connection_mock.op.return_value = CHANGES.format("yes")
+        connection_mock.commit.return_value = COMMIT
+        connection_mock.poll_for_job.return_value = JOB
+        connection_mock.version.return_value = {"serial": "0001"}
+
+    def test_wait(self, connection_mock):
+        result = self._run_action(connection_mock, {})
+
+        assert result["changed"]
+        assert result["msg"] == "Commit completed."
+        assert result["job_id"] == "5"
+        assert result["stdout_xml"] == JOB
+        connection_mock.poll_for_job.assert_called_once_with(
+            "5", interval=10, timeout=600, min_interval=1
+        )
+
+    def test_no_wait(self, connection_mock):
+        result = self._run_action(connection_mock, {"wait": False})
+
+        assert result["changed"]
+        assert result["msg"] == "Commit started."
+        assert result["job_id"] == "5"
+        assert "stdout_xml" not in result
+        connection_mock.poll_for_job.assert_not_called()
+
+    @pytest.mark.parametrize("wait", [True, False])
+    def test_no_changes(self, connection_mock, wait):
+        connection_mock.op.return_value = CHANGES.format("no")
+
+        result = self._run_action(connection_mock, {"wait": wait})
+
+        assert not result["changed"]
+        assert result["msg"] == "No changes to commit."
+        connection_mock.commit.assert_not_called()
+
+    def test_timeout(self, connection_mock):
+        connection_mock.poll_for_job.side_effect = TimedOutException("timed out")
+
+        result = self._run_action(connection_mock, {"timeout": 30})
+
+        assert result["failed"]
+        assert result["msg"] == "timed out"
+
+    def test_history(self, connection_mock, tmp_path):
+        history_dir = str(tmp_path / "history")
+
+        for _ in range(3):
+            result = self._run_action(connection_mock, {"history_dir": history_dir})
+
+        assert result["msg"] == "Commit completed."
+        assert not result["outlier"]
+
+        # Predictions never lower the timeout below the default.
+        assert connection_mock.poll_for_job.call_args[1]["timeout"] == 600
+
+        history = panos_commit.JobHistory(history_dir, "0001")
+        assert len(history.durations("commit")) == 3
+        assert history.durations("commit-partial") == []
+
+    def test_history_save_failure(self, connection_mock, tmp_path, mocker):
+        history_dir = tmp_path / "history"
+        history_dir.write_text("not a directory")
+        warning = mocker.patch.object(panos_commit.display, "warning")
+
+        result = self._run_action(connection_mock, {"history_dir": str(history_dir)})
+
+        assert "failed" not in result
+        assert result["msg"] == "Commit completed."
+        assert "Unable to save commit history" in warning.call_args[0][0]
@@ -0,0 +1,150 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible_collections.mrichardson03.panos.plugins.action import panos_commit_all
+from ansible_collections.mrichardson03.panos.plugins.httpapi.panos import (
+    TimedOutException,
+)
+
+from .common.utils import ActionTestCase
+
+DEVICE = (
+    "<entry><serial-no>{0}</serial-no><devicename>{1}</devicename>"
+    "<status>{2}</status><result>{3}</result>"
+    "<details><msg><errors><line>{4}</line></errors></msg></details></entry>"
+)
+
+
+def _job(job_id, *devices, **kwargs):
+    return {
+        "id": job_id,
+        "response": (
+            "<response status='success'><result><job><status>FIN</status>"
+            "<devices>{0}</devices></job></result></response>".format(
+                "".join(DEVICE.format(*d) for d in devices)
+            )
+        ),
+        "elapsed": 30.0,
+        "devices": kwargs.get("elapsed", {}),
+    }
+
+
+class TestPanosCommitAll(ActionTestCase):
+    action = panos_commit_all
+
+    @pytest.fixture(autouse=True)
+    def panorama(self, connection_mock):
+        connection_mock.is_panorama.return_value = True
+        connection_mock.commit_all.return_value = ["10", "11"]
+
+    def test_push(self, connection_mock):
+        connection_mock.poll_for_jobs.return_value = [
+            _job(
+                "10",
+                ("0001", "fw1", "FIN", "OK", "Configuration committed"),
+                ("0002", "fw2", "FIN", "OK", "Configuration committed"),
+                elapsed={"0001": 12.0},
+            ),
+            _job("11", ("0003", "fw3", "FIN", "OK", "Configuration committed")),
+        ]
+
+        result = self._run_action(
+            connection_mock, {"device_groups": ["branch", "dc"], "workers": 2}
+        )
+
+        assert result["changed"]
+        assert "failed" not in result
+        assert result["msg"] == "Pushed to 3 firewalls."
+        assert result["jobs"] == ["10", "11"]
+        assert [d["serial"] for d in result["devices"]] == ["0001", "0002", "0003"]
+        assert result["devices"][0] == {
+            "serial": "0001",
+            "name": "fw1",
+            "job_id": "10",
+            "result": "OK",
+            "status": "FIN",
+            "elapsed": 12.0,
+            "messages": ["Configuration committed"],
+        }
+
+        # Firewalls without their own timing get the job's.
+        assert result["devices"][1]["elapsed"] == 30.0
+        assert result["devices"][2]["job_id"] == "11"
+        connection_mock.poll_for_jobs.assert_called_once_with(
+            ["10", "11"], interval=10, timeout=1800, min_interval=1, workers=2
+        )
+
+    def test_partial_failure(self, connection_mock):
+        connection_mock.poll_for_jobs.return_value = [
+            _job(
+                "10",
+                ("0001", "fw1", "FIN", "OK", "Configuration committed"),
+                ("0002", "fw2", "FIN", "FAIL", "Validation error"),
+            ),
+            _job("11", ("0003", "fw3", "FIN", "OK", "Configuration committed")),
+        ]
+
+        result = self._run_action(connection_mock, {"device_groups": ["branch"]})
+
+        # Every firewall is reported, and only the failed one is named.
+        assert result["failed"]
+        assert result["changed"]
+        assert result["msg"] == "Push failed on 0002."
+        assert [d["result"] for d in result["devices"]] == ["OK", "FAIL", "OK"]
+        assert result["devices"][1]["messages"] == ["Validation error"]
+
+    def test_validate(self, connection_mock):
+        connection_mock.poll_for_jobs.return_value = [
+            _job("10", ("0001", "fw1", "FIN", "OK", "Validated"))
+        ]
+        connection_mock.commit_all.return_value = ["10"]
+
+        result = self._run_action(
+            connection_mock, {"templates": ["base"], "validate": True}
+        )
+
+        assert not result["changed"]
+        assert result["msg"] == "Pushed to 1 firewalls."
+
+    def test_nothing_to_push(self, connection_mock):
+        connection_mock.commit_all.return_value = []
+        connection_mock.poll_for_jobs.return_value = []
+
+        result = self._run_action(connection_mock, {"device_groups": ["branch"]})
+
+        assert not result["changed"]
+        assert result["msg"] == "Nothing to push."
+
+    def test_check_mode(self, connection_mock):
+        result = self._run_action(
+            connection_mock, {"device_groups": ["branch"]}, check_mode=True
+        )
+
+        assert result["changed"]
+        connection_mock.commit_all.assert_not_called()
+        connection_mock.poll_for_jobs.assert_not_called()
+
+    def test_timeout(self, connection_mock):
+        connection_mock.poll_for_jobs.side_effect = TimedOutException("timed out")
+
+        result = self._run_action(connection_mock, {"device_groups": ["branch"]})
+
+        assert result["failed"]
+        assert result["msg"] == "timed out"
+
+    def test_not_panorama(self, connection_mock):
+        connection_mock.is_panorama.return_value = False
+
+        result = self._run_action(connection_mock, {"device_groups": ["branch"]})
+
+        assert result["failed"]
+        assert result["msg"] == "panos_commit_all requires a Panorama device."
+        connection_mock.commit_all.assert_not_called()
+
+    def test_required(self, connection_mock):
+        result = self._run_action(connection_mock, {"serials": ["0001"]})
+
+        assert result["failed"]
+        connection_mock.commit_all.assert_not_called()
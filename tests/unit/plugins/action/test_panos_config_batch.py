@@ -0,0 +1,173 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible.errors import AnsibleError
+from ansible_collections.mrichardson03.panos.plugins.action import panos_config_batch
+
+from .common.utils import ActionTestCase
+
+DEVICE = "/config/devices/entry[@name='localhost.localdomain']"
+SYSTEM = DEVICE + "/deviceconfig/system"
+ZONE = DEVICE + "/vsys/entry[@name='vsys1']/zone/entry[@name='trust']"
+
+GET_DEVICE = """
+<response status="success">
+    <result>
+        <entry name="localhost.localdomain">
+            <deviceconfig>
+                <system>
+                    <timezone>UTC</timezone>
+                    <hostname>fw</hostname>
+                </system>
+            </deviceconfig>
+            <vsys>
+                <entry name="vsys1">
+                    <zone>
+                        <entry name="trust">
+                            <network>
+                                <layer3>
+                                    <member>ethernet1/2</member>
+                                </layer3>
+                            </network>
+                        </entry>
+                    </zone>
+                </entry>
+            </vsys>
+        </entry>
+    </result>
+</response>
+"""
+
+TRUST = """
+<entry name="trust">
+    <network>
+        <layer3>
+            <member>ethernet1/2</member>
+        </layer3>
+    </network>
+</entry>
+"""
+
+
+class TestPanosConfigBatch(ActionTestCase):
+    action = panos_config_batch
+
+    @pytest.fixture(autouse=True)
+    def get_device(self, connection_mock):
+        connection_mock.get.return_value = GET_DEVICE
+
+    def test_unchanged(self, connection_mock):
+        result = self._run_action(
+            connection_mock,
+            {
+                "elements": [
+                    {"xpath": SYSTEM, "element": "<timezone>UTC</timezone>"},
+                    {"xpath": ZONE, "element": TRUST},
+                ]
+            },
+        )
+
+        assert not result["changed"]
+        assert [r["changed"] for r in result["results"]] == [False, False]
+        connection_mock.get.assert_called_once_with(DEVICE)
+        connection_mock.multi_config.assert_not_called()
+
+    def test_changed(self, connection_mock):
+        result = self._run_action(
+            connection_mock,
+            {
+                "elements": [
+                    {"xpath": SYSTEM, "element": "<timezone>EST</timezone>"},
+                    {"xpath": ZONE, "element": TRUST},
+                    {
+                        "xpath": ZONE,
+                        "element": TRUST.replace("ethernet1/2", "ethernet1/3"),
+                        "edit": True,
+                    },
+                ],
+                "workers": 2,
+            },
+        )
+
+        assert result["changed"]
+        assert [r["changed"] for r in result["results"]] == [True, False, True]
+        connection_mock.get.assert_called_once_with(DEVICE)
+        connection_mock.multi_config.assert_called_once_with(
+            [
+                {
+                    "action": "set",
+                    "xpath": SYSTEM,
+                    "element": "<timezone>EST</timezone>",
+                },
+                {
+                    "action": "edit",
+                    "xpath": ZONE,
+                    "element": (
+                        '<entry name="trust"><network><layer3>'
+                        "<member>ethernet1/3</member></layer3></network></entry>"
+                    ),
+                },
+            ],
+            workers=2,
+        )
+
+    def test_layers(self, connection_mock):
+        result = self._run_action(
+            connection_mock,
+            {
+                "elements": [
+                    {
+                        "xpath": ZONE,
+                        "element": TRUST.replace("ethernet1/2", "ethernet1/3"),
+                        "layer": 1,
+                    },
+                    {"xpath": SYSTEM, "element": "<timezone>EST</timezone>"},
+                ],
+                "edit": True,
+                "workers": 2,
+            },
+        )
+
+        assert result["changed"]
+        operations = connection_mock.multi_config.call_args[0][0]
+        assert [o.get("layer") for o in operations] == [1, None]
+
+    def test_missing(self, connection_mock):
+        connection_mock.get.return_value = (
+            '<response status="success"><result/></response>'
+        )
+
+        result = self._run_action(
+            connection_mock,
+            {"elements": [{"xpath": SYSTEM, "element": "<timezone>UTC</timezone>"}]},
+        )
+
+        assert result["changed"]
+        connection_mock.get.assert_called_once_with(SYSTEM)
+
+    def test_check_mode(self, connection_mock):
+        result = self._run_action(
+            connection_mock,
+            {"elements": [{"xpath": SYSTEM, "element": "<timezone>EST</timezone>"}]},
+            check_mode=True,
+        )
+
+        assert result["changed"]
+        assert result["results"] == [{"xpath": SYSTEM, "changed": True}]
+        connection_mock.multi_config.assert_not_called()
+
+    def test_no_elements(self, connection_mock):
+        result = self._run_action(connection_mock, {"elements": []})
+
+        assert result == {"changed": False, "results": []}
+        connection_mock.get.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "element",
+        [{"xpath": SYSTEM}, {"xpath": SYSTEM, "element": "<timezone>UTC"}],
+    )
+    def test_invalid(self, connection_mock, element):
+        with pytest.raises(AnsibleError):
+            self._run_action(connection_mock, {"elements": [element]})
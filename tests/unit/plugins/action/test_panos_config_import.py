@@ -0,0 +1,113 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+import pytest
+from ansible.errors import AnsibleActionFail
+from ansible_collections.mrichardson03.panos.plugins.action import panos_config_import
+
+from .common.utils import ActionTestCase
+
+ADDRESS = (
+    "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']"
+    "/address"
+)
+
+CONFIG = "<config><shared/></config>"
+
+
+class TestPanosConfigImport(ActionTestCase):
+    action = panos_config_import
+
+    @pytest.fixture(autouse=True)
+    def staged(self, connection_mock):
+        # Record the staged file, which is removed when the task finishes.
+        staged = {}
+
+        def import_config(path, filename):
+            with open(path) as f:
+                staged.update(path=path, filename=filename, content=f.read())
+
+        connection_mock.import_config.side_effect = import_config
+
+        return staged
+
+    def test_content(self, connection_mock, staged):
+        result = self._run_action(
+            connection_mock, {"content": CONFIG, "to_xpath": ADDRESS}
+        )
+
+        assert result["changed"]
+        assert result["filename"] == "ansible-import.xml"
+        assert result["size"] == len(CONFIG)
+        assert staged["filename"] == "ansible-import.xml"
+        assert staged["content"] == CONFIG
+        assert not os.path.exists(staged["path"])
+        connection_mock.load_config_partial.assert_called_once_with(
+            "ansible-import.xml", ADDRESS, ADDRESS, "merge"
+        )
+
+    def test_src(self, connection_mock, staged, tmp_path, mocker):
+        src = tmp_path / "old-firewall.xml"
+        src.write_text(CONFIG)
+        mocker.patch.object(
+            panos_config_import.ActionModule, "_find_needle", return_value=str(src)
+        )
+
+        result = self._run_action(
+            connection_mock,
+            {
+                "src": "old-firewall.xml",
+                "from_xpath": "/config/shared/address",
+                "to_xpath": ADDRESS,
+                "mode": "replace",
+            },
+        )
+
+        assert result["changed"]
+        assert result["filename"] == "old-firewall.xml"
+        assert staged["path"] == str(src)
+        assert src.exists()
+        connection_mock.load_config_partial.assert_called_once_with(
+            "old-firewall.xml", "/config/shared/address", ADDRESS, "replace"
+        )
+
+    def test_check_mode(self, connection_mock):
+        result = self._run_action(
+            connection_mock,
+            {"content": CONFIG, "filename": "big.xml", "to_xpath": ADDRESS},
+            check_mode=True,
+        )
+
+        assert result["changed"]
+        assert result["filename"] == "big.xml"
+        connection_mock.import_config.assert_not_called()
+        connection_mock.load_config_partial.assert_not_called()
+
+    def test_connection_error(self, connection_mock, staged):
+        connection_mock.load_config_partial.side_effect = ConnectionError("failed")
+
+        result = self._run_action(
+            connection_mock, {"content": CONFIG, "to_xpath": ADDRESS}
+        )
+
+        assert result["failed"]
+        assert result["msg"] == "failed"
+        assert not os.path.exists(staged["path"])
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            {"to_xpath": ADDRESS},
+            {"src": "config.xml", "content": CONFIG, "to_xpath": ADDRESS},
+            {"content": CONFIG},
+            {"content": CONFIG, "to_xpath": ADDRESS, "mode": "overwrite"},
+        ],
+    )
+    def test_invalid(self, connection_mock, args):
+        with pytest.raises(AnsibleActionFail):
+            self._run_action(connection_mock, args)
+
+        connection_mock.import_config.assert_not_called()
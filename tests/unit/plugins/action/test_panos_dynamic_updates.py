@@ -0,0 +1,146 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import re
+
+import pytest
+from ansible_collections.mrichardson03.panos.plugins.action import panos_dynamic_updates
+from ansible_collections.mrichardson03.panos.plugins.action.panos_dynamic_updates import (
+    check_cmd,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.cache import (
+    ResultCache,
+)
+from ansible_collections.mrichardson03.panos.plugins.module_utils.job_history import (
+    JobHistory,
+)
+
+from .common.utils import ActionTestCase
+
+UPDATES = {
+    "content": ("8500-7000", "panupv2-all-contents-8500-7000", "1"),
+    "anti-virus": ("4000-4500", "panup-all-antivirus-4000-4500", "2"),
+}
+
+CHECK = (
+    "<response status='success'><result><content-updates>"
+    "<entry><version>{0}</version><current>no</current>"
+    "<filename>{1}</filename><sha256>{2}</sha256></entry>"
+    "</content-updates></result></response>"
+)
+
+JOB = "<response status='success'><result><job>{0}</job></result></response>"
+
+JOB_OK = (
+    "<response status='success'><result><job><status>FIN</status>"
+    "<result>OK</result></job></result></response>"
+)
+
+IMAGE = b"image"
+
+
+def check_response(content_type):
+    version, filename, _ = UPDATES[content_type]
+
+    return CHECK.format(version, filename, hashlib.sha256(IMAGE).hexdigest())
+
+
+class TestPanosDynamicUpdates(ActionTestCase):
+    action = panos_dynamic_updates
+
+    @pytest.fixture(autouse=True)
+    def device(self, connection_mock):
+        self.installed = []
+
+        def op(cmd, is_xml=True, **kwargs):
+            content_type = re.match(r"<request><([\w-]+)>", cmd).group(1)
+
+            job_id = UPDATES[content_type][2]
+
+            if "<check/>" in cmd:
+                return check_response(content_type)
+            if "<download>" in cmd:
+                return JOB.format(job_id)
+
+            self.installed.append(content_type)
+            assert kwargs["poll"]
+            return JOB_OK
+
+        connection_mock.op.side_effect = op
+        connection_mock.version.return_value = {"serial": "0001"}
+        connection_mock.poll_for_jobs.side_effect = lambda job_ids, **kwargs: [
+            {"id": job_id, "response": JOB_OK, "elapsed": 1.0} for job_id in job_ids
+        ]
+
+    def test_parallel_download(self, connection_mock):
+        result = self._run_action(
+            connection_mock, {"content_type": ["anti-virus", "content"]}
+        )
+
+        assert result["changed"]
+        assert result["content"] == "8500-7000"
+        assert result["anti-virus"] == "4000-4500"
+
+        # Both downloads are started, then waited for together.
+        connection_mock.poll_for_jobs.assert_called_once_with(
+            ["2", "1"], interval=5, timeout=600, min_interval=1
+        )
+
+        # Applications are installed before the threat signatures.
+        assert self.installed == ["content", "anti-virus"]
+        connection_mock.import_file.assert_not_called()
+
+    def test_download_timeout_from_history(self, connection_mock, tmp_path):
+        history_dir = str(tmp_path / "history")
+        history = JobHistory(history_dir, "0001")
+        history.jobs["anti-virus-download"] = [{"duration": 400}] * 3
+        history.save()
+
+        self._run_action(
+            connection_mock,
+            {"content_type": ["content", "anti-virus"], "history_dir": history_dir},
+        )
+
+        assert connection_mock.poll_for_jobs.call_args[1]["timeout"] == 1200
+        assert len(JobHistory(history_dir, "0001").durations("content-download")) == 1
+
+    def test_image_dir(self, connection_mock, tmp_path):
+        image = tmp_path / UPDATES["content"][1]
+        image.write_bytes(IMAGE)
+
+        result = self._run_action(
+            connection_mock, {"content_type": ["content"], "image_dir": str(tmp_path)}
+        )
+
+        assert result["changed"]
+        connection_mock.import_file.assert_called_once_with("content", str(image))
+        connection_mock.poll_for_jobs.assert_not_called()
+        assert "<file>{0}</file>".format(UPDATES["content"][1]) in (
+            connection_mock.op.call_args[0][0]
+        )
+
+    def test_cache_invalidated(self, connection_mock, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        cache = ResultCache(cache_dir, "0001", 60)
+        cache.set(check_cmd("content"), check_response("content"))
+
+        result = self._run_action(
+            connection_mock,
+            {"content_type": ["content"], "cache_ttl": 60, "cache_dir": cache_dir},
+        )
+
+        # The cached check was used, and dropped once the update was installed.
+        assert result["cached"] is True
+        assert self.installed == ["content"]
+        assert cache.get(check_cmd("content")) is None
+
+    def test_check_mode(self, connection_mock):
+        result = self._run_action(
+            connection_mock, {"content_type": ["content"]}, check_mode=True
+        )
+
+        assert result["changed"]
+        connection_mock.poll_for_jobs.assert_not_called()
+        assert self.installed == []
@@ -0,0 +1,71 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.mrichardson03.panos.plugins.action import panos_job_wait
+from ansible_collections.mrichardson03.panos.plugins.httpapi.panos import (
+    TimedOutException,
+)
+
+from .common.utils import ActionTestCase
+
+JOB = (
+    "<response status='success'><result><job><id>{0}</id><type>{1}</type>"
+    "<result>{2}</result><details><line>{3}</line></details></job></result>"
+    "</response>"
+)
+
+
+def _job(job_id, job_type="Commit", result="OK", details="Done"):
+    return {
+        "id": job_id,
+        "response": JOB.format(job_id, job_type, result, details),
+        "elapsed": 1.5,
+    }
+
+
+class TestPanosJobWait(ActionTestCase):
+    action = panos_job_wait
+
+    def test_wait(self, connection_mock):
+        connection_mock.poll_for_jobs.return_value = [
+            _job("5"),
+            _job("6", "Downld"),
+        ]
+
+        result = self._run_action(
+            connection_mock, {"job_ids": ["5", 6, None, ""], "workers": 2}
+        )
+
+        assert not result["changed"]
+        assert "failed" not in result
+        assert result["msg"] == "2 job(s) completed."
+        assert result["jobs"][0] == {
+            "id": "5",
+            "type": "Commit",
+            "result": "OK",
+            "details": ["Done"],
+            "elapsed": 1.5,
+        }
+        connection_mock.poll_for_jobs.assert_called_once_with(
+            ["5", "6"], interval=10, timeout=600, min_interval=1, workers=2
+        )
+
+    def test_failed_job(self, connection_mock):
+        connection_mock.poll_for_jobs.return_value = [
+            _job("5"),
+            _job("6", result="FAIL"),
+        ]
+
+        result = self._run_action(connection_mock, {"job_ids": ["5", "6"]})
+
+        assert result["failed"]
+        assert result["msg"] == "Job(s) 6 failed."
+
+    def test_timeout(self, connection_mock):
+        connection_mock.poll_for_jobs.side_effect = TimedOutException("timed out")
+
+        result = self._run_action(connection_mock, {"job_ids": ["5"], "timeout": 1})
+
+        assert result["failed"]
+        assert result["msg"] == "timed out"
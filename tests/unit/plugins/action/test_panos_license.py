@@ -0,0 +1,122 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest import mock
+
+import pytest
+from ansible.errors import AnsibleError
+from ansible_collections.mrichardson03.panos.plugins.action import panos_license
+
+from .common.utils import ActionTestCase
+
+LICENSES = (
+    "<response status='success'><result><licenses>"
+    "<entry><feature>PA-VM</feature></entry>"
+    "<entry><feature>Threat Prevention</feature></entry>"
+    "</licenses></result></response>"
+)
+
+FETCH = (
+    "<response status='success'><result>VM Device License installed</result></response>"
+)
+
+PROVISIONED = (
+    "<response status='error'><msg>Authcode already provisioned</msg></response>"
+)
+
+
+class TestPanosLicense(ActionTestCase):
+    action = panos_license
+
+    @pytest.fixture(autouse=True)
+    def sleep(self, mocker):
+        return mocker.patch("time.sleep")
+
+    @pytest.fixture
+    def check(self):
+        return mock.Mock()
+
+    def _license(self, connection_mock, check, args):
+        action = self._action(connection_mock, args)
+        action._shared_loader_obj = mock.Mock()
+        action._shared_loader_obj.action_loader.get.return_value = check
+        self.action_loader = action._shared_loader_obj.action_loader
+
+        return action.run(task_vars={})
+
+    def _op(self, fetch):
+        def op(cmd, **kwargs):
+            return LICENSES if cmd == "request license info" else fetch
+
+        return op
+
+    def test_activate(self, connection_mock, check):
+        connection_mock.op.side_effect = self._op(FETCH)
+        connection_mock.version.side_effect = [
+            {"serial": "0001"},
+            ConnectionError("down"),
+            {"serial": "0001"},
+        ]
+
+        result = self._license(
+            connection_mock, check, {"authcode": "I1234567", "timeout": 900}
+        )
+
+        assert result["changed"]
+        assert result["restarted"] is True
+        assert result["serial"] == "0001"
+        assert [e["feature"] for e in result["licenses"]] == [
+            "PA-VM",
+            "Threat Prevention",
+        ]
+        assert sorted(result["phases"]) == ["activate", "ready", "restart"]
+
+        # panos_check waits for the autocommit after the restart.
+        check.run.assert_called_once()
+        assert self.action_loader.get.call_args[0][0] == (
+            "mrichardson03.panos.panos_check"
+        )
+        assert self.action_loader.get.call_args[1]["task"].args == {"timeout": 900}
+
+    def test_already_provisioned(self, connection_mock, check):
+        connection_mock.op.side_effect = self._op(PROVISIONED)
+        connection_mock.version.return_value = {"serial": "0001"}
+
+        result = self._license(connection_mock, check, {"authcode": "I1234567"})
+
+        assert not result.get("changed")
+        assert list(result["phases"]) == ["activate"]
+        check.run.assert_not_called()
+
+    def test_restart_timeout(self, connection_mock, check):
+        connection_mock.op.side_effect = self._op(FETCH)
+        connection_mock.version.return_value = {"serial": "0001"}
+
+        result = self._license(
+            connection_mock, check, {"authcode": "I1234567", "restart_timeout": 0}
+        )
+
+        # The device never went down, readiness is still checked.
+        assert result["changed"]
+        assert result["restarted"] is False
+        check.run.assert_called_once()
+
+    def test_not_ready_after_restart(self, connection_mock, check):
+        connection_mock.op.side_effect = self._op(FETCH)
+        connection_mock.version.side_effect = [ConnectionError("down")]
+        check.run.side_effect = AnsibleError("Timeout waiting for autocommit.")
+
+        with pytest.raises(AnsibleError, match="autocommit"):
+            self._license(connection_mock, check, {"authcode": "I1234567"})
+
+    def test_no_authcode(self, connection_mock, check):
+        connection_mock.op.side_effect = self._op(FETCH)
+        connection_mock.version.return_value = {"serial": "0001"}
+
+        result = self._license(connection_mock, check, {})
+
+        assert not result.get("changed")
+        assert result["phases"] == {}
+        assert len(result["licenses"]) == 2
+        connection_mock.op.assert_called_once_with("request license info", is_xml=False)
@@ -0,0 +1,100 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible.errors import AnsibleActionFail
+from ansible_collections.mrichardson03.panos.plugins.action.panos_snippet_group import (
+    group_xpaths,
+    is_template,
+    snippet_layers,
+    split_xpath,
+)
+
+VSYS = "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']"
+DEVICE = "/config/devices/entry[@name='localhost.localdomain']"
+
+
+def test_is_template():
+    assert is_template("<hostname>{{ hostname }}</hostname>")
+    assert is_template("{% if x %}<x/>{% endif %}")
+    assert not is_template("<timezone>UTC</timezone>")
+    assert not is_template(None)
+
+
+def test_split_xpath():
+    assert split_xpath(
+        DEVICE + "/network/interface/ethernet/entry[@name='ethernet1/1']"
+    ) == [
+        "config",
+        "devices",
+        "entry[@name='localhost.localdomain']",
+        "network",
+        "interface",
+        "ethernet",
+        "entry[@name='ethernet1/1']",
+    ]
+
+
+def test_group_xpaths():
+    xpaths = [
+        VSYS + "/address/entry[@name='a']",
+        VSYS + "/address/entry[@name='b']",
+        VSYS + "/address",
+        DEVICE + "/deviceconfig/system",
+        DEVICE + "/deviceconfig/system/login-banner",
+        "/config/shared/log-settings/syslog/entry[@name='s']",
+    ]
+
+    assert group_xpaths(xpaths) == {
+        VSYS
+        + "/address": {
+            VSYS + "/address/entry[@name='a']": "./entry[@name='a']",
+            VSYS + "/address/entry[@name='b']": "./entry[@name='b']",
+            VSYS + "/address": ".",
+        },
+        DEVICE
+        + "/deviceconfig/system": {
+            DEVICE + "/deviceconfig/system": ".",
+            DEVICE + "/deviceconfig/system/login-banner": "./login-banner",
+        },
+        "/config/shared/log-settings/syslog": {
+            "/config/shared/log-settings/syslog/entry[@name='s']": "./entry[@name='s']",
+        },
+    }
+
+
+def _snippet(name, xpath, element="", depends=None):
+    return {"name": name, "xpath": xpath, "element": element, "depends": depends}
+
+
+def test_snippet_layers():
+    snippets = [
+        _snippet(
+            "tag", VSYS + "/tag", "<entry name='web'><color>color1</color></entry>"
+        ),
+        _snippet("syslog", "/config/shared/log-settings/syslog/entry[@name='s']"),
+        _snippet(
+            "address",
+            VSYS + "/address/entry[@name='a']",
+            "<entry name='a'><tag><member>web</member></tag></entry>",
+        ),
+        _snippet("profile", "/config/shared/log-settings/profiles", depends=["tag"]),
+        _snippet("syslog-2", "/config/shared/log-settings/syslog/entry[@name='s']"),
+    ]
+
+    assert snippet_layers(snippets) == [0, 0, 1, 1, 1]
+
+
+@pytest.mark.parametrize(
+    "depends",
+    [["missing"], ["two"]],
+)
+def test_snippet_layers_invalid(depends):
+    snippets = [
+        _snippet("one", "/config/shared/tag", depends=depends),
+        _snippet("two", "/config/shared/address", depends=["one"]),
+    ]
+
+    with pytest.raises(AnsibleActionFail):
+        snippet_layers(snippets)
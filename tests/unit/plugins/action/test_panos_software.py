@@ -0,0 +1,71 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible.errors import AnsibleError
+from ansible_collections.mrichardson03.panos.plugins.action.panos_software import (
+    PanOSVersion,
+    plan_upgrade,
+    required_images,
+)
+
+AVAILABLE = [
+    PanOSVersion(v)
+    for v in [
+        "10.1.3",
+        "10.1.0",
+        "10.0.8-h4",
+        "10.0.0",
+        "9.1.12",
+        "9.1.0",
+        "9.0.16",
+        "9.0.0",
+    ]
+]
+
+
+def test_version_ordering():
+    assert PanOSVersion("9.1.10") > PanOSVersion("9.1.9")
+    assert PanOSVersion("10.0.8-h4") > PanOSVersion("10.0.8")
+    assert PanOSVersion("10.0.8-h4") < PanOSVersion("10.0.9")
+    assert max(AVAILABLE) == PanOSVersion("10.1.3")
+    assert PanOSVersion("10.1.3").base == PanOSVersion("10.1.0")
+
+
+@pytest.mark.parametrize(
+    "current,target,expected",
+    [
+        ("9.0.16", "9.0.17", ["9.0.17"]),
+        ("9.0.16", "9.1.12", ["9.1.12"]),
+        ("8.1.20", "10.1.3", ["9.0.0", "9.1.0", "10.0.0", "10.1.3"]),
+        ("7.1.0", "10.1.3", None),
+        ("10.1.3", "9.1.12", None),
+        ("9.0.16", "10.1.3", ["9.1.0", "10.0.0", "10.1.3"]),
+        ("9.0.16", "10.0.8-h4", ["9.1.0", "10.0.8-h4"]),
+        ("9.1.12", "10.1.3", ["10.0.0", "10.1.3"]),
+        ("9.1.12", "10.0.8-h4", ["10.0.8-h4"]),
+    ],
+)
+def test_plan_upgrade(current, target, expected):
+    if expected is None:
+        with pytest.raises(AnsibleError):
+            plan_upgrade(PanOSVersion(current), PanOSVersion(target), AVAILABLE)
+    else:
+        path = plan_upgrade(PanOSVersion(current), PanOSVersion(target), AVAILABLE)
+
+        assert [str(v) for v in path] == expected
+
+
+def test_required_images():
+    path = [PanOSVersion("10.0.0"), PanOSVersion("10.1.3")]
+
+    assert [str(v) for v in required_images(PanOSVersion("9.0.16"), path)] == [
+        "10.0.0",
+        "10.1.0",
+        "10.1.3",
+    ]
+    assert [
+        str(v)
+        for v in required_images(PanOSVersion("10.1.0"), [PanOSVersion("10.1.3")])
+    ] == ["10.1.3"]
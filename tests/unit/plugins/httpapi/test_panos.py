@@ -12,7 +12,10 @@ from ansible.module_utils.six.moves import urllib
 from ansible.module_utils.six.moves.urllib.error import HTTPError
 from ansible_collections.mrichardson03.panos.plugins.httpapi.panos import (
     HttpApi,
+    MultipartFile,
     PanOSAPIError,
+    TimedOutException,
+    next_poll_interval,
 )
 
 GOOD_KEYGEN = """
@@ -35,11 +38,59 @@ VERSION = """
 """
 
 
+@pytest.mark.parametrize(
+    "progress,elapsed,expected",
+    [
+        # No progress yet, interval grows with elapsed time.
+        (None, 0, 1),
+        ("0", 20, 5),
+        ("0", 100, 10),
+        # Halfway done after 10 seconds, check again in 5.
+        ("50", 10, 5),
+        # Nearly done, use the minimum.
+        ("99", 10, 1),
+        # Barely started after a long time, use the maximum.
+        ("5", 60, 10),
+        # Finished jobs report a timestamp instead of a percentage.
+        ("2021/05/04 10:00:00", 4, 1),
+    ],
+)
+def test_next_poll_interval(progress, elapsed, expected):
+    assert next_poll_interval(progress, elapsed, 1, 10) == expected
+
+
+@pytest.mark.parametrize("size", [-1, 1, 7, 4096])
+def test_multipart_file(tmp_path, size):
+    path = tmp_path / "PanOS_vm-10.1.3"
+    path.write_bytes(b"x" * 1000)
+
+    body = MultipartFile(str(path))
+    chunks = []
+
+    while True:
+        chunk = body.read(size)
+
+        if not chunk:
+            break
+
+        assert size < 0 or len(chunk) <= size
+        chunks.append(chunk)
+
+    body.close()
+    data = b"".join(chunks)
+
+    assert len(data) == len(body)
+    assert body.content_type.endswith(body.boundary)
+    assert b'filename="PanOS_vm-10.1.3"' in data
+    assert b"\r\n" + b"x" * 1000 + b"\r\n--" in data
+    assert data.endswith("--{0}--\r\n".format(body.boundary).encode())
+
+
 class FakeHttpApiPlugin(HttpApi):
     def __init__(self, connection):
         super().__init__(connection)
 
-        self.hostvars = {"api_key": None}
+        self.hostvars = {"api_key": None, "target": None}
 
     def get_option(self, var):
         return self.hostvars[var]
@@ -244,6 +295,240 @@ class TestPanosHttpApi:
 
         mock_send_request.assert_called_once_with(data)
 
+    @patch.object(HttpApi, "api_key")
+    @patch.object(HttpApi, "send_request")
+    def test_commit_all(self, mock_send_request, mock_api_key):
+        mock_send_request.side_effect = [
+            (
+                200,
+                "<response status='success'><result><job>5</job></result></response>",
+            ),
+            (200, "<response status='success'><msg>No changes</msg></response>"),
+            (
+                200,
+                "<response status='success'><result><job>6</job></result></response>",
+            ),
+        ]
+        mock_api_key.return_value = "foo"
+
+        job_ids = self.plugin.commit_all(
+            device_groups=["dg1", "dg2"],
+            templates=["tmpl"],
+            serials=["0001"],
+            description="push",
+            include_template=True,
+        )
+
+        def cmd(data):
+            return urllib.parse.parse_qs(data)["cmd"][0]
+
+        calls = mock_send_request.call_args_list
+
+        assert job_ids == ["5", "6"]
+        assert len(calls) == 3
+        assert urllib.parse.parse_qs(calls[0][0][0])["action"] == ["all"]
+        assert cmd(calls[0][0][0]) == (
+            '<commit-all><shared-policy><device-group><entry name="dg1">'
+            '<devices><entry name="0001" /></devices></entry></device-group>'
+            "<include-template>yes</include-template>"
+            "<description>push</description></shared-policy></commit-all>"
+        )
+        assert cmd(calls[2][0][0]) == (
+            "<commit-all><template><name>tmpl</name>"
+            "<device><member>0001</member></device>"
+            "<description>push</description></template></commit-all>"
+        )
+
+    @pytest.mark.parametrize("max_size,requests", [(int(4.5e6), 1), (200, 2)])
+    @patch.object(HttpApi, "api_key")
+    @patch.object(HttpApi, "send_request")
+    def test_multi_config(self, mock_send_request, mock_api_key, max_size, requests):
+        mock_send_request.return_value = (200, "<response status='success'/>")
+        mock_api_key.return_value = "foo"
+
+        operations = [
+            {
+                "action": "set",
+                "xpath": "/config/shared/address",
+                "element": "<entry name='a'/><entry name='b'/>",
+            },
+            {
+                "action": "edit",
+                "xpath": "/config/shared/tag/entry[@name='t']",
+                "element": "<entry name='t'><color>color1</color></entry>",
+            },
+        ]
+
+        responses = self.plugin.multi_config(operations, max_size=max_size)
+
+        elements = [
+            urllib.parse.parse_qs(c[0][0])["element"][0]
+            for c in mock_send_request.call_args_list
+        ]
+
+        assert len(responses) == requests
+        assert len(elements) == requests
+        assert "".join(elements).replace("</multi-config><multi-config>", "") == (
+            "<multi-config>"
+            '<set id="1" xpath="/config/shared/address">'
+            '<entry name="a" /><entry name="b" /></set>'
+            '<edit id="2" xpath="/config/shared/tag/entry[@name=\'t\']">'
+            '<entry name="t"><color>color1</color></entry></edit>'
+            "</multi-config>"
+        )
+
+    @patch.object(HttpApi, "api_key")
+    @patch.object(HttpApi, "send_request")
+    def test_multi_config_layers(self, mock_send_request, mock_api_key):
+        mock_send_request.return_value = (200, "<response status='success'/>")
+        mock_api_key.return_value = "foo"
+
+        operations = [
+            {"action": "set", "xpath": "/config/shared/tag", "element": "<a/>"},
+            {"action": "set", "xpath": "/config/shared/tag", "element": "<b/>"},
+            {
+                "action": "set",
+                "xpath": "/config/shared/address",
+                "element": "<c/>",
+                "layer": 1,
+            },
+        ]
+
+        responses = self.plugin.multi_config(operations, workers=2)
+
+        elements = sorted(
+            urllib.parse.parse_qs(c[0][0])["element"][0]
+            for c in mock_send_request.call_args_list[:2]
+        )
+        last = urllib.parse.parse_qs(mock_send_request.call_args_list[2][0][0])
+
+        assert len(responses) == 3
+        assert ["<a />" in elements[0], "<b />" in elements[1]] == [True, True]
+        assert "<c />" in last["element"][0]
+
+    @patch.object(HttpApi, "api_key")
+    def test_import_file(self, mock_api_key, tmp_path):
+        mock_api_key.return_value = "foo"
+        path = tmp_path / "panupv2-all-contents-8500-7000"
+        path.write_bytes(b"content")
+
+        def send(path, data, method, headers):
+            assert int(headers["Content-Length"]) == len(data.read())
+            return self._send_response(200, "<response status='success'/>")
+
+        self.connection_mock.send.side_effect = send
+
+        self.plugin.import_file("content", str(path))
+
+        url = self.connection_mock.send.call_args[0][0]
+        assert url.startswith("/api/?")
+        assert urllib.parse.parse_qs(url[len("/api/?") :]) == {
+            "type": ["import"],
+            "category": ["content"],
+            "key": ["foo"],
+        }
+
+    @pytest.mark.parametrize("option", [None, "0002"])
+    @patch.object(HttpApi, "api_key")
+    def test_target(self, mock_api_key, option):
+        mock_api_key.return_value = "foo"
+        self.plugin.set_option("target", option)
+        self.connection_mock.send.return_value = self._send_response(
+            200, "<response status='success'><result/></response>"
+        )
+
+        def target():
+            data = self.connection_mock.send.call_args[0][1]
+            return urllib.parse.parse_qs(data).get("target")
+
+        self.plugin.op("<show/>")
+        assert target() == ([option] if option else None)
+
+        self.plugin.proxy("0001", "op", "<show/>")
+        assert target() == ["0001"]
+
+        # The target only applies inside the proxied call.
+        self.plugin.op("<show/>")
+        assert target() == ([option] if option else None)
+
+        with pytest.raises(ConnectionError):
+            self.plugin.proxy("0001", "_parallel", None, [])
+
+    @pytest.mark.parametrize(
+        "method,args",
+        [
+            ("op_batch", [["<show/>", "<show/>", "<show/>"]]),
+            ("poll_for_jobs", [["1", "2"]]),
+        ],
+    )
+    @patch.object(HttpApi, "api_key")
+    def test_proxy_workers(self, mock_api_key, method, args):
+        mock_api_key.return_value = "foo"
+        targets = []
+
+        def send(path, data, **kwargs):
+            targets.append(urllib.parse.parse_qs(data).get("target"))
+            return self._send_response(
+                200,
+                "<response status='success'><result><job><status>FIN</status>"
+                "</job></result></response>",
+            )
+
+        self.connection_mock.send.side_effect = send
+
+        self.plugin.proxy("0001", method, *args, workers=3)
+
+        assert len(targets) == len(args[0])
+        assert targets == [["0001"]] * len(args[0])
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    @patch.object(HttpApi, "op")
+    def test_fan_out(self, mock_op, workers):
+        def op(cmd, is_xml=True):
+            target = self.plugin._current_target()
+            if target == "bad":
+                raise ConnectionError("Timed out")
+            return "<response>{0}</response>".format(target)
+
+        mock_op.side_effect = op
+
+        results = self.plugin.fan_out(
+            ["0001", "bad", "0003"], "op", args=["<show/>"], workers=workers
+        )
+
+        assert [r["target"] for r in results] == ["0001", "bad", "0003"]
+        assert [r["result"] for r in results] == [
+            "<response>0001</response>",
+            None,
+            "<response>0003</response>",
+        ]
+        assert results[1]["msg"] == "Timed out"
+
+    @patch.object(HttpApi, "import_file")
+    def test_import_config(self, mock_import_file):
+        self.plugin.import_config("/tmp/running.xml", "candidate.xml")
+
+        mock_import_file.assert_called_once_with(
+            "configuration", "/tmp/running.xml", "candidate.xml"
+        )
+
+    @patch.object(HttpApi, "op")
+    def test_load_config_partial(self, mock_op):
+        self.plugin.load_config_partial(
+            "candidate.xml",
+            "/config/shared/address",
+            "/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']/address",
+            mode="replace",
+        )
+
+        mock_op.assert_called_once_with(
+            "<load><config><partial><from>candidate.xml</from>"
+            "<from-xpath>/config/shared/address</from-xpath>"
+            "<to-xpath>/config/devices/entry[@name='localhost.localdomain']"
+            "/vsys/entry[@name='vsys1']/address</to-xpath>"
+            "<mode>replace</mode></partial></config></load>"
+        )
+
     @pytest.mark.parametrize(
         "response,validate",
         [
@@ -300,6 +585,138 @@ class TestPanosHttpApi:
         assert mock_send_request.call_args_list[0] == call(data)
         assert mock_send_request.call_count == 3
 
+    @pytest.mark.parametrize("workers", [1, 4])
+    @patch.object(HttpApi, "api_key")
+    @patch.object(HttpApi, "send_request")
+    def test_op_batch(self, mock_send_request, mock_api_key, workers):
+        def send_request(data):
+            if "bad" in data:
+                return (200, "<response status='error' code='17'/>")
+            return (200, "<response status='success'><result/></response>")
+
+        mock_send_request.side_effect = send_request
+        mock_api_key.return_value = "foo"
+
+        cmds = ["<show><one/></show>", "<show><bad/></show>", "<show><three/></show>"]
+
+        results = self.plugin.op_batch(cmds, workers=workers)
+
+        assert [r["cmd"] for r in results] == cmds
+        assert [r["msg"] is None for r in results] == [True, False, True]
+        assert "Invalid Command" in results[1]["msg"]
+        assert mock_send_request.call_count == 3
+
+    @patch.object(HttpApi, "api_key")
+    @patch.object(HttpApi, "send_request")
+    def test_log(self, mock_send_request, mock_api_key):
+        mock_send_request.side_effect = [
+            (
+                200,
+                "<response status='success'><result><job>7</job></result></response>",
+            ),
+            (
+                200,
+                "<response status='success'><result><job><status>ACT</status></job></result></response>",
+            ),
+            (
+                200,
+                (
+                    "<response status='success'><result><job><status>FIN</status></job>"
+                    "<log><logs count='1'><entry logid='1'/></logs></log></result></response>"
+                ),
+            ),
+        ]
+        mock_api_key.return_value = "foo"
+
+        params = {
+            "type": "log",
+            "key": "foo",
+            "log-type": "threat",
+            "query": "(severity eq high)",
+            "nlogs": 100,
+            "skip": 200,
+        }
+
+        data = urllib.parse.urlencode(params)
+
+        response = self.plugin.log(
+            "threat", query="(severity eq high)", nlogs=100, skip=200, poll_interval=0
+        )
+
+        assert mock_send_request.call_args_list[0] == call(data)
+        assert mock_send_request.call_args_list[1] == call(
+            urllib.parse.urlencode(
+                {"type": "log", "key": "foo", "action": "get", "job-id": "7"}
+            )
+        )
+        assert mock_send_request.call_count == 3
+        assert "logid='1'" in response
+
+    @patch("time.sleep")
+    @patch.object(HttpApi, "op")
+    def test_poll_for_job_adaptive(self, mock_op, mock_sleep):
+        mock_op.side_effect = [
+            "<response><result><job><status>ACT</status><progress>0</progress></job></result></response>",
+            "<response><result><job><status>FIN</status></job></result></response>",
+        ]
+
+        self.plugin.poll_for_job(1, interval=10, min_interval=1)
+
+        assert mock_op.call_count == 2
+        assert mock_sleep.call_args_list == [call(1)]
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    @patch("time.sleep")
+    @patch.object(HttpApi, "op")
+    def test_poll_for_jobs(self, mock_op, mock_sleep, workers):
+        responses = {
+            "1": [
+                (
+                    "<response><result><job><status>ACT</status><progress>50</progress>"
+                    "<devices><entry><serial-no>a</serial-no><result>OK</result></entry>"
+                    "<entry><serial-no>b</serial-no><result>PEND</result></entry>"
+                    "</devices></job></result></response>"
+                ),
+                (
+                    "<response><result><job><status>FIN</status>"
+                    "<devices><entry><serial-no>a</serial-no><result>OK</result></entry>"
+                    "<entry><serial-no>b</serial-no><result>FAIL</result></entry>"
+                    "</devices></job></result></response>"
+                ),
+            ],
+            "2": [
+                "<response><result><job><status>FIN</status></job></result></response>"
+            ],
+        }
+
+        def op(cmd, is_xml=True):
+            job_id = cmd.split("<id>")[1].split("</id>")[0]
+            return responses[job_id].pop(0)
+
+        mock_op.side_effect = op
+
+        jobs = self.plugin.poll_for_jobs(
+            [1, 2], interval=10, min_interval=1, workers=workers
+        )
+
+        assert [j["id"] for j in jobs] == ["1", "2"]
+        assert sorted(jobs[0]["devices"]) == ["a", "b"]
+        assert jobs[0]["devices"]["a"] <= jobs[0]["devices"]["b"]
+        assert "FAIL" in jobs[0]["response"]
+        assert jobs[1]["devices"] == {}
+        assert mock_op.call_count == 3
+        assert mock_sleep.call_count == 1
+
+    @patch("time.sleep")
+    @patch.object(HttpApi, "op")
+    def test_poll_for_jobs_timeout(self, mock_op, mock_sleep):
+        mock_op.return_value = (
+            "<response><result><job><status>ACT</status></job></result></response>"
+        )
+
+        with pytest.raises(TimedOutException):
+            self.plugin.poll_for_jobs([1], interval=1, timeout=0.01)
+
     @patch.object(HttpApi, "api_key")
     @patch.object(HttpApi, "send_request")
     def test_poll_for_job_connection_error(self, mock_send_request, mock_api_key):
@@ -0,0 +1,92 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import datetime
+import os
+from unittest import mock
+
+from ansible_collections.mrichardson03.panos.plugins.module_utils.cache import (
+    ResultCache,
+    cached_op,
+    cached_parse,
+)
+
+
+def test_result_cache(tmp_path):
+    cache = ResultCache(str(tmp_path), "0001", 60)
+
+    assert cache.get("cmd") is None
+
+    cache.set("cmd", "<response/>")
+
+    assert ResultCache(str(tmp_path), "0001", 60).get("cmd") == "<response/>"
+    assert ResultCache(str(tmp_path), "0002", 60).get("cmd") is None
+
+    cache.invalidate("cmd")
+
+    assert cache.get("cmd") is None
+
+
+def test_result_cache_stale(tmp_path):
+    cache = ResultCache(str(tmp_path), "0001", 60)
+
+    with mock.patch("time.time", return_value=1000):
+        cache.set("cmd", "<response/>")
+
+    with mock.patch("time.time", return_value=1059):
+        assert cache.get("cmd") == "<response/>"
+
+    with mock.patch("time.time", return_value=1061):
+        assert cache.get("cmd") is None
+
+
+def test_cached_op(tmp_path):
+    connection = mock.Mock()
+    connection.op.return_value = "<response/>"
+    cache = ResultCache(str(tmp_path), "0001", 60)
+
+    assert cached_op(connection, "cmd", cache) == ("<response/>", False)
+    assert cached_op(connection, "cmd", cache) == ("<response/>", True)
+    assert connection.op.call_count == 1
+
+    assert cached_op(connection, "cmd", cache, refresh=True) == ("<response/>", False)
+    assert cached_op(connection, "cmd") == ("<response/>", False)
+    assert connection.op.call_count == 3
+
+
+def test_cached_parse(tmp_path):
+    src = tmp_path / "snippets.yaml"
+    src.write_text("one")
+    parse = mock.Mock(side_effect=lambda data: data.decode().upper())
+    cache_dir = str(tmp_path / "cache")
+
+    assert cached_parse(str(src), parse, cache_dir) == ("ONE", False)
+    assert cached_parse(str(src), parse, cache_dir) == ("ONE", True)
+    assert parse.call_count == 1
+
+    # Changing the file invalidates the cached result.
+    src.write_text("three")
+
+    assert cached_parse(str(src), parse, cache_dir) == ("THREE", False)
+    assert cached_parse(str(src), parse, None) == ("THREE", False)
+    assert parse.call_count == 3
+
+
+def test_cached_parse_not_serializable(tmp_path):
+    src = tmp_path / "snippets.yaml"
+    src.write_text("one")
+    cache_dir = str(tmp_path / "cache")
+
+    assert cached_parse(str(src), lambda data: data.decode(), cache_dir) == (
+        "one",
+        False,
+    )
+
+    # A result that can't be stored is still returned, and leaves no cache
+    # files behind.
+    src.write_text("two")
+    value = {"date": datetime.date(2021, 1, 1)}
+
+    assert cached_parse(str(src), lambda data: value, cache_dir) == (value, False)
+    assert os.listdir(os.path.join(cache_dir, "parsed")) == []
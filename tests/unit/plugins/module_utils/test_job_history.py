@@ -0,0 +1,128 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+from unittest import mock
+
+from ansible_collections.mrichardson03.panos.plugins.module_utils.job_history import (
+    JobHistory,
+    export_history,
+    run_job,
+    summarize,
+)
+
+
+def test_summarize():
+    stats = summarize([10, 30, 20, 40])
+
+    assert stats["count"] == 4
+    assert stats["mean"] == 25
+    assert stats["median"] == 25
+    assert stats["min"] == 10
+    assert stats["max"] == 40
+    assert stats["last"] == 40
+    assert summarize([]) == {"count": 0}
+
+
+def test_job_history_expands_user(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    history = JobHistory("~/history", "0001")
+    history.record("commit", 12.5)
+    history.save()
+
+    assert history.filename == os.path.join(str(tmp_path), "history", "0001.json")
+    assert export_history("~/history")["0001"]["commit"]["count"] == 1
+
+
+def test_job_history_predictions(tmp_path):
+    history = JobHistory(str(tmp_path), "0001")
+
+    # Not enough history yet, use the defaults.
+    assert history.timeout("commit", 600) == 600
+    assert history.poll_interval("commit", 10) == 10
+    assert history.record("commit", 500) is False
+
+    for duration in [40, 50]:
+        history.record("commit", duration)
+
+    assert history.timeout("commit", 600) == 1500
+    assert history.poll_interval("commit", 10) == 5
+    assert history.poll_interval("commit", 2) == 2
+
+    # Predictions never lower the timeout.
+    history.jobs["commit"] = [{"duration": 10}] * 3
+    assert history.timeout("commit", 600) == 600
+    assert history.timeout("commit", 30) == history.MIN_TIMEOUT
+
+    history.jobs["commit"] = [{"duration": 30}] * 3
+    assert history.is_outlier("commit", 44) is False
+    assert history.is_outlier("commit", 46) is True
+
+
+def test_job_history_max_entries(tmp_path):
+    history = JobHistory(str(tmp_path), "0001")
+
+    for duration in range(history.MAX_ENTRIES + 5):
+        history.record("install", duration)
+
+    assert history.durations("install") == list(range(5, history.MAX_ENTRIES + 5))
+
+
+def test_job_history_save_and_export(tmp_path):
+    path = os.path.join(str(tmp_path), "history")
+
+    history = JobHistory(path, "0001")
+    history.record("commit", 12.5, partial=True)
+    history.save()
+
+    with open(os.path.join(path, "0001.json")) as f:
+        data = json.load(f)
+
+    assert data["serial"] == "0001"
+    assert data["jobs"]["commit"][0]["partial"] is True
+    assert JobHistory(path, "0001").durations("commit") == [12.5]
+    assert os.listdir(path) == ["0001.json"]
+
+    exported = export_history(path)
+
+    assert list(exported) == ["0001"]
+    assert exported["0001"]["commit"]["count"] == 1
+    assert exported["0001"]["commit"]["last"] == 12.5
+    assert export_history(os.path.join(path, "missing")) == {}
+
+
+def test_job_history_corrupt_file(tmp_path):
+    with open(os.path.join(str(tmp_path), "0001.json"), "w") as f:
+        f.write("{not json")
+
+    assert JobHistory(str(tmp_path), "0001").jobs == {}
+
+
+def test_run_job(tmp_path):
+    connection = mock.Mock()
+    connection.op.return_value = "<response/>"
+
+    history = JobHistory(str(tmp_path), "0001")
+    history.jobs["download"] = [{"duration": 300}] * 3
+
+    response, outlier = run_job(connection, "<cmd/>", "download", history=history)
+
+    assert response == "<response/>"
+    assert outlier is False
+    connection.op.assert_called_once_with(
+        "<cmd/>", poll=True, poll_interval=10, poll_timeout=900
+    )
+    assert len(JobHistory(str(tmp_path), "0001").durations("download")) == 4
+
+
+def test_run_job_without_history():
+    connection = mock.Mock()
+
+    run_job(connection, "<cmd/>", "download", timeout=60, predict=False)
+
+    connection.op.assert_called_once_with(
+        "<cmd/>", poll=True, poll_interval=10, poll_timeout=60
+    )
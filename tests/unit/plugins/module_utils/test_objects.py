@@ -0,0 +1,212 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+import pytest
+from ansible_collections.mrichardson03.panos.plugins.module_utils.objects import (
+    DEVICE_XPATH,
+    SCHEMAS,
+    diff_objects,
+    location_xpath,
+    object_task,
+    sync_objects,
+)
+
+VSYS_XPATH = DEVICE_XPATH + "/vsys/entry[@name='vsys1']"
+
+GET_ADDRESS = """
+<response status="success">
+    <result total-count="2" count="2">
+        <address admin="admin" dirtyId="1" time="2021/01/01 00:00:00">
+            <entry name="same" uuid="1"><ip-netmask>10.0.0.1</ip-netmask></entry>
+            <entry name="unmanaged" uuid="2"><fqdn>example.com</fqdn></entry>
+        </address>
+    </result>
+</response>
+"""
+
+
+def _xml(element):
+    return ET.tostring(element, encoding="unicode")
+
+
+@pytest.mark.parametrize(
+    "schema,obj,expected",
+    [
+        (
+            "address",
+            {"name": "web", "value": "10.0.0.1", "description": "Web & DB"},
+            '<entry name="web"><ip-netmask>10.0.0.1</ip-netmask>'
+            "<description>Web &amp; DB</description></entry>",
+        ),
+        (
+            "address",
+            {"name": "web", "value": "web.example.com", "type": "fqdn", "tags": ["p"]},
+            '<entry name="web"><fqdn>web.example.com</fqdn>'
+            "<tag><member>p</member></tag></entry>",
+        ),
+        (
+            "service",
+            {"name": "dns", "protocol": "udp", "destination_port": 53},
+            '<entry name="dns"><protocol><udp><port>53</port>'
+            "<override><no /></override></udp></protocol></entry>",
+        ),
+        (
+            "address_group",
+            {"name": "grp", "static_value": ["a", "b"]},
+            '<entry name="grp"><static><member>a</member><member>b</member>'
+            "</static></entry>",
+        ),
+        (
+            "service_group",
+            {"name": "grp", "value": ["web"]},
+            '<entry name="grp"><members><member>web</member></members></entry>',
+        ),
+    ],
+)
+def test_schema_element(schema, obj, expected):
+    schema = SCHEMAS[schema]
+
+    assert _xml(schema.element(schema.normalize(obj))) == expected
+
+
+@pytest.mark.parametrize(
+    "schema,obj",
+    [
+        ("address", {"value": "10.0.0.1"}),
+        ("address", {"name": "web"}),
+        ("address", {"name": "web", "value": "10.0.0.1", "type": "bogus"}),
+        ("address_group", {"name": "grp"}),
+        ("address_group", {"name": "grp", "static_value": ["a"], "dynamic_value": "x"}),
+    ],
+)
+def test_schema_invalid(schema, obj):
+    with pytest.raises(ValueError):
+        SCHEMAS[schema].normalize(obj)
+
+
+def test_diff_objects():
+    existing = {
+        "same": ET.fromstring(
+            '<entry name="same" uuid="1"><ip-netmask>10.0.0.1</ip-netmask></entry>'
+        ),
+        "changed": ET.fromstring(
+            '<entry name="changed"><ip-netmask>10.0.0.2</ip-netmask></entry>'
+        ),
+        "unmanaged": ET.fromstring(
+            '<entry name="unmanaged"><fqdn>example.com</fqdn></entry>'
+        ),
+    }
+    desired = {
+        "same": ET.fromstring(
+            '<entry name="same"><ip-netmask>10.0.0.1</ip-netmask></entry>'
+        ),
+        "changed": ET.fromstring(
+            '<entry name="changed"><ip-netmask>10.0.0.3</ip-netmask></entry>'
+        ),
+        "new": ET.fromstring('<entry name="new"><fqdn>new.example.com</fqdn></entry>'),
+    }
+
+    assert diff_objects(existing, desired) == {
+        "add": ["new"],
+        "modify": ["changed"],
+        "delete": [],
+    }
+    assert diff_objects(existing, desired, purge=True)["delete"] == ["unmanaged"]
+
+
+@pytest.mark.parametrize("check_mode", [False, True])
+def test_sync_objects(check_mode):
+    connection = mock.Mock()
+    connection.get.return_value = GET_ADDRESS
+
+    objects = [
+        {"name": "same", "value": "10.0.0.1"},
+        {"name": "new", "value": "10.0.0.2"},
+    ]
+
+    result = sync_objects(
+        connection, SCHEMAS["address"], objects, purge=True, check_mode=check_mode
+    )
+
+    assert result["changed"] is True
+    assert result["added"] == ["new"]
+    assert result["modified"] == []
+    assert result["deleted"] == ["unmanaged"]
+    connection.get.assert_called_once_with(VSYS_XPATH + "/address")
+
+    if check_mode:
+        assert connection.multi_config.call_count == 0
+    else:
+        operations = connection.multi_config.call_args[0][0]
+        assert [o["action"] for o in operations] == ["edit", "delete"]
+        assert (
+            operations[1]["xpath"] == VSYS_XPATH + "/address/entry[@name='unmanaged']"
+        )
+
+
+def test_sync_objects_locations():
+    connection = mock.Mock()
+    connection.get.side_effect = [
+        GET_ADDRESS,
+        "<response status='success'><result/></response>",
+    ]
+
+    locations = ["shared", {"device_group": "dg1"}]
+
+    result = sync_objects(
+        connection,
+        SCHEMAS["address"],
+        [{"name": "same", "value": "10.0.0.1"}],
+        locations=locations,
+    )
+
+    assert [c[0][0] for c in connection.get.call_args_list] == [
+        "/config/shared/address",
+        DEVICE_XPATH + "/device-group/entry[@name='dg1']/address",
+    ]
+    assert result["added"] == ["same"]
+    assert [r["added"] for r in result["locations"]] == [[], ["same"]]
+    assert connection.multi_config.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "location,expected",
+    [
+        ("shared", "/config/shared"),
+        ({"vsys": "vsys2"}, DEVICE_XPATH + "/vsys/entry[@name='vsys2']"),
+        ({"device_group": "dg"}, DEVICE_XPATH + "/device-group/entry[@name='dg']"),
+    ],
+)
+def test_location_xpath(location, expected):
+    assert location_xpath(location) == expected
+
+
+@pytest.mark.parametrize("location", ["vsys1", {"template": "t"}])
+def test_location_xpath_invalid(location):
+    with pytest.raises(ValueError):
+        location_xpath(location)
+
+
+def test_object_task():
+    connection = mock.Mock()
+    connection.get.return_value = GET_ADDRESS
+
+    # A single object never purges the others.
+    result = object_task(
+        connection,
+        SCHEMAS["address"],
+        {"name": "same", "value": "10.0.0.1", "purge": True},
+    )
+    assert result["changed"] is False
+
+    result = object_task(
+        connection, SCHEMAS["address"], {"name": "unmanaged", "state": "absent"}
+    )
+    assert result["deleted"] == ["unmanaged"]
+
+    with pytest.raises(ValueError):
+        object_task(connection, SCHEMAS["address"], {"name": "a", "objects": []})
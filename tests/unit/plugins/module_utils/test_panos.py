@@ -3,10 +3,27 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import xml.etree.ElementTree as ET
+from unittest import mock
+
 import pytest
 from ansible_collections.mrichardson03.panos.plugins.module_utils.panos import (
     cmd_xml,
+    commit_scope,
+    commit_section,
+    common_xpath,
+    config_changes,
+    config_element_changed,
+    file_sha256,
+    find_image,
     get_nested_key,
+    merge_commit_args,
+    minify_xml,
+    paged_records,
+    record_dict,
+    relative_xpath,
+    wait_for_restart,
+    xml_to_dict,
 )
 
 
@@ -25,3 +42,391 @@ def test_get_nested_key(key_list, expected):
     d = {"one": {"two": {"three": "four"}}}
 
     assert get_nested_key(d, key_list) == expected
+
+
+def _page(names):
+    entries = "".join("<entry name='{0}'/>".format(n) for n in names)
+    return "<response><result>{0}</result></response>".format(entries)
+
+
+@pytest.mark.parametrize(
+    "total,page_size,expected_calls",
+    [(0, 2, [(0, 2)]), (3, 2, [(0, 2), (2, 2)]), (4, 2, [(0, 2), (2, 2), (4, 2)])],
+)
+def test_paged_records(total, page_size, expected_calls):
+    names = [str(i) for i in range(total)]
+    calls = []
+
+    def fetch_page(skip, count):
+        calls.append((skip, count))
+        return _page(names[skip : skip + count])
+
+    records = [r.attrib["name"] for r in paged_records(fetch_page, page_size)]
+
+    assert records == names
+    assert calls == expected_calls
+
+
+def test_paged_records_not_paged():
+    calls = []
+
+    def fetch_page(skip, count):
+        calls.append((skip, count))
+        return _page(["one", "two"])
+
+    assert len(list(paged_records(fetch_page, None))) == 2
+    assert calls == [(0, None)]
+
+
+def test_record_dict():
+    element = ET.fromstring(
+        "<entry name='one'><from>trust</from><to>untrust</to>"
+        "<member>a</member><member>b</member><nested><x>y</x></nested>"
+        "<opt attr='v'>text</opt></entry>"
+    )
+
+    assert record_dict(element) == {
+        "@name": "one",
+        "from": "trust",
+        "to": "untrust",
+        "member": ["a", "b"],
+        "nested": {"x": "y"},
+        "opt": {"@attr": "v", "#text": "text"},
+    }
+
+
+@pytest.mark.parametrize(
+    "xml,expected",
+    [
+        ("<one/>", {"one": None}),
+        ("<one>  text  </one>", {"one": "text"}),
+        ("<one a='1'>text</one>", {"one": {"@a": "1", "#text": "text"}}),
+        ("<one><two>2</two><two>3</two></one>", {"one": {"two": ["2", "3"]}}),
+        (
+            "<result><entry name='a'><member>x</member></entry></result>",
+            {"result": {"entry": [{"@name": "a", "member": ["x"]}]}},
+        ),
+        (
+            "<result><entry name='a'/><entry name='b'/></result>",
+            {"result": {"entry": [{"@name": "a"}, {"@name": "b"}]}},
+        ),
+    ],
+)
+def test_xml_to_dict(xml, expected):
+    assert xml_to_dict(xml) == expected
+
+
+def test_xml_to_dict_matches_xmltodict():
+    xmltodict = pytest.importorskip("xmltodict")
+
+    xml = (
+        "<response status='success'><result><system><hostname>fw</hostname>"
+        "<multi-vsys>off</multi-vsys><empty/></system><licenses>"
+        "<entry><feature>A</feature></entry><entry><feature>B</feature></entry>"
+        "</licenses></result></response>"
+    )
+
+    assert xml_to_dict(xml) == xmltodict.parse(xml, force_list=("entry", "member"))
+
+
+@pytest.mark.parametrize(
+    "pending,new,expected",
+    [
+        (None, {"description": "one"}, {"description": "one"}),
+        (
+            {"description": "one", "admins": ["a"], "exclude_shared_objects": True},
+            {"description": "two", "admins": ["b", "a"], "force": True},
+            {
+                "force": True,
+                "exclude_device_and_network": False,
+                "exclude_policy_and_objects": False,
+                "exclude_shared_objects": False,
+                "description": "one; two",
+                "admins": ["a", "b"],
+            },
+        ),
+        (
+            {
+                "description": "one; two",
+                "admins": ["a"],
+                "exclude_shared_objects": True,
+            },
+            {"description": "two", "admins": None, "exclude_shared_objects": True},
+            {
+                "force": False,
+                "exclude_device_and_network": False,
+                "exclude_policy_and_objects": False,
+                "exclude_shared_objects": True,
+                "description": "one; two",
+                "admins": None,
+            },
+        ),
+    ],
+)
+def test_merge_commit_args(pending, new, expected):
+    assert merge_commit_args(pending, new) == expected
+
+
+CONFIG_CHANGES = """
+<response status="success"><result><journal>
+<entry>
+<xpath>/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='vsys1']/address/entry[@name='web']</xpath>
+<owner>automation</owner><action>set</action>
+</entry>
+<entry>
+<xpath>/config/devices/entry[@name='localhost.localdomain']/deviceconfig/system</xpath>
+<owner>admin</owner><action>edit</action>
+</entry>
+</journal></result></response>
+"""
+
+
+def test_config_changes():
+    changes = config_changes(CONFIG_CHANGES)
+
+    assert [c["owner"] for c in changes] == ["automation", "admin"]
+    assert changes[1]["action"] == "edit"
+    assert changes[1]["xpath"].endswith("/deviceconfig/system")
+
+
+@pytest.mark.parametrize(
+    "xpath,expected",
+    [
+        (
+            "/config/devices/entry[@name='x']/vsys/entry[@name='vsys1']/rulebase/security",
+            "policy-and-objects",
+        ),
+        (
+            "/config/devices/entry[@name='x']/vsys/entry[@name='vsys1']/zone/entry[@name='trust']",
+            "device-and-network",
+        ),
+        (
+            "/config/devices/entry[@name='x']/device-group/entry[@name='dg']/pre-rulebase",
+            "policy-and-objects",
+        ),
+        ("/config/devices/entry[@name='x']/network/interface", "device-and-network"),
+        ("/config/shared/address/entry[@name='a']", "shared-object"),
+        ("/config/shared/certificate", None),
+        ("/config/devices/entry[@name='x']/vsys/entry[@name='vsys2']", None),
+        ("/config/mgt-config/users", None),
+    ],
+)
+def test_commit_section(xpath, expected):
+    assert commit_section(xpath) == expected
+
+
+@pytest.mark.parametrize(
+    "admins,expected",
+    [
+        (
+            ["automation"],
+            {
+                "exclude_device_and_network": True,
+                "exclude_policy_and_objects": False,
+                "exclude_shared_objects": True,
+            },
+        ),
+        (
+            None,
+            {
+                "exclude_device_and_network": False,
+                "exclude_policy_and_objects": False,
+                "exclude_shared_objects": True,
+            },
+        ),
+        (["nobody"], None),
+    ],
+)
+def test_commit_scope(admins, expected):
+    assert commit_scope(config_changes(CONFIG_CHANGES), admins) == expected
+
+
+def test_commit_scope_unknown_section():
+    changes = [{"xpath": "/config/mgt-config/users", "owner": "admin"}]
+
+    assert commit_scope(changes) == {
+        "exclude_device_and_network": False,
+        "exclude_policy_and_objects": False,
+        "exclude_shared_objects": False,
+    }
+
+
+@mock.patch("time.sleep")
+def test_wait_for_restart(mock_sleep):
+    connection = mock.Mock()
+    connection.version.side_effect = [{}, {}, ConnectionError("down")]
+
+    assert wait_for_restart(connection, 60) is True
+    assert connection.version.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@mock.patch("time.sleep")
+def test_wait_for_restart_timeout(mock_sleep):
+    connection = mock.Mock()
+
+    assert wait_for_restart(connection, 0) is False
+
+
+def test_find_image(tmp_path):
+    (tmp_path / "PanOS_vm-10.1.3").write_bytes(b"image")
+    sha256 = file_sha256(str(tmp_path / "PanOS_vm-10.1.3"))
+
+    assert sha256 == (
+        "6105d6cc76af400325e94d588ce511be5bfdbb73b437dc51eca43917d7a43e3d"
+    )
+    assert find_image(str(tmp_path), "PanOS_vm-10.1.3", sha256.upper()).endswith(
+        "PanOS_vm-10.1.3"
+    )
+    assert find_image(str(tmp_path), "PanOS_vm-10.1.4") is None
+    assert find_image(None, "PanOS_vm-10.1.3") is None
+
+    with pytest.raises(ValueError):
+        find_image(str(tmp_path), "PanOS_vm-10.1.3", "0" * 64)
+
+
+@pytest.mark.parametrize(
+    "element,edit,expected",
+    [
+        ("<timezone>UTC</timezone>", False, False),
+        ("<timezone>EST</timezone>", False, True),
+        ("<timezone>UTC</timezone><hostname>fw</hostname>", False, False),
+        ("<timezone>UTC</timezone><hostname>other</hostname>", False, True),
+        (
+            "<system><timezone>UTC</timezone><hostname>fw</hostname></system>",
+            True,
+            False,
+        ),
+        ("<system><timezone>UTC</timezone></system>", True, True),
+    ],
+)
+def test_config_element_changed(element, edit, expected):
+    existing = ET.fromstring(
+        "<system><timezone>UTC</timezone><hostname>fw</hostname></system>"
+    )
+
+    assert config_element_changed(existing, element, edit) is expected
+    assert config_element_changed(None, element, edit) is True
+
+
+ZONE = """
+<entry name="trust">
+    <network>
+        <layer3>
+            <member>ethernet1/2</member>
+        </layer3>
+    </network>
+    <enable-user-identification>no</enable-user-identification>
+</entry>
+"""
+
+
+@pytest.mark.parametrize(
+    "element,expected",
+    [
+        (ZONE, False),
+        (ZONE.replace("ethernet1/2", "ethernet1/3"), True),
+        (
+            '<entry name="trust"><enable-user-identification>no'
+            "</enable-user-identification></entry>",
+            False,
+        ),
+        (
+            "<network><layer3><member>ethernet1/2</member></layer3></network>",
+            False,
+        ),
+    ],
+)
+def test_config_element_changed_container(element, expected):
+    existing = ET.fromstring(minify_xml(ZONE))
+
+    assert config_element_changed(existing, minify_xml(element)) is expected
+
+
+GROUP = (
+    '<entry name="group"><static><member>one</member><member>two</member>'
+    "</static><description>Group</description></entry>"
+)
+
+
+@pytest.mark.parametrize(
+    "element,expected",
+    [
+        ("<static><member>one</member><member>two</member></static>", False),
+        ("<static><member>one</member></static>", True),
+        (
+            "<static><member>one</member><member>two</member>"
+            "<member>three</member></static>",
+            True,
+        ),
+        (
+            "<static><member>one</member><member>two</member></static>"
+            "<description>Group</description>",
+            False,
+        ),
+    ],
+)
+def test_config_element_changed_members(element, expected):
+    existing = ET.fromstring(GROUP)
+
+    assert config_element_changed(existing, element) is expected
+
+
+DEVICE = "/config/devices/entry[@name='localhost.localdomain']"
+
+
+@pytest.mark.parametrize(
+    "xpaths,expected",
+    [
+        ([DEVICE + "/deviceconfig/system"], DEVICE + "/deviceconfig/system"),
+        (
+            [
+                DEVICE + "/network/interface/ethernet/entry[@name='ethernet1/1']",
+                DEVICE + "/network/interface/ethernet/entry[@name='ethernet1/2']",
+            ],
+            DEVICE + "/network/interface/ethernet",
+        ),
+        (
+            [DEVICE + "/network/virtual-router", DEVICE + "/vsys/entry[@name='vsys1']"],
+            DEVICE,
+        ),
+        (["/config/shared/address", DEVICE + "/network"], "/config"),
+    ],
+)
+def test_common_xpath(xpaths, expected):
+    assert common_xpath(xpaths) == expected
+
+
+def test_relative_xpath():
+    assert relative_xpath(DEVICE, DEVICE) == "."
+    assert (
+        relative_xpath(
+            DEVICE, DEVICE + "/network/interface/ethernet/entry[@name='a/b']"
+        )
+        == "./network/interface/ethernet/entry[@name='a/b']"
+    )
+
+
+def test_minify_xml():
+    xml = """
+    <entry name="web">
+        <ip-netmask>10.0.0.1</ip-netmask>
+
+        <description>  Two  spaces  </description>
+        <comment> </comment>
+    </entry>
+    <entry name="db">
+        <fqdn>db.example.com</fqdn>
+    </entry>
+    """
+
+    assert minify_xml(xml) == (
+        '<entry name="web"><ip-netmask>10.0.0.1</ip-netmask>'
+        "<description>  Two  spaces  </description><comment> </comment></entry>"
+        '<entry name="db"><fqdn>db.example.com</fqdn></entry>'
+    )
+
+
+def test_minify_xml_invalid():
+    with pytest.raises(ValueError):
+        minify_xml("<entry name='web'>")
@@ -338,3 +338,26 @@ class TestPanosConfigElement(ModuleTestCase):
 
         assert result["changed"] is False
         assert connection_mock.set.call_count == 0
+
+    def test_set_idempotent(self, connection_mock):
+        connection_mock.get.return_value = GET_SYSTEM
+
+        args = {
+            "xpath": XPATH_SYSTEM,
+            "element": "<login-banner>Help!  I'm trapped in a firewall factory!</login-banner>",
+        }
+
+        result = self._run_module(args)
+
+        assert result["changed"] is False
+        assert connection_mock.set.call_count == 0
+
+    def test_set_invalid_xml(self, connection_mock):
+        connection_mock.get.return_value = GET_SYSTEM
+
+        args = {"xpath": XPATH_SYSTEM, "element": "<login-banner>foo"}
+
+        result = self._run_module_fail(args)
+
+        assert "Invalid XML" in result["msg"]
+        assert connection_mock.set.call_count == 0
@@ -16,6 +16,8 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
+
 import pytest
 from ansible_collections.mrichardson03.panos.plugins.modules import panos_op
 
@@ -39,3 +41,155 @@ class TestPanosOp(ModuleTestCase):
         result = self._run_module({"cmd": command, "cmd_is_xml": is_xml})
 
         assert result["changed"] == changed
+
+    def test_dest_ndjson(self, connection_mock, tmp_path):
+        connection_mock.op.side_effect = [
+            "<response><result><entry name='one'/><entry name='two'/></result></response>",
+            "<response><result><entry name='three'/></result></response>",
+        ]
+        dest = str(tmp_path / "out.ndjson")
+
+        result = self._run_module(
+            {
+                "cmd": "<show><foo><skip>{skip}</skip><count>{count}</count></foo></show>",
+                "cmd_is_xml": True,
+                "dest": dest,
+                "page_size": 2,
+            }
+        )
+
+        with open(dest) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert not result["changed"]
+        assert result["record_count"] == 3
+        assert [line["@name"] for line in lines] == ["one", "two", "three"]
+        assert connection_mock.op.call_args_list[1][0][0] == (
+            "<show><foo><skip>2</skip><count>2</count></foo></show>"
+        )
+
+    def test_dest_csv_log(self, connection_mock, tmp_path):
+        connection_mock.log.return_value = (
+            "<response><result><log><logs>"
+            "<entry logid='1'><src>10.0.0.1</src></entry>"
+            "<entry logid='2'><src>10.0.0.2</src></entry>"
+            "</logs></log></result></response>"
+        )
+        dest = str(tmp_path / "out.csv")
+
+        result = self._run_module(
+            {"log_type": "traffic", "dest": dest, "dest_format": "csv"}
+        )
+
+        with open(dest) as f:
+            contents = f.read().splitlines()
+
+        assert result["record_count"] == 2
+        assert contents == ["@logid,src", "1,10.0.0.1", "2,10.0.0.2"]
+        assert connection_mock.log.call_count == 1
+
+    def test_dest_csv_dropped_fields(self, connection_mock, tmp_path, mocker):
+        connection_mock.log.return_value = (
+            "<response><result><log><logs>"
+            "<entry logid='1'><src>10.0.0.1</src></entry>"
+            "<entry logid='2'><src>10.0.0.2</src><dst>10.0.0.3</dst></entry>"
+            "</logs></log></result></response>"
+        )
+        dest = str(tmp_path / "out.csv")
+        warn = mocker.patch.object(panos_op.PanOSAnsibleModule, "warn")
+
+        result = self._run_module(
+            {"log_type": "traffic", "dest": dest, "dest_format": "csv"}
+        )
+
+        with open(dest) as f:
+            contents = f.read().splitlines()
+
+        assert result["record_count"] == 2
+        assert contents == ["@logid,src", "1,10.0.0.1", "2,10.0.0.2"]
+        assert "dst" in warn.call_args[0][0]
+
+    @pytest.mark.parametrize("page_size", [0, -1])
+    def test_invalid_page_size(self, connection_mock, tmp_path, page_size):
+        result = self._run_module_fail(
+            {
+                "log_type": "traffic",
+                "dest": str(tmp_path / "out.ndjson"),
+                "page_size": page_size,
+            }
+        )
+
+        assert result["msg"] == "'page_size' must be at least 1."
+        connection_mock.log.assert_not_called()
+
+    def test_cmds(self, connection_mock):
+        connection_mock.op_batch.return_value = [
+            {
+                "cmd": "show system info",
+                "stdout": "<response><result>foo</result></response>",
+                "elapsed": 0.1,
+                "msg": None,
+            },
+            {
+                "cmd": "request restart system",
+                "stdout": "<response><result>bar</result></response>",
+                "elapsed": 0.2,
+                "msg": None,
+            },
+        ]
+
+        result = self._run_module(
+            {"cmds": ["show system info", "request restart system"], "workers": 2}
+        )
+
+        assert result["changed"]
+        assert [r["changed"] for r in result["results"]] == [False, True]
+        assert result["results"][0]["stdout_dict"]["response"]["result"] == "foo"
+        connection_mock.op_batch.assert_called_once_with(
+            ["show system info", "request restart system"], is_xml=False, workers=2
+        )
+
+    def test_target(self, connection_mock):
+        connection_mock.proxy.return_value = "<response><result>foo</result></response>"
+
+        result = self._run_module({"cmd": "show system info", "target": "0001"})
+
+        assert result["stdout_dict"]["response"]["result"] == "foo"
+        connection_mock.proxy.assert_called_once_with(
+            "0001", "op", "show system info", is_xml=False
+        )
+
+    def test_targets(self, connection_mock):
+        connection_mock.fan_out.return_value = [
+            {
+                "target": "0001",
+                "result": "<response><result>foo</result></response>",
+                "elapsed": 0.1,
+                "msg": None,
+            },
+            {"target": "0002", "result": None, "elapsed": 0.2, "msg": "Timed out"},
+        ]
+
+        result = self._run_module_fail(
+            {"cmd": "show system info", "targets": ["0001", "0002"], "workers": 2}
+        )
+
+        assert [r["failed"] for r in result["results"]] == [False, True]
+        assert result["results"][0]["stdout_dict"]["response"]["result"] == "foo"
+        connection_mock.fan_out.assert_called_once_with(
+            ["0001", "0002"],
+            "op",
+            args=["show system info"],
+            kwargs={"is_xml": False},
+            workers=2,
+        )
+
+    def test_cmds_failed(self, connection_mock):
+        connection_mock.op_batch.return_value = [
+            {"cmd": "show foo", "stdout": None, "elapsed": 0.1, "msg": "error"},
+        ]
+
+        result = self._run_module_fail({"cmds": ["show foo"]})
+
+        assert not result["changed"]
+        assert result["results"][0]["failed"]